@@ -1,6 +1,10 @@
 """
     Programme principal : menu interactif
+
+    Avec des arguments, exécute une commande sans menu (voir utils/commandes.py) :
+        python main.py chercher "guerre et paix"
 """
+import sys
 
 from utils.bibliotheque import afficher_livres, supprimer_livre
 from utils.bibliotheque import ajouter_livre
@@ -10,15 +14,22 @@ from utils.bibliotheque import rechercher_livre
 from utils.bibliotheque import rendre_livre
 from utils.bibliotheque import supprimer_livre
 
+from utils.commandes import executer_commande
 from utils.gestion_fichiers import lire_bibliotheque
 from utils.gestion_fichiers import lire_emprunts
+from utils.gestion_fichiers import sauvegarder_bibliotheque
+from utils.gestion_fichiers import sauvegarder_emprunts
 
 
 fichier_bibliotheque = "data/bibliotheque.json"
 fichier_emprunt = "data/emprunt.csv"
 
+if len(sys.argv) > 1:
+    # Mode non interactif : seuls les fichiers utiles à la commande sont lus
+    sys.exit(executer_commande(sys.argv[1:]))
+
 livres = lire_bibliotheque(fichier_bibliotheque)
-personnes = lire_emprunts(fichier_emprunt)
+personnes = lire_emprunts(fichier_emprunt, historique=False)
 
 while True:
     choix = menu()
@@ -44,5 +55,8 @@ while True:
             rendre_livre(livres, fichier_bibliotheque, personnes, fichier_emprunt)
 
         case 7:
+            # Replier les journaux dans bibliotheque.json et emprunt.csv avant de quitter
+            sauvegarder_bibliotheque(livres, fichier_bibliotheque, compacter=True)
+            sauvegarder_emprunts(personnes, fichier_emprunt)
             print("\nÀ bientôt 👋")
             break
@@ -4,29 +4,48 @@
 import tkinter as tk
 from tkinter import ttk
 import tkinter.font as tkfont
+from utils.bibliotheque_gui import afficher_inventaire
 from utils.bibliotheque_gui import afficher_livres
 from utils.bibliotheque_gui import ajouter_livre
 from utils.bibliotheque_gui import modifier_livre
+from utils.bibliotheque_gui import recherche_rapide
 from utils.bibliotheque_gui import rechercher_livre
 from utils.bibliotheque_gui import supprimer_livre
 from utils.emprunt_gui import emprunter_livre
 from utils.emprunt_gui import rendre_livre
+from utils.emprunt_gui import afficher_retards
+from utils.emprunt_gui import afficher_statistiques
 from utils.emprunt_gui import modifier_personne
 from utils.gestion_fichiers import lire_bibliotheque, lire_emprunts
+from utils.persistance import arreter_persistances, demarrer_persistance
 
 # Variables globales
 fichier_bibliotheque = "data/bibliotheque.json"
 fichier_emprunt = "data/emprunt.csv"
 livres = lire_bibliotheque(fichier_bibliotheque)
-personnes = lire_emprunts(fichier_emprunt)
+personnes = lire_emprunts(fichier_emprunt, historique=False)
+# Les transactions sont écrites sur le disque par un thread dédié
+persistance = demarrer_persistance(livres, fichier_bibliotheque, personnes, fichier_emprunt)
 root = tk.Tk()
 result_text = None
 
 
+def quitter():
+    """
+    Écrit les transactions en attente, replie les journaux dans les fichiers bibliotheque.json et emprunt.csv
+    puis ferme l'application.
+    """
+    persistance.compacter(compacter_tout=True)
+    arreter_persistances()
+    root.quit()
+
+
 def setup_main_window():
     """Configure et initialise la fenêtre principale de l'application avec les boutons et le texte de résultat."""
     global root, result_text
     root.title("Bibliothèque")
+    # Fermer la fenêtre (bouton de la barre de titre) écrit les transactions en attente, comme le bouton Quitter
+    root.protocol("WM_DELETE_WINDOW", quitter)
 
     # Centrer la fenêtre principale au milieu de l'écran
     window_width = 1500
@@ -54,13 +73,16 @@ def setup_main_window():
         ("Modifier un livre", lambda: modifier_livre(root, result_text, livres, fichier_bibliotheque)),
         ("Supprimer un livre", lambda: supprimer_livre(root, result_text, livres, fichier_bibliotheque)),
         ("Chercher un livre", lambda: rechercher_livre(root, result_text, livres)),
-        ("Afficher les livres", lambda: afficher_livres(result_text, livres)),
+        ("Afficher les livres", lambda: afficher_livres(root, livres)),
+        ("Inventaire", lambda: afficher_inventaire(result_text, livres)),
         ("Emprunter un livre",
          lambda: emprunter_livre(root, result_text, livres, fichier_bibliotheque, personnes, fichier_emprunt)),
         ("Rendre un livre",
          lambda: rendre_livre(root, result_text, livres, fichier_bibliotheque, personnes, fichier_emprunt)),
         ("Modifier personne", lambda: modifier_personne(root, result_text, personnes, fichier_emprunt)),
-        ("Quitter", root.quit)
+        ("Retards", lambda: afficher_retards(result_text, personnes)),
+        ("Statistiques", lambda: afficher_statistiques(result_text, livres, personnes, fichier_emprunt)),
+        ("Quitter", quitter)
     ]
 
     for i, (text, command) in enumerate(buttons):
@@ -68,7 +90,11 @@ def setup_main_window():
             .grid(row=0, column=i, padx=5, pady=5))
 
     result_text = tk.Text(main_frame, height=25, width=100, font=custom_font, spacing1=3, spacing3=3)
-    result_text.grid(row=1, column=0, columnspan=30, pady=20)
+    result_text.grid(row=2, column=0, columnspan=30, pady=20)
+
+    # Recherche au fil de la frappe, entre les boutons et la zone de résultat
+    (recherche_rapide(main_frame, result_text, livres)
+        .grid(row=1, column=0, columnspan=30, pady=(10, 0), sticky="w"))
 
 
 # Démarrer l'application
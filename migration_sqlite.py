@@ -0,0 +1,31 @@
+"""
+    Programme de migration : copie bibliotheque.json et emprunt.csv dans une base SQLite
+
+    Utilisation : python migration_sqlite.py [chemin de la base]  (défaut : data/bibliotheque.db)
+    Pour utiliser ensuite la base, indiquer son chemin comme fichier_bibliotheque et fichier_emprunt
+    dans main.py ou main_gui.py.
+    Relancer la migration sur une base existante supprime aussi les index qui ne servent plus.
+"""
+import sys
+
+from utils.gestion_fichiers import lire_bibliotheque
+from utils.gestion_fichiers import lire_emprunts
+from utils.stockage_sqlite import connexion
+from utils.stockage_sqlite import migrer_vers_sqlite
+
+# Index de la table livres créés par les premières versions de la base : les recherches de livres
+# sont faites par les index du catalogue en mémoire
+INDEX_OBSOLETES = ("idx_livres_titre", "idx_livres_auteur", "idx_livres_genre")
+
+
+fichier_bibliotheque = "data/bibliotheque.json"
+fichier_emprunt = "data/emprunt.csv"
+fichier_base = sys.argv[1] if len(sys.argv) > 1 else "data/bibliotheque.db"
+
+livres = lire_bibliotheque(fichier_bibliotheque)
+personnes = lire_emprunts(fichier_emprunt)
+migrer_vers_sqlite(livres, personnes, fichier_base)
+for index in INDEX_OBSOLETES:
+    connexion(fichier_base).execute(f"DROP INDEX IF EXISTS {index}")
+
+print(f"{len(livres)} livre(s) et {len(personnes)} emprunteur(s) copiés dans {fichier_base}")
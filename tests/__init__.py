@@ -0,0 +1,3 @@
+"""
+    Tests des fichiers de données, à lancer depuis la racine du dépôt : python -m unittest
+"""
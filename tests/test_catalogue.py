@@ -0,0 +1,86 @@
+"""
+    Tests du catalogue : suivi des titres modifiés, index des titres et index de recherche tenus à jour
+"""
+import unittest
+
+from utils.catalogue import Catalogue
+from utils.catalogue import RechercheIncrementale
+
+
+def livre(auteur, annee, genre, exemplaires):
+    return {"Auteur": auteur, "Année": annee, "Genre": genre, "Exemplaires": exemplaires}
+
+
+class TestCatalogue(unittest.TestCase):
+
+    def setUp(self):
+        self.livres = Catalogue({
+            "1984": livre("George Orwell", 1949, "Dystopie", 2),
+            "Les Misérables": livre("Victor Hugo", 1862, "Roman", 1),
+            "Notre-Dame de Paris": livre("Victor Hugo", 1831, "Roman", 1),
+            "La Ferme des animaux": livre("George Orwell", 1945, "Satire", 0),
+        })
+
+    def test_titres_modifies(self):
+        self.assertEqual(self.livres.titres_modifies, set())
+        self.livres["Dune"] = livre("Frank Herbert", 1965, "Science-fiction", 1)
+        del self.livres["1984"]
+        self.livres.pop("Absent", None)
+        self.livres.update({"Germinal": livre("Émile Zola", 1885, "Roman", 1)})
+        self.livres.setdefault("Dune", livre("X", 2000, "Y", 9))
+        self.livres["Les Misérables"]["Exemplaires"] -= 1
+        self.livres.marquer_modifie("Les Misérables")
+
+        self.assertEqual(self.livres.titres_modifies, {"Dune", "1984", "Germinal", "Les Misérables"})
+        self.assertEqual(self.livres["Dune"]["Auteur"], "Frank Herbert")
+
+        self.livres.clear()
+        self.assertIn("Notre-Dame de Paris", self.livres.titres_modifies)
+        self.assertIsNone(self.livres.trouver_titre("1984"))
+
+    def test_trouver_titre(self):
+        self.assertEqual(self.livres.trouver_titre("  les MISÉRABLES "), "Les Misérables")
+        # Sans accents : l'index des préfixes sert de repli
+        self.assertEqual(self.livres.trouver_titre("les miserables"), "Les Misérables")
+        self.assertIsNone(self.livres.trouver_titre("Les Mis"))
+
+        self.livres["Les misérables"] = livre("Victor Hugo", 1862, "Roman", 1)
+        del self.livres["Les Misérables"]
+        self.assertEqual(self.livres.trouver_titre("LES MISÉRABLES"), "Les misérables")
+
+    def test_rechercher(self):
+        # Mots dans le titre avant les mots dans l'auteur, dernier mot complété
+        self.assertEqual(self.livres.rechercher("victor hug"), ["Les Misérables", "Notre-Dame de Paris"])
+        self.assertEqual(self.livres.rechercher("orwell", "Titre"), [])
+        self.assertEqual(self.livres.rechercher("miserables"), ["Les Misérables"])
+        # Sous-chaîne au milieu d'un mot (index des trigrammes)
+        self.assertEqual(self.livres.rechercher("erme", "Titre"), ["La Ferme des animaux"])
+
+        # Les index déjà construits suivent les ajouts, modifications et suppressions
+        self.livres["Dune"] = livre("Frank Herbert", 1965, "Science-fiction", 1)
+        self.livres["1984"]["Auteur"] = "Eric Blair"
+        self.livres.marquer_modifie("1984")
+        del self.livres["Les Misérables"]
+        self.assertEqual(self.livres.rechercher("herbert"), ["Dune"])
+        self.assertEqual(self.livres.rechercher("orwell"), ["La Ferme des animaux"])
+        self.assertEqual(self.livres.rechercher("blair"), ["1984"])
+        self.assertEqual(self.livres.rechercher("miserables"), [])
+
+    def test_suggerer_et_completer(self):
+        self.assertEqual(self.livres.suggerer("Les Miserbles")[0], "Les Misérables")
+        self.assertEqual(self.livres.suggerer("Orwel", "Auteur"), ["1984", "La Ferme des animaux"])
+        self.assertEqual(self.livres.completer("notre"), ["Notre-Dame de Paris"])
+        self.assertEqual(self.livres.completer("l", limite=1), ["La Ferme des animaux"])
+        self.assertEqual(self.livres.completer("  "), [])
+
+    def test_recherche_incrementale(self):
+        recherche = RechercheIncrementale(self.livres)
+        self.assertEqual(recherche.rechercher("v"), ["Les Misérables", "Notre-Dame de Paris"])
+        self.assertEqual(recherche.rechercher("vic"), ["Les Misérables", "Notre-Dame de Paris"])
+        # Un livre ajouté entre deux frappes est trouvé, même si la requête prolonge la précédente
+        self.livres["Victor"] = livre("Roger Vitrac", 1928, "Théâtre", 1)
+        self.assertIn("Victor", recherche.rechercher("vict"))
+
+
+if __name__ == "__main__":
+    unittest.main()
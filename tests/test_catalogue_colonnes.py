@@ -0,0 +1,70 @@
+"""
+    Tests de l'index en colonnes du catalogue : filtres et totaux par genre, avec et sans NumPy
+"""
+import unittest
+from unittest import mock
+
+from utils import catalogue_colonnes
+from utils.catalogue import Catalogue
+
+
+def livre(auteur, annee, genre, exemplaires):
+    return {"Auteur": auteur, "Année": annee, "Genre": genre, "Exemplaires": exemplaires}
+
+
+class TestColonnesSansNumpy(unittest.TestCase):
+    # Module utilisé pour les calculs (None : calculs en Python)
+    numpy = None
+
+    def setUp(self):
+        patch = mock.patch.object(catalogue_colonnes, "numpy", self.numpy)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.livres = Catalogue({
+            "1984": livre("George Orwell", 1949, "Dystopie", 2),
+            "Les Misérables": livre("Victor Hugo", 1862, "Roman", 0),
+            "Notre-Dame de Paris": livre("Victor Hugo", 1831, "Roman", 1),
+            "Sans date": livre("Anonyme", "inconnue", "roman", 1),
+        })
+        self.colonnes = self.livres.colonnes()
+
+    def test_filtrer(self):
+        self.assertEqual(self.colonnes.filtrer(genre="Roman"), ["Les Misérables", "Notre-Dame de Paris"])
+        self.assertEqual(self.colonnes.filtrer(auteur="Victor Hugo", annee_min=1850), ["Les Misérables"])
+        self.assertEqual(self.colonnes.filtrer(annee_max=1900), ["Les Misérables", "Notre-Dame de Paris",
+                                                                 "Sans date"])
+        self.assertEqual(self.colonnes.filtrer(en_rupture=True), ["Les Misérables"])
+        self.assertEqual(self.colonnes.filtrer(genre="Conte"), [])
+        self.assertEqual(self.colonnes.exemplaires("1984"), 2)
+
+    def test_par_genre_et_totaux(self):
+        par_genre = self.colonnes.par_genre()
+        self.assertEqual(list(par_genre), ["Dystopie", "Roman", "roman"])
+        self.assertEqual(par_genre["Roman"], {"titres": 2, "exemplaires": 1, "en_rupture": 1})
+        self.assertEqual(self.colonnes.totaux(par_genre), {"titres": 4, "exemplaires": 4, "en_rupture": 1})
+
+    def test_mises_a_jour_du_catalogue(self):
+        self.livres["1984"]["Exemplaires"] = 0
+        self.livres.marquer_modifie("1984")
+        del self.livres["Les Misérables"]
+        # La position libérée est réutilisée
+        self.livres["Dune"] = livre("Frank Herbert", 1965, "Science-fiction", -1)
+
+        self.assertIs(self.livres.colonnes(), self.colonnes)
+        self.assertEqual(self.colonnes.filtrer(en_rupture=True), ["1984", "Dune"])
+        self.assertEqual(self.colonnes.filtrer(genre="Roman"), ["Notre-Dame de Paris"])
+        self.assertIsNone(self.colonnes.exemplaires("Les Misérables"))
+        self.assertEqual(self.colonnes.totaux(), {"titres": 4, "exemplaires": 2, "en_rupture": 2})
+
+        self.livres.clear()
+        self.assertEqual(self.livres.colonnes().filtrer(), [])
+        self.assertEqual(self.livres.colonnes().par_genre(), {})
+
+
+@unittest.skipUnless(catalogue_colonnes.numpy_disponible(), "NumPy n'est pas installé")
+class TestColonnesAvecNumpy(TestColonnesSansNumpy):
+    numpy = catalogue_colonnes.numpy
+
+
+if __name__ == "__main__":
+    unittest.main()
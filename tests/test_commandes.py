@@ -0,0 +1,66 @@
+"""
+    Tests de l'interface en ligne de commande : codes de sortie des commandes
+"""
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from contextlib import redirect_stdout
+
+from utils.catalogue import Catalogue
+from utils.commandes import CODE_RETARDS
+from utils.commandes import executer_commande
+from utils.gestion_fichiers import lire_emprunts
+from utils.gestion_fichiers import sauvegarder_bibliotheque
+from utils.gestion_fichiers import sauvegarder_emprunts
+from utils.modeles import Emprunt
+from utils.modeles import Emprunteur
+from utils.registre import RegistrePersonnes
+
+
+class TestCodesDeSortie(unittest.TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.mkdtemp()
+        self.fichier_bibliotheque = os.path.join(self.dossier, "bibliotheque.json")
+        self.fichier_emprunt = os.path.join(self.dossier, "emprunt.csv")
+        sauvegarder_bibliotheque(Catalogue({
+            "1984": {"Auteur": "George Orwell", "Année": 1949, "Genre": "Dystopie", "Exemplaires": 1},
+        }), self.fichier_bibliotheque, compacter=True)
+        sauvegarder_emprunts(RegistrePersonnes([
+            Emprunteur("Dubois", "Claire", 1, emprunts={"1": Emprunt.depuis_texte("Dune", "2025-04-01")}),
+        ]), self.fichier_emprunt)
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier)
+
+    def executer(self, *arguments):
+        with redirect_stdout(io.StringIO()) as sortie:
+            code = executer_commande(["--bibliotheque", self.fichier_bibliotheque,
+                                      "--emprunts", self.fichier_emprunt, *arguments])
+        return code, sortie.getvalue()
+
+    def test_retards(self):
+        code, sortie = self.executer("retards", "--date", "2025-05-01")
+        self.assertEqual(code, 0)
+        self.assertIn("1 emprunt(s) en retard", sortie)
+        self.assertEqual(self.executer("retards", "--date", "2025-05-01", "--code-retour")[0], CODE_RETARDS)
+        self.assertEqual(self.executer("retards", "--date", "2025-04-02", "--code-retour")[0], 0)
+
+    def test_erreurs(self):
+        self.assertEqual(self.executer("chercher", "1984")[0], 0)
+        self.assertEqual(self.executer("chercher", "Dune")[0], 1)
+        self.assertEqual(self.executer("emprunter", "Martin", "Thomas", "1984")[0], 0)
+        # Plus aucun exemplaire : l'emprunt est refusé
+        self.assertEqual(self.executer("emprunter", "Dubois", "Claire", "1984")[0], 1)
+        self.assertEqual(len(lire_emprunts(self.fichier_emprunt).trouver("Dubois", "Claire")["emprunts"]), 1)
+
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as erreur:
+            self.executer("retards", "--date", "01/05/2025")
+        self.assertEqual(erreur.exception.code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+    Tests des emprunts par lot : règles du comptoir, dates des retours et écriture unique des fichiers
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from utils.catalogue import Catalogue
+from utils.emprunts_lot import appliquer_operations
+from utils.emprunts_lot import lire_operations
+from utils.emprunts_lot import traiter_lot
+from utils.gestion_fichiers import lire_bibliotheque
+from utils.gestion_fichiers import lire_emprunts
+from utils.gestion_fichiers import sauvegarder_bibliotheque
+from utils.gestion_fichiers import sauvegarder_emprunts
+from utils.modeles import Emprunt
+from utils.modeles import Emprunteur
+from utils.registre import RegistrePersonnes
+
+
+def operation(type_operation, titre, nom="", prenom="", date=""):
+    return {"operation": type_operation, "titre": titre, "nom": nom, "prenom": prenom, "date": date}
+
+
+class TestAppliquerOperations(unittest.TestCase):
+
+    def setUp(self):
+        self.livres = Catalogue({
+            "1984": {"Auteur": "George Orwell", "Année": 1949, "Genre": "Dystopie", "Exemplaires": 2},
+            "Les Misérables": {"Auteur": "Victor Hugo", "Année": 1862, "Genre": "Roman", "Exemplaires": 0},
+        })
+        self.claire = Emprunteur("Dubois", "Claire", 1, emprunts={
+            "1": Emprunt.depuis_texte("Les Misérables", "2025-04-01"),
+        })
+        self.personnes = RegistrePersonnes([self.claire])
+
+    def test_emprunts_et_retours(self):
+        bilan = appliquer_operations([
+            operation("emprunt", "1984", "martin", "thomas", "2025-04-02"),
+            operation("retour", "les miserables", date="2025-04-25"),
+        ], self.livres, self.personnes)
+
+        self.assertEqual((bilan["emprunts"], bilan["retours"], bilan["erreurs"]), (1, 1, []))
+        # Rendu 24 jours après l'emprunt : 10 jours de retard
+        self.assertAlmostEqual(bilan["penalites"], 1.0)
+        thomas = self.personnes.trouver("Martin", "Thomas")
+        self.assertEqual((thomas["nom"], thomas["emprunts"]["1"]["date_emprunt"]), ("Martin", "2025-04-02"))
+        self.assertEqual(self.claire["emprunts"]["1"]["date_retour"], "2025-04-25")
+        self.assertEqual(self.claire["nbr_livres_empruntes"], 0)
+        self.assertEqual(self.livres["1984"]["Exemplaires"], 1)
+        self.assertEqual(self.livres["Les Misérables"]["Exemplaires"], 1)
+        self.assertEqual(self.livres.titres_modifies, {"1984", "Les Misérables"})
+
+    def test_operations_refusees(self):
+        bilan = appliquer_operations([
+            operation("emprunt", "Les Misérables", "Martin", "Thomas"),
+            operation("emprunt", "Dune", "Martin", "Thomas"),
+            operation("emprunt", "1984"),
+            operation("retour", "1984"),
+            operation("prêt", "1984", "Martin", "Thomas"),
+            operation("emprunt", "1984", "Martin", "Thomas", "2025-13-01"),
+        ], self.livres, self.personnes)
+
+        self.assertEqual([numero for numero, _ in bilan["erreurs"]], [1, 2, 3, 4, 5, 6])
+        self.assertEqual((bilan["emprunts"], bilan["retours"]), (0, 0))
+        self.assertEqual(self.livres["1984"]["Exemplaires"], 2)
+
+    def test_retour_avant_l_emprunt(self):
+        bilan = appliquer_operations([
+            operation("retour", "Les Misérables", "Dubois", "Claire", "2025-03-15"),
+        ], self.livres, self.personnes)
+
+        self.assertEqual(len(bilan["erreurs"]), 1)
+        self.assertIn("2025-04-01", bilan["erreurs"][0][1])
+        self.assertEqual(bilan["retours"], 0)
+        self.assertEqual(self.claire["emprunts"]["1"]["date_retour"], "")
+        self.assertEqual(self.claire["nbr_livres_empruntes"], 1)
+        self.assertEqual(self.livres["Les Misérables"]["Exemplaires"], 0)
+
+        # L'emprunt reste en cours : un retour à une date valide est accepté
+        bilan = appliquer_operations([
+            operation("retour", "Les Misérables", date="2025-04-02"),
+        ], self.livres, self.personnes)
+        self.assertEqual((bilan["retours"], bilan["erreurs"]), (1, []))
+
+    def test_limite_d_emprunts(self):
+        self.livres["1984"]["Exemplaires"] = 5
+        bilan = appliquer_operations([operation("emprunt", "1984", "Dubois", "Claire")] * 3,
+                                     self.livres, self.personnes)
+
+        self.assertEqual(bilan["emprunts"], 2)
+        self.assertEqual([numero for numero, _ in bilan["erreurs"]], [3])
+        self.assertEqual(list(self.claire["emprunts"]), ["1", "2", "3"])
+
+
+class TestTraiterLot(unittest.TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.mkdtemp()
+        self.fichier_bibliotheque = os.path.join(self.dossier, "bibliotheque.json")
+        self.fichier_emprunt = os.path.join(self.dossier, "emprunt.csv")
+        sauvegarder_bibliotheque(Catalogue({
+            "1984": {"Auteur": "George Orwell", "Année": 1949, "Genre": "Dystopie", "Exemplaires": 2},
+        }), self.fichier_bibliotheque, compacter=True)
+        sauvegarder_emprunts(RegistrePersonnes(), self.fichier_emprunt)
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier)
+
+    def test_lot_depuis_un_fichier(self):
+        fichier_operations = os.path.join(self.dossier, "boite_retour.csv")
+        with open(fichier_operations, "w", encoding="utf-8") as file:
+            file.write("operation;nom;prenom;titre;date\n"
+                       "emprunt;Dubois;Claire;1984;2025-04-01\n"
+                       "retour;;;1984;2025-04-05\n"
+                       "retour;;;1984;2025-04-06\n")
+
+        bilan = traiter_lot(lire_operations(fichier_operations), lire_bibliotheque(self.fichier_bibliotheque),
+                            self.fichier_bibliotheque, lire_emprunts(self.fichier_emprunt), self.fichier_emprunt)
+
+        self.assertEqual((bilan["emprunts"], bilan["retours"], [n for n, _ in bilan["erreurs"]]), (1, 1, [3]))
+        claire = lire_emprunts(self.fichier_emprunt).trouver("Dubois", "Claire")
+        self.assertEqual(claire["emprunts"]["1"]["date_retour"], "2025-04-05")
+        self.assertEqual(lire_bibliotheque(self.fichier_bibliotheque)["1984"]["Exemplaires"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
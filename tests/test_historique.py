@@ -0,0 +1,115 @@
+"""
+    Tests de l'historique des emprunts : lecture sans historique, archivage (y compris interrompu) et renommage
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from utils import archives
+from utils.archives import archiver_emprunts
+from utils.archives import fichiers_archives
+from utils.archives import historique_emprunts
+from utils.archives import lire_archives
+from utils.archives import renommer_dans_archives
+from utils.gestion_fichiers import journaliser_personne
+from utils.gestion_fichiers import lire_emprunts
+from utils.gestion_fichiers import sauvegarder_emprunts
+from utils.modeles import Emprunt
+from utils.modeles import Emprunteur
+from utils.registre import RegistrePersonnes
+from utils.statistiques import statistiques_emprunts
+
+
+class TestHistorique(unittest.TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.mkdtemp()
+        self.fichier = os.path.join(self.dossier, "emprunt.csv")
+        claire = Emprunteur("Dubois", "Claire", emprunts={
+            "1": Emprunt.depuis_texte("Le Petit Prince", "2020-03-01", "2020-03-10"),
+            "2": Emprunt.depuis_texte("Moby Dick", "2021-05-01", "2021-05-12"),
+            "3": Emprunt.depuis_texte("1984", "2025-04-10"),
+        })
+        thomas = Emprunteur("Martin", "Thomas", emprunts={
+            "1": Emprunt.depuis_texte("1984", "2021-01-05", "2021-01-15"),
+        })
+        sauvegarder_emprunts(RegistrePersonnes([claire, thomas]), self.fichier)
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier)
+
+    def test_lecture_sans_historique_puis_sauvegarde(self):
+        personnes = lire_emprunts(self.fichier, historique=False)
+        claire = personnes.trouver("Dubois", "Claire")
+        self.assertEqual(list(claire["emprunts"]), ["3"])
+        self.assertFalse(personnes.historique_charge(claire))
+        # Les numéros des emprunts restés dans le fichier ne sont pas réutilisés
+        self.assertEqual(personnes.prochain_emprunt_id(claire), "4")
+
+        claire["emprunts"]["4"] = Emprunt.depuis_texte("Dune", "2025-04-12")
+        # Renommée avant la compaction : ses emprunts clos sont retrouvés sous son ancien nom
+        personnes.renommer(claire, "Durand", "Claire")
+        sauvegarder_emprunts(personnes, self.fichier)
+
+        relues = lire_emprunts(self.fichier)
+        claire = relues.trouver("Durand", "Claire")
+        self.assertEqual(list(claire["emprunts"]), ["1", "2", "3", "4"])
+        self.assertEqual(claire["emprunts"]["1"]["date_retour"], "2020-03-10")
+        self.assertEqual(claire["nbr_livres_empruntes"], 2)
+        self.assertIsNone(relues.trouver("Dubois", "Claire"))
+        self.assertEqual(list(relues.trouver("Martin", "Thomas")["emprunts"]), ["1"])
+
+    def test_archivage_puis_renommage(self):
+        archives = archiver_emprunts(lire_emprunts(self.fichier), self.fichier, "2022-01-01")
+        # Le dernier emprunt de Thomas reste dans emprunt.csv
+        self.assertEqual(archives, {"2020": 1, "2021": 1})
+        self.assertEqual([annee for annee, _ in fichiers_archives(self.fichier)], ["2020", "2021"])
+
+        # Renommage tel que le fait l'interface : journal puis archives
+        personnes = lire_emprunts(self.fichier, historique=False)
+        claire = personnes.trouver("Dubois", "Claire")
+        personnes.renommer(claire, "Durand", "Claire")
+        journaliser_personne(personnes, claire, self.fichier, cle=("Dubois", "Claire"))
+        self.assertEqual(renommer_dans_archives(self.fichier, ("Dubois", "Claire"), ("Durand", "Claire")), 2)
+
+        relues = lire_emprunts(self.fichier, historique=False)
+        claire = relues.trouver("durand", "claire")
+        historique = historique_emprunts(relues, claire, self.fichier)
+        self.assertEqual(list(historique), ["1", "2", "3"])
+        self.assertEqual(historique["2"]["titre"], "Moby Dick")
+        self.assertEqual(list(historique_emprunts(relues, claire, self.fichier, ["2021"])), ["2", "3"])
+        self.assertEqual(list(lire_archives(self.fichier, "Dubois", "Claire")), [])
+        self.assertEqual(list(historique_emprunts(relues, relues.trouver("Martin", "Thomas"), self.fichier)),
+                         ["1"])
+
+    def test_archivage_interrompu(self):
+        # Arrêt brutal après l'écriture des archives, avant la réécriture d'emprunt.csv
+        with mock.patch.object(archives, "sauvegarder_emprunts", side_effect=OSError("arrêt brutal")):
+            with self.assertRaises(OSError):
+                archiver_emprunts(lire_emprunts(self.fichier), self.fichier, "2022-01-01")
+
+        # Les emprunts archivés sont aussi restés dans emprunt.csv : ils ne sont comptés qu'une fois
+        personnes = lire_emprunts(self.fichier)
+        claire = personnes.trouver("Dubois", "Claire")
+        self.assertEqual(list(claire["emprunts"]), ["1", "2", "3"])
+        self.assertEqual(list(historique_emprunts(personnes, claire, self.fichier)), ["1", "2", "3"])
+        self.assertEqual(statistiques_emprunts(personnes, self.fichier).emprunts_par_personne[("dubois", "claire")], 3)
+
+        # Un nouvel archivage termine le travail sans perdre d'emprunt
+        self.assertEqual(archiver_emprunts(personnes, self.fichier, "2022-01-01"), {"2020": 1, "2021": 1})
+        relues = lire_emprunts(self.fichier)
+        self.assertEqual(list(relues.trouver("Dubois", "Claire")["emprunts"]), ["3"])
+        self.assertEqual(list(historique_emprunts(relues, relues.trouver("Dubois", "Claire"), self.fichier)),
+                         ["1", "2", "3"])
+
+    def test_archivage_refuse_sans_historique(self):
+        with self.assertRaises(ValueError):
+            archiver_emprunts(lire_emprunts(self.fichier, historique=False), self.fichier, "2022-01-01")
+        self.assertEqual(fichiers_archives(self.fichier), [])
+        self.assertEqual(archiver_emprunts(lire_emprunts(self.fichier), self.fichier, "2020-01-01"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
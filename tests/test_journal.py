@@ -0,0 +1,193 @@
+"""
+    Tests du journal des fichiers de données : rejeu après un arrêt brutal, compaction au seuil et écriture
+    atomique des instantanés (bibliotheque.json et emprunt.csv)
+"""
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from utils import gestion_fichiers
+from utils.catalogue import Catalogue
+from utils.gestion_fichiers import chemin_journal
+from utils.gestion_fichiers import ecriture_atomique
+from utils.gestion_fichiers import journaliser_personne
+from utils.gestion_fichiers import lire_bibliotheque
+from utils.gestion_fichiers import lire_emprunts
+from utils.gestion_fichiers import sauvegarder_bibliotheque
+from utils.gestion_fichiers import sauvegarder_emprunts
+from utils.modeles import Emprunt
+from utils.modeles import Emprunteur
+from utils.registre import RegistrePersonnes
+
+
+def livre(auteur, annee, genre, exemplaires):
+    return {"Auteur": auteur, "Année": annee, "Genre": genre, "Exemplaires": exemplaires}
+
+
+def ajouter_ligne_tronquee(fichier):
+    """Simule un arrêt brutal pendant l'écriture d'une entrée du journal."""
+    with open(chemin_journal(fichier), "a", encoding="utf-8") as file:
+        file.write('{"titre": "Entrée interr')
+
+
+class TestJournalBibliotheque(unittest.TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.mkdtemp()
+        self.fichier = os.path.join(self.dossier, "bibliotheque.json")
+        livres = Catalogue({
+            "1984": livre("George Orwell", 1949, "Dystopie", 2),
+            "Moby Dick": livre("Herman Melville", 1851, "Aventure", 1),
+        })
+        sauvegarder_bibliotheque(livres, self.fichier, compacter=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier)
+
+    def test_rejeu_apres_arret_brutal(self):
+        livres = lire_bibliotheque(self.fichier)
+        livres["1984"]["Exemplaires"] -= 1
+        livres.marquer_modifie("1984")
+        livres["Le Petit Prince"] = livre("Antoine de Saint-Exupéry", 1943, "Conte", 3)
+        del livres["Moby Dick"]
+        sauvegarder_bibliotheque(livres, self.fichier)
+        with open(self.fichier, "r", encoding="utf-8") as file:
+            instantane = json.load(file)
+        ajouter_ligne_tronquee(self.fichier)
+
+        with redirect_stdout(io.StringIO()) as sortie:
+            relus = lire_bibliotheque(self.fichier)
+
+        # L'instantané n'a pas été réécrit : les modifications viennent du journal
+        self.assertEqual(set(instantane), {"1984", "Moby Dick"})
+        self.assertEqual(set(relus), {"1984", "Le Petit Prince"})
+        self.assertEqual(relus["1984"]["Exemplaires"], 1)
+        self.assertEqual(relus["Le Petit Prince"]["Auteur"], "Antoine de Saint-Exupéry")
+        self.assertEqual(relus.trouver_titre("le petit prince"), "Le Petit Prince")
+        self.assertFalse(relus.titres_modifies)
+        self.assertIn("illisible", sortie.getvalue())
+
+    def test_compaction_vide_le_journal(self):
+        livres = lire_bibliotheque(self.fichier)
+        livres["1984"]["Exemplaires"] = 5
+        livres.marquer_modifie("1984")
+        sauvegarder_bibliotheque(livres, self.fichier)
+        self.assertTrue(os.path.isfile(chemin_journal(self.fichier)))
+
+        sauvegarder_bibliotheque(livres, self.fichier, compacter=True)
+
+        self.assertFalse(os.path.isfile(chemin_journal(self.fichier)))
+        self.assertEqual(lire_bibliotheque(self.fichier)["1984"]["Exemplaires"], 5)
+
+    def test_compaction_au_seuil(self):
+        livres = lire_bibliotheque(self.fichier)
+        with mock.patch.object(gestion_fichiers, "SEUIL_COMPACTION", 3):
+            for exemplaires in (3, 4):
+                livres["1984"]["Exemplaires"] = exemplaires
+                livres.marquer_modifie("1984")
+                sauvegarder_bibliotheque(livres, self.fichier)
+            self.assertTrue(os.path.isfile(chemin_journal(self.fichier)))
+
+            # La troisième entrée atteindrait le seuil : l'instantané est réécrit à la place
+            livres["1984"]["Exemplaires"] = 5
+            livres.marquer_modifie("1984")
+            sauvegarder_bibliotheque(livres, self.fichier)
+
+        self.assertFalse(os.path.isfile(chemin_journal(self.fichier)))
+        with open(self.fichier, "r", encoding="utf-8") as file:
+            self.assertEqual(json.load(file)["1984"]["Exemplaires"], 5)
+
+    def test_ecriture_atomique_interrompue(self):
+        with self.assertRaises(RuntimeError):
+            with ecriture_atomique(self.fichier) as file:
+                file.write("{")
+                raise RuntimeError("arrêt pendant l'écriture")
+
+        # L'ancien instantané est intact et aucun fichier temporaire ne reste dans le dossier
+        self.assertEqual(os.listdir(self.dossier), ["bibliotheque.json"])
+        self.assertEqual(set(lire_bibliotheque(self.fichier)), {"1984", "Moby Dick"})
+
+
+class TestJournalEmprunts(unittest.TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.mkdtemp()
+        self.fichier = os.path.join(self.dossier, "emprunt.csv")
+        claire = Emprunteur("Dubois", "Claire", photo_id="dubois_claire.jpg", emprunts={
+            "1": Emprunt.depuis_texte("1984", "2025-04-10"),
+        })
+        sauvegarder_emprunts(RegistrePersonnes([claire]), self.fichier)
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier)
+
+    def test_rejeu_apres_arret_brutal(self):
+        personnes = lire_emprunts(self.fichier)
+        claire = personnes.trouver("dubois", "claire")
+        claire["emprunts"]["1"].jour_retour = Emprunt.depuis_texte("1984", "2025-04-20").jour_emprunt
+        claire["emprunts"]["2"] = Emprunt.depuis_texte("Moby Dick", "2025-04-20")
+        journaliser_personne(personnes, claire, self.fichier)
+        thomas = Emprunteur("Martin", "Thomas", 1, emprunts={"1": Emprunt.depuis_texte("1984", "2025-04-21")})
+        personnes.append(thomas)
+        journaliser_personne(personnes, thomas, self.fichier)
+        ajouter_ligne_tronquee(self.fichier)
+
+        with redirect_stdout(io.StringIO()):
+            relues = lire_emprunts(self.fichier)
+
+        self.assertEqual(len(relues), 2)
+        claire = relues.trouver("Dubois", "Claire")
+        self.assertEqual(claire["emprunts"]["1"]["date_retour"], "2025-04-20")
+        self.assertEqual(claire["emprunts"]["2"]["titre"], "Moby Dick")
+        self.assertEqual(claire["photo_id"], "dubois_claire.jpg")
+        self.assertEqual(relues.trouver("martin", "thomas")["emprunts"]["1"]["titre"], "1984")
+
+    def test_rejeu_d_un_renommage(self):
+        personnes = lire_emprunts(self.fichier)
+        claire = personnes.trouver("Dubois", "Claire")
+        personnes.renommer(claire, "Durand", "Claire")
+        journaliser_personne(personnes, claire, self.fichier, cle=("Dubois", "Claire"))
+
+        relues = lire_emprunts(self.fichier)
+
+        self.assertEqual(len(relues), 1)
+        self.assertIsNone(relues.trouver("Dubois", "Claire"))
+        self.assertEqual(relues.trouver("Durand", "Claire")["emprunts"]["1"]["titre"], "1984")
+
+    def test_compaction_au_seuil(self):
+        personnes = lire_emprunts(self.fichier)
+        claire = personnes.trouver("Dubois", "Claire")
+        with mock.patch.object(gestion_fichiers, "SEUIL_COMPACTION", 2):
+            claire["emprunts"]["2"] = Emprunt.depuis_texte("Dune", "2025-04-11")
+            journaliser_personne(personnes, claire, self.fichier)
+            self.assertTrue(os.path.isfile(chemin_journal(self.fichier)))
+
+            claire["emprunts"]["3"] = Emprunt.depuis_texte("Moby Dick", "2025-04-12")
+            journaliser_personne(personnes, claire, self.fichier)
+
+        self.assertFalse(os.path.isfile(chemin_journal(self.fichier)))
+        self.assertEqual(list(lire_emprunts(self.fichier).trouver("Dubois", "Claire")["emprunts"]), ["1", "2", "3"])
+
+    def test_compaction_interrompue(self):
+        personnes = lire_emprunts(self.fichier)
+        claire = personnes.trouver("Dubois", "Claire")
+        claire["emprunts"]["2"] = Emprunt.depuis_texte("Dune", "2025-04-11")
+        journaliser_personne(personnes, claire, self.fichier)
+
+        # Arrêt juste avant le renommage du fichier temporaire
+        with mock.patch.object(gestion_fichiers.os, "replace", side_effect=OSError("arrêt brutal")):
+            with self.assertRaises(OSError):
+                sauvegarder_emprunts(personnes, self.fichier)
+
+        # L'ancien instantané et le journal sont conservés : aucun emprunt n'est perdu
+        self.assertEqual(sorted(os.listdir(self.dossier)), ["emprunt.csv", "emprunt.csv.journal"])
+        self.assertEqual(list(lire_emprunts(self.fichier).trouver("Dubois", "Claire")["emprunts"]), ["1", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
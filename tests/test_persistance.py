@@ -0,0 +1,112 @@
+"""
+    Tests de la sauvegarde différée : écriture à l'arrêt et reprise après une écriture qui a échoué
+"""
+import io
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from utils import persistance as module_persistance
+from utils.catalogue import Catalogue
+from utils.gestion_fichiers import chemin_journal
+from utils.gestion_fichiers import ecrire_journal_personne
+from utils.gestion_fichiers import lire_bibliotheque
+from utils.gestion_fichiers import lire_emprunts
+from utils.gestion_fichiers import sauvegarder_bibliotheque
+from utils.gestion_fichiers import sauvegarder_emprunts
+from utils.modeles import Emprunt
+from utils.modeles import Emprunteur
+from utils.persistance import demarrer_persistance
+from utils.registre import RegistrePersonnes
+
+
+class TestPersistanceDifferee(unittest.TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.mkdtemp()
+        self.fichier_bibliotheque = os.path.join(self.dossier, "bibliotheque.json")
+        self.fichier_emprunt = os.path.join(self.dossier, "emprunt.csv")
+        sauvegarder_bibliotheque(Catalogue({
+            "1984": {"Auteur": "George Orwell", "Année": 1949, "Genre": "Dystopie", "Exemplaires": 2},
+        }), self.fichier_bibliotheque, compacter=True)
+        sauvegarder_emprunts(RegistrePersonnes([
+            Emprunteur("Dubois", "Claire", 1, emprunts={"1": Emprunt.depuis_texte("1984", "2025-04-10")}),
+            Emprunteur("Martin", "Thomas", emprunts={
+                "1": Emprunt.depuis_texte("Dune", "2025-03-01", "2025-03-09"),
+            }),
+        ]), self.fichier_emprunt)
+        self.livres = lire_bibliotheque(self.fichier_bibliotheque)
+        self.personnes = lire_emprunts(self.fichier_emprunt)
+        self.persistance = demarrer_persistance(self.livres, self.fichier_bibliotheque,
+                                                self.personnes, self.fichier_emprunt, delai=0)
+        reprise = mock.patch.object(module_persistance, "DELAI_REPRISE", 0.01)
+        reprise.start()
+        self.addCleanup(reprise.stop)
+
+    def tearDown(self):
+        self.persistance.arreter()
+        shutil.rmtree(self.dossier)
+
+    def test_transactions_ecrites_a_l_arret(self):
+        claire = self.personnes.trouver("Dubois", "Claire")
+        claire["emprunts"]["2"] = Emprunt.depuis_texte("Dune", "2025-04-12")
+        self.persistance.enregistrer_personne(claire)
+        self.livres["1984"]["Exemplaires"] -= 1
+        self.livres.marquer_modifie("1984")
+        self.persistance.enregistrer_livres()
+
+        self.persistance.arreter()
+
+        self.assertEqual(list(lire_emprunts(self.fichier_emprunt).trouver("Dubois", "Claire")["emprunts"]),
+                         ["1", "2"])
+        self.assertEqual(lire_bibliotheque(self.fichier_bibliotheque)["1984"]["Exemplaires"], 1)
+
+    def test_reprise_apres_base_verrouillee(self):
+        ecrites = []
+
+        def ecrire(personne, fichier_emprunt, cle=None):
+            # La seconde écriture échoue une fois, comme une base SQLite verrouillée
+            if len(ecrites) == 1:
+                ecrites.append(None)
+                raise sqlite3.OperationalError("database is locked")
+            ecrites.append(personne["nom"])
+            ecrire_journal_personne(personne, fichier_emprunt, cle)
+
+        claire = self.personnes.trouver("Dubois", "Claire")
+        thomas = self.personnes.trouver("Martin", "Thomas")
+        with mock.patch.object(module_persistance, "ecrire_journal_personne", ecrire), \
+                redirect_stdout(io.StringIO()) as sortie:
+            self.personnes.renommer(claire, "Durand", "Claire")
+            self.persistance.enregistrer_personne(claire, cle=("Dubois", "Claire"))
+            self.persistance.enregistrer_personne(thomas)
+            self.persistance.attendre()
+            self.assertTrue(self.persistance._thread.is_alive())
+            self.persistance.attendre()
+
+        self.assertIn("database is locked", sortie.getvalue())
+        # Chaque personne n'est écrite qu'une fois : la personne renommée n'est pas réécrite sous son ancienne clé
+        self.assertEqual(ecrites, ["Durand", None, "Martin"])
+        relues = lire_emprunts(self.fichier_emprunt)
+        self.assertEqual(sorted(p["nom"] for p in relues), ["Durand", "Martin"])
+
+    def test_compaction_apres_echec(self):
+        claire = self.personnes.trouver("Dubois", "Claire")
+        claire["emprunts"]["2"] = Emprunt.depuis_texte("Dune", "2025-04-12")
+        with mock.patch.object(module_persistance, "ecrire_journal_personne", side_effect=OSError("disque plein")), \
+                redirect_stdout(io.StringIO()):
+            self.persistance.enregistrer_personne(claire)
+            self.persistance.compacter(compacter_tout=True)
+            self.persistance.arreter()
+
+        # L'instantané contient l'état en mémoire ; rien ne reste à ajouter au journal
+        self.assertFalse(os.path.isfile(chemin_journal(self.fichier_emprunt)))
+        self.assertEqual(list(lire_emprunts(self.fichier_emprunt).trouver("Dubois", "Claire")["emprunts"]),
+                         ["1", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
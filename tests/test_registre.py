@@ -0,0 +1,74 @@
+"""
+    Tests du registre des personnes : index (nom, prénom) tenu à jour par toutes les méthodes de liste
+"""
+import unittest
+
+from utils.modeles import Emprunt
+from utils.modeles import Emprunteur
+from utils.registre import RegistrePersonnes
+
+
+class TestRegistrePersonnes(unittest.TestCase):
+
+    def setUp(self):
+        self.claire = Emprunteur("Dubois", "Claire", emprunts={"1": Emprunt.depuis_texte("1984", "2020-01-01")})
+        self.thomas = Emprunteur("Martin", "Thomas")
+        self.zoe = Emprunteur("Élie", "Zoé")
+        self.personnes = RegistrePersonnes([self.claire, self.thomas])
+
+    def test_trouver_sans_casse_ni_espaces(self):
+        self.assertIs(self.personnes.trouver(" dubois ", "CLAIRE"), self.claire)
+        self.assertIsNone(self.personnes.trouver("Dubois", "Marie"))
+
+    def test_ajouts(self):
+        self.personnes.insert(0, self.zoe)
+        self.assertIs(self.personnes.trouver("élie", "zoé"), self.zoe)
+        self.personnes += [Emprunteur("Petit", "Léa")]
+        self.assertEqual(self.personnes.trouver("Petit", "Léa")["nom"], "Petit")
+        self.personnes[1] = Emprunteur("Grand", "Paul")
+        self.assertIsNone(self.personnes.trouver("Dubois", "Claire"))
+        self.assertIsNotNone(self.personnes.trouver("Grand", "Paul"))
+
+    def test_retraits(self):
+        self.personnes.emprunts_non_charges[id(self.claire)] = [("Dubois", "Claire"), 4]
+        self.assertEqual(len(self.personnes.retards().en_retard()), 1)
+
+        self.personnes.remove(self.claire)
+        self.assertIsNone(self.personnes.trouver("Dubois", "Claire"))
+        self.assertEqual(self.personnes.emprunts_non_charges, {})
+        self.assertEqual(self.personnes.retards().en_retard(), [])
+
+        self.personnes.extend([self.claire, self.zoe])
+        self.assertIs(self.personnes.pop(), self.zoe)
+        self.assertIsNone(self.personnes.trouver("Élie", "Zoé"))
+        del self.personnes[0:1]
+        self.assertIsNone(self.personnes.trouver("Martin", "Thomas"))
+        self.assertIs(self.personnes.trouver("Dubois", "Claire"), self.claire)
+        self.personnes.clear()
+        self.assertIsNone(self.personnes.trouver("Dubois", "Claire"))
+
+    def test_renommer(self):
+        self.personnes.renommer(self.claire, "Durand", "Claire")
+        self.assertIsNone(self.personnes.trouver("Dubois", "Claire"))
+        self.assertIs(self.personnes.trouver("durand", "claire"), self.claire)
+        # Changer seulement la casse reste possible
+        self.personnes.renommer(self.claire, "DURAND", "Claire")
+        self.assertEqual(self.claire["nom"], "DURAND")
+
+    def test_renommer_vers_un_nom_existant(self):
+        with self.assertRaises(ValueError):
+            self.personnes.renommer(self.claire, "Martin", "thomas")
+        # Les deux personnes restent retrouvables sous leur nom
+        self.assertEqual(self.claire["nom"], "Dubois")
+        self.assertIs(self.personnes.trouver("Dubois", "Claire"), self.claire)
+        self.assertIs(self.personnes.trouver("Martin", "Thomas"), self.thomas)
+
+    def test_prochain_emprunt_id(self):
+        self.assertEqual(self.personnes.prochain_emprunt_id(self.claire), "2")
+        self.personnes.emprunts_non_charges[id(self.claire)] = [("Dubois", "Claire"), 7]
+        self.assertEqual(self.personnes.prochain_emprunt_id(self.claire), "8")
+        self.assertEqual(self.personnes.prochain_emprunt_id(self.thomas), "1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+    Tests de l'index des retards : emprunts en retard à une date, prévisions et emprunts rendus entre-temps
+"""
+import unittest
+from datetime import date
+
+from utils.catalogue import Catalogue
+from utils.emprunts_lot import appliquer_operations
+from utils.modeles import Emprunt
+from utils.modeles import Emprunteur
+from utils.registre import RegistrePersonnes
+from utils.retards import total_par_personne
+
+
+class TestIndexRetards(unittest.TestCase):
+
+    def setUp(self):
+        self.claire = Emprunteur("Dubois", "Claire", 2, emprunts={
+            "1": Emprunt.depuis_texte("1984", "2025-04-01"),
+            "2": Emprunt.depuis_texte("Dune", "2025-04-10"),
+            "3": Emprunt.depuis_texte("Moby Dick", "2025-01-01", "2025-01-30"),
+        })
+        self.thomas = Emprunteur("Martin", "Thomas", 1, emprunts={"1": Emprunt.depuis_texte("Germinal", "2025-03-20")})
+        self.personnes = RegistrePersonnes([self.claire, self.thomas])
+
+    def test_en_retard(self):
+        lignes = self.personnes.retards().en_retard(date(2025, 4, 20))
+
+        # Échéances : Germinal le 03/04, 1984 le 15/04 ; Dune (24/04) n'est pas encore en retard
+        self.assertEqual([ligne["emprunt"]["titre"] for ligne in lignes], ["Germinal", "1984"])
+        self.assertEqual([ligne["jours"] for ligne in lignes], [17, 5])
+        self.assertAlmostEqual(lignes[0]["montant"], 1.7)
+        self.assertEqual(lignes[1]["echeance"], date(2025, 4, 15))
+        totaux = total_par_personne(lignes)
+        self.assertEqual([(personne["nom"], nbr) for personne, nbr, _ in totaux], [("Martin", 1), ("Dubois", 1)])
+
+        previsions = self.personnes.retards().previsions(date(2025, 4, 20))
+        self.assertEqual([ligne["jours"] for ligne in previsions], [17, 5, 0])
+
+    def test_emprunts_et_retours_suivis(self):
+        livres = Catalogue({
+            "Dune": {"Auteur": "Frank Herbert", "Année": 1965, "Genre": "Science-fiction", "Exemplaires": 1},
+            "Germinal": {"Auteur": "Émile Zola", "Année": 1885, "Genre": "Roman", "Exemplaires": 0},
+        })
+        retards = self.personnes.retards()
+        bilan = appliquer_operations([
+            {"operation": "retour", "titre": "Germinal", "nom": "Martin", "prenom": "Thomas", "date": "2025-04-05"},
+            {"operation": "emprunt", "titre": "Dune", "nom": "Martin", "prenom": "Thomas", "date": "2025-03-01"},
+        ], livres, self.personnes)
+        self.assertEqual(bilan["erreurs"], [])
+
+        # Le même index est réutilisé : le retour est ignoré, le nouvel emprunt est ajouté à sa place
+        self.assertIs(self.personnes.retards(), retards)
+        lignes = retards.en_retard(date(2025, 4, 20))
+        self.assertEqual([(ligne["personne"]["nom"], ligne["emprunt"]["titre"]) for ligne in lignes],
+                         [("Martin", "Dune"), ("Dubois", "1984")])
+
+
+if __name__ == "__main__":
+    unittest.main()
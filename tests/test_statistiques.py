@@ -0,0 +1,83 @@
+"""
+    Tests des statistiques des emprunts : premier calcul (historique et archives compris) et mises à jour
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from utils.archives import archiver_emprunts
+from utils.catalogue import Catalogue
+from utils.emprunts_lot import traiter_lot
+from utils.gestion_fichiers import lire_emprunts
+from utils.gestion_fichiers import sauvegarder_bibliotheque
+from utils.gestion_fichiers import sauvegarder_emprunts
+from utils.modeles import Emprunt
+from utils.modeles import Emprunteur
+from utils.registre import RegistrePersonnes
+from utils.statistiques import statistiques_emprunts
+
+
+def compteurs(statistiques):
+    return (dict(statistiques.emprunts_par_titre), dict(statistiques.emprunts_par_personne),
+            dict(statistiques.en_pret_par_titre), statistiques.exemplaires_en_pret)
+
+
+class TestStatistiques(unittest.TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.mkdtemp()
+        self.fichier_bibliotheque = os.path.join(self.dossier, "bibliotheque.json")
+        self.fichier_emprunt = os.path.join(self.dossier, "emprunt.csv")
+        self.livres = Catalogue({
+            "1984": {"Auteur": "George Orwell", "Année": 1949, "Genre": "Dystopie", "Exemplaires": 1},
+            "Dune": {"Auteur": "Frank Herbert", "Année": 1965, "Genre": "Science-fiction", "Exemplaires": 2},
+        })
+        sauvegarder_bibliotheque(self.livres, self.fichier_bibliotheque, compacter=True)
+        sauvegarder_emprunts(RegistrePersonnes([
+            Emprunteur("Dubois", "Claire", 1, emprunts={
+                "1": Emprunt.depuis_texte("Dune", "2020-03-01", "2020-03-10"),
+                "2": Emprunt.depuis_texte("1984", "2024-11-01", "2024-11-12"),
+                "3": Emprunt.depuis_texte("1984", "2025-04-10"),
+            }),
+            Emprunteur("Martin", "Thomas", emprunts={"1": Emprunt.depuis_texte("Dune", "2021-01-05", "2021-01-15")}),
+        ]), self.fichier_emprunt)
+        archiver_emprunts(lire_emprunts(self.fichier_emprunt), self.fichier_emprunt, "2022-01-01")
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier)
+
+    def test_premier_calcul(self):
+        # Sans historique : les emprunts clos viennent d'emprunt.csv et des archives
+        statistiques = statistiques_emprunts(lire_emprunts(self.fichier_emprunt, historique=False),
+                                             self.fichier_emprunt)
+
+        self.assertEqual(statistiques.plus_empruntes(), [("1984", 2), ("Dune", 2)])
+        self.assertEqual(statistiques.plus_actifs(), [(("dubois", "claire"), 3), (("martin", "thomas"), 1)])
+        self.assertEqual((dict(statistiques.en_pret_par_titre), statistiques.exemplaires_en_pret), ({"1984": 1}, 1))
+        self.assertEqual(statistiques.en_pret_par_genre(self.livres), {"Dystopie": 1})
+        self.assertEqual(compteurs(statistiques),
+                         compteurs(statistiques_emprunts(lire_emprunts(self.fichier_emprunt), self.fichier_emprunt)))
+
+    def test_mises_a_jour_identiques_a_un_recalcul(self):
+        personnes = lire_emprunts(self.fichier_emprunt, historique=False)
+        statistiques = statistiques_emprunts(personnes, self.fichier_emprunt)
+        traiter_lot([
+            {"operation": "retour", "titre": "1984", "nom": "", "prenom": "", "date": "2025-04-12"},
+            {"operation": "emprunt", "titre": "Dune", "nom": "Martin", "prenom": "Thomas", "date": "2025-04-13"},
+            {"operation": "emprunt", "titre": "Dune", "nom": "Petit", "prenom": "Léa", "date": "2025-04-13"},
+        ], self.livres, self.fichier_bibliotheque, personnes, self.fichier_emprunt)
+        personnes.renommer(personnes.trouver("Dubois", "Claire"), "Durand", "Claire")
+        sauvegarder_emprunts(personnes, self.fichier_emprunt)
+
+        self.assertIs(statistiques_emprunts(personnes, self.fichier_emprunt), statistiques)
+        self.assertEqual(statistiques.en_pret_par_titre, {"Dune": 2})
+        self.assertEqual(statistiques.emprunts_par_personne[("durand", "claire")], 3)
+        recalcul = statistiques_emprunts(lire_emprunts(self.fichier_emprunt), self.fichier_emprunt)
+        # Les archives gardent l'ancien nom de Claire tant qu'elles ne sont pas renommées
+        recalcul.renommer(("Dubois", "Claire"), ("Durand", "Claire"))
+        self.assertEqual(compteurs(statistiques), compteurs(recalcul))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+    Tests du stockage SQLite : aller-retour, mises à jour ligne par ligne et recherche d'un emprunteur
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from utils import stockage_sqlite
+from utils.catalogue import Catalogue
+from utils.gestion_fichiers import journaliser_personne
+from utils.gestion_fichiers import lire_bibliotheque
+from utils.gestion_fichiers import lire_emprunteurs
+from utils.gestion_fichiers import lire_emprunts
+from utils.gestion_fichiers import sauvegarder_bibliotheque
+from utils.modeles import Emprunt
+from utils.modeles import Emprunteur
+from utils.persistance import demarrer_persistance
+from utils.registre import RegistrePersonnes
+
+
+class TestStockageSqlite(unittest.TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.mkdtemp()
+        self.fichier = os.path.join(self.dossier, "bibliotheque.db")
+        livres = Catalogue({
+            "1984": {"Auteur": "George Orwell", "Année": 1949, "Genre": "Dystopie", "Exemplaires": 2},
+            "Moby Dick": {"Auteur": "Herman Melville", "Année": 1851, "Genre": "Aventure", "Exemplaires": 1},
+        })
+        personnes = RegistrePersonnes([
+            Emprunteur("Dubois", "Claire", 1, "dubois_claire.jpg", {
+                "1": Emprunt.depuis_texte("Moby Dick", "2025-04-01", "2025-04-10"),
+                "2": Emprunt.depuis_texte("1984", "2025-04-12"),
+            }),
+            Emprunteur("Élie", "Zoé", emprunts={"1": Emprunt.depuis_texte("1984", "2025-03-01", "2025-03-05")}),
+        ])
+        stockage_sqlite.migrer_vers_sqlite(livres, personnes, self.fichier)
+
+    def tearDown(self):
+        stockage_sqlite._connexions.pop(self.fichier).close()
+        shutil.rmtree(self.dossier)
+
+    def test_aller_retour(self):
+        livres = lire_bibliotheque(self.fichier)
+        personnes = lire_emprunts(self.fichier)
+
+        self.assertEqual(list(livres), ["1984", "Moby Dick"])
+        self.assertEqual(livres["1984"]["Exemplaires"], 2)
+        self.assertFalse(livres.titres_modifies)
+        claire = personnes.trouver("Dubois", "Claire")
+        self.assertEqual(claire["photo_id"], "dubois_claire.jpg")
+        self.assertEqual(claire["emprunts"]["1"]["date_retour"], "2025-04-10")
+        self.assertEqual(claire["nbr_livres_empruntes"], 1)
+
+    def test_transactions_ligne_par_ligne(self):
+        livres = lire_bibliotheque(self.fichier)
+        personnes = lire_emprunts(self.fichier)
+        conn = stockage_sqlite.connexion(self.fichier)
+
+        livres["1984"]["Exemplaires"] -= 1
+        livres.marquer_modifie("1984")
+        changements = conn.total_changes
+        sauvegarder_bibliotheque(livres, self.fichier)
+        self.assertEqual(conn.total_changes - changements, 1)
+
+        claire = personnes.trouver("Dubois", "Claire")
+        personnes.renommer(claire, "Durand", "Claire")
+        journaliser_personne(personnes, claire, self.fichier, cle=("Dubois", "Claire"))
+
+        self.assertEqual(lire_bibliotheque(self.fichier)["1984"]["Exemplaires"], 1)
+        relues = lire_emprunts(self.fichier)
+        self.assertIsNone(relues.trouver("Dubois", "Claire"))
+        self.assertEqual(list(relues.trouver("Durand", "Claire")["emprunts"]), ["1", "2"])
+
+    def test_trouver_emprunteur(self):
+        claire = stockage_sqlite.trouver_emprunteur(self.fichier, " dubois", "CLAIRE ")
+        self.assertEqual((claire["nom"], claire["prenom"]), ("Dubois", "Claire"))
+        self.assertEqual(list(claire["emprunts"]), ["1", "2"])
+        # Lettres accentuées : la casse est comparée comme dans RegistrePersonnes
+        self.assertEqual(stockage_sqlite.trouver_emprunteur(self.fichier, "ÉLIE", "zoé")["nom"], "Élie")
+        self.assertIsNone(stockage_sqlite.trouver_emprunteur(self.fichier, "Martin", "Thomas"))
+
+        personnes = lire_emprunteurs(self.fichier, [("dubois", "claire"), ("Dubois", "Claire"), ("Martin", "X")])
+        self.assertEqual([p["nom"] for p in personnes], ["Dubois"])
+
+    def test_compaction_sans_reecriture(self):
+        livres = lire_bibliotheque(self.fichier)
+        personnes = lire_emprunts(self.fichier)
+        persistance = demarrer_persistance(livres, self.fichier, personnes, self.fichier, delai=0)
+        conn = stockage_sqlite.connexion(self.fichier)
+        try:
+            claire = personnes.trouver("Dubois", "Claire")
+            claire["emprunts"]["2"].jour_retour = claire["emprunts"]["2"].jour_emprunt + 3
+            persistance.enregistrer_personne(claire)
+            persistance.attendre()
+            changements = conn.total_changes
+
+            persistance.compacter(compacter_tout=True)
+
+            # Aucune ligne n'est supprimée ni réinsérée : seul le journal WAL est replié
+            self.assertEqual(conn.total_changes, changements)
+        finally:
+            persistance.arreter()
+        self.assertEqual(lire_emprunts(self.fichier).trouver("Dubois", "Claire")["emprunts"]["2"]["date_retour"],
+                         "2025-04-15")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+    Module affichage : écriture des résultats dans le widget de texte de la fenêtre principale
+
+    Le texte à afficher est d'abord construit dans un tampon (Rendu), où les lignes consécutives de même style
+    sont regroupées, puis inséré dans le widget en un seul appel (avec les tags de style), au lieu d'un appel
+    à result_text.insert par ligne. Les très longs résultats sont insérés par blocs, via after(), pour que
+    la fenêtre reste réactive ; effacer le widget interrompt l'insertion en cours.
+
+    Fonctions :
+        • Rendu (tampon des lignes à afficher)
+        • configurer_styles
+        • effacer_resultat
+        • afficher_lignes
+"""
+import tkinter as tk
+
+# Styles utilisables pour les lignes (tags du widget de texte)
+STYLES = {
+    "entete": {"font": ("Helvetica", 14, "bold")},
+    "separateur": {"foreground": "#808080"},
+    "succes": {"foreground": "#1b7f3b"},
+    "erreur": {"foreground": "#b00020"},
+    "suggestion": {"foreground": "#1f4e9c"},
+}
+
+# Nombre de lignes insérées à chaque fois lors d'un affichage par blocs
+TAILLE_BLOC = 2000
+
+# Widget de texte -> identifiant du after() de l'insertion par blocs en cours
+_insertions_en_cours = {}
+
+
+class Rendu:
+    """Tampon des lignes à afficher, avec leur style."""
+
+    def __init__(self):
+        # Liste de [lignes, style] : les lignes consécutives de même style sont regroupées
+        self.segments = []
+        self.nbr_lignes = 0
+
+    def ligne(self, texte="", style=None):
+        """
+        :param texte: Chaîne à afficher (sans retour à la ligne final)
+        :param style: Nom d'un style de STYLES, None pour le style par défaut
+        :return: Le rendu lui-même (pour enchaîner les appels)
+        """
+        if self.segments and self.segments[-1][1] == style:
+            self.segments[-1][0].append(texte)
+        else:
+            self.segments.append([[texte], style])
+        self.nbr_lignes += 1
+        return self
+
+    def lignes(self, textes, style=None):
+        """
+        :param textes: Itérable de chaînes à afficher, une par ligne
+        :param style: Nom d'un style de STYLES, None pour le style par défaut
+        :return: Le rendu lui-même (pour enchaîner les appels)
+        """
+        for texte in textes:
+            self.ligne(texte, style)
+        return self
+
+    def blocs(self, taille_bloc=TAILLE_BLOC):
+        """
+        :param taille_bloc: Nombre maximal de lignes par bloc
+        :return: Générateur de listes d'arguments pour Text.insert (texte, tags, texte, tags...), une par bloc
+        """
+        arguments = []
+        reste = taille_bloc
+        for textes, style in self.segments:
+            tags = (style,) if style else ()
+            debut = 0
+            while debut < len(textes):
+                morceau = textes[debut:debut + reste]
+                arguments += ["\n".join(morceau) + "\n", tags]
+                debut += len(morceau)
+                reste -= len(morceau)
+                if reste == 0:
+                    yield arguments
+                    arguments = []
+                    reste = taille_bloc
+        if arguments:
+            yield arguments
+
+
+def configurer_styles(result_text):
+    """
+    :param result_text: Widget de texte dans lequel les résultats sont affichés
+    :return: Aucun, définit les tags de style du widget (une seule fois)
+    """
+    if getattr(result_text, "styles_configures", False):
+        return
+    for style, options in STYLES.items():
+        result_text.tag_configure(style, **options)
+    result_text.styles_configures = True
+
+
+def effacer_resultat(result_text):
+    """
+    :param result_text: Widget de texte à vider
+    :return: Aucun, interrompt aussi l'insertion par blocs éventuellement en cours
+    """
+    identifiant = _insertions_en_cours.pop(result_text, None)
+    if identifiant is not None:
+        result_text.after_cancel(identifiant)
+    result_text.delete(1.0, tk.END)
+
+
+def afficher_lignes(result_text, rendu, effacer=True, taille_bloc=TAILLE_BLOC):
+    """
+    :param result_text: Widget de texte dans lequel afficher le résultat
+    :param rendu: Rendu contenant les lignes à afficher
+    :param effacer: True pour vider le widget avant l'affichage
+    :param taille_bloc: Nombre de lignes insérées par appel (les blocs suivants le sont via after())
+    :return: Aucun
+    """
+    if effacer:
+        effacer_resultat(result_text)
+    configurer_styles(result_text)
+    blocs = rendu.blocs(taille_bloc)
+
+    def inserer_bloc():
+        """Insère le bloc suivant en un seul appel puis programme l'insertion du bloc d'après."""
+        _insertions_en_cours.pop(result_text, None)
+        if not result_text.winfo_exists():
+            return
+        arguments = next(blocs, None)
+        if arguments is None:
+            return
+        result_text.insert(tk.END, *arguments)
+        _insertions_en_cours[result_text] = result_text.after(1, inserer_bloc)
+
+    inserer_bloc()
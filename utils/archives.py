@@ -0,0 +1,190 @@
+"""
+    Module archives : archivage par année des emprunts clos
+
+    Les emprunts rendus avant une date limite quittent emprunt.csv pour un fichier par année de retour
+    (data/archives/emprunt_2024.csv, data/archives/emprunt_2025.csv...), une ligne par emprunt.
+    Ces fichiers ne sont ni relus au démarrage ni réécrits lors de la compaction : emprunt.csv reste petit,
+    quel que soit le nombre d'années d'activité de la bibliothèque.
+
+    Le dernier emprunt de chaque personne reste toujours dans emprunt.csv : la personne (et sa photo) y est
+    conservée et les numéros de ses prochains emprunts continuent après ceux des emprunts archivés.
+
+    Fonctions :
+        • date_limite_par_defaut
+        • fichier_archive
+        • fichiers_archives
+        • archiver_emprunts
+        • lire_archives
+        • historique_emprunts
+        • renommer_dans_archives
+"""
+import csv
+import os
+import re
+from datetime import date
+from datetime import timedelta
+
+from utils.gestion_fichiers import charger_historique
+from utils.gestion_fichiers import ecriture_atomique
+from utils.gestion_fichiers import est_base_sqlite
+from utils.gestion_fichiers import sauvegarder_emprunts
+from utils.modeles import Emprunt
+from utils.modeles import jour_depuis_texte
+from utils.registre import cle_personne
+
+CHAMPS_ARCHIVE = ["nom", "prenom", "emprunt_id", "titre", "date_emprunt", "date_retour"]
+
+# Ancienneté (en jours) par défaut des retours à archiver
+ANCIENNETE_ARCHIVAGE = 365
+
+
+def date_limite_par_defaut():
+    """
+    :return: (str) la date (AAAA-MM-JJ) avant laquelle les retours sont archivés par défaut
+    """
+    return (date.today() - timedelta(days=ANCIENNETE_ARCHIVAGE)).strftime("%Y-%m-%d")
+
+
+def fichier_archive(fichier_emprunt, annee):
+    """
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :param annee: (str) l'année de retour des emprunts archivés
+    :return: (str) Chemin vers le fichier d'archive de cette année (dossier archives à côté de emprunt.csv)
+    """
+    base, extension = os.path.splitext(os.path.basename(fichier_emprunt))
+    return os.path.join(os.path.dirname(fichier_emprunt), "archives", f"{base}_{annee}{extension}")
+
+
+def fichiers_archives(fichier_emprunt):
+    """
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :return: (list) tuples (année, chemin) des fichiers d'archive existants, de la plus ancienne à la plus récente
+    """
+    dossier = os.path.dirname(fichier_archive(fichier_emprunt, ""))
+    if not os.path.isdir(dossier):
+        return []
+    base, extension = os.path.splitext(os.path.basename(fichier_emprunt))
+    motif = re.compile(rf"{re.escape(base)}_(\d{{4}}){re.escape(extension)}$")
+    archives = []
+    for nom_fichier in os.listdir(dossier):
+        correspondance = motif.match(nom_fichier)
+        if correspondance:
+            archives.append((correspondance.group(1), os.path.join(dossier, nom_fichier)))
+    return sorted(archives)
+
+
+def archiver_emprunts(personnes, fichier_emprunt, date_limite=None):
+    """
+    Déplace les emprunts rendus avant la date limite vers les fichiers d'archive de leur année de retour,
+    puis réécrit emprunt.csv sans eux.
+
+    :param personnes: (RegistrePersonnes) toutes les personnes, lues avec tout leur historique
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :param date_limite: (str) date AAAA-MM-JJ : les emprunts rendus avant cette date sont archivés
+                        (par défaut, ceux rendus il y a plus de ANCIENNETE_ARCHIVAGE jours)
+    :return: (dict) année -> nombre d'emprunts archivés
+    :raise ValueError: si les emprunts sont dans une base SQLite ou n'ont pas été lus avec tout leur historique
+    """
+    if est_base_sqlite(fichier_emprunt):
+        raise ValueError("L'archivage ne concerne que les emprunts enregistrés dans un fichier CSV !")
+    if personnes.emprunts_non_charges:
+        raise ValueError("Les emprunts doivent être lus avec tout leur historique pour être archivés !")
+    jour_limite = jour_depuis_texte(date_limite or date_limite_par_defaut())
+
+    lignes_par_annee = {}
+    for personne in personnes:
+        emprunts = personne["emprunts"]
+        if len(emprunts) < 2:
+            continue
+        dernier = max(emprunts, key=int)
+        a_archiver = [num for num, e in emprunts.items()
+                      if num != dernier and 0 < e.jour_retour < jour_limite]
+        for num in a_archiver:
+            emprunt = emprunts.pop(num)
+            lignes_par_annee.setdefault(emprunt["date_retour"][:4], []).append(
+                [personne["nom"], personne["prenom"], num, emprunt["titre"], emprunt["date_emprunt"],
+                 emprunt["date_retour"]])
+
+    if not lignes_par_annee:
+        return {}
+
+    # Les archives sont écrites avant emprunt.csv : un arrêt brutal entre les deux laisse au pire
+    # un emprunt en double (ignoré par historique_emprunts), jamais un emprunt perdu
+    os.makedirs(os.path.dirname(fichier_archive(fichier_emprunt, "")), exist_ok=True)
+    for annee, lignes in sorted(lignes_par_annee.items()):
+        chemin = fichier_archive(fichier_emprunt, annee)
+        nouveau_fichier = not os.path.isfile(chemin)
+        with open(chemin, "a", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file, delimiter=";")
+            if nouveau_fichier:
+                writer.writerow(CHAMPS_ARCHIVE)
+            writer.writerows(lignes)
+            file.flush()
+            os.fsync(file.fileno())
+
+    sauvegarder_emprunts(personnes, fichier_emprunt)
+    return {annee: len(lignes) for annee, lignes in sorted(lignes_par_annee.items())}
+
+
+def lire_archives(fichier_emprunt, nom=None, prenom=None, annees=None):
+    """
+    Lit les fichiers d'archive ligne par ligne.
+
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :param nom: (str) si fourni avec prenom, seuls les emprunts de cette personne sont produits
+    :param prenom: (str) le prénom de la personne
+    :param annees: (iterable) années (str) à lire, toutes par défaut
+    :return: (generator) tuples (nom, prénom, numéro d'emprunt, emprunt)
+    """
+    cle = cle_personne(nom, prenom) if nom and prenom else None
+    for annee, chemin in fichiers_archives(fichier_emprunt):
+        if annees is not None and annee not in annees:
+            continue
+        with open(chemin, "r", encoding="utf-8", newline="") as file:
+            for row in csv.DictReader(file, delimiter=";"):
+                if cle is not None and cle_personne(row["nom"], row["prenom"]) != cle:
+                    continue
+                yield row["nom"], row["prenom"], row["emprunt_id"], Emprunt.depuis_texte(
+                    row["titre"], row["date_emprunt"], row["date_retour"])
+
+
+def historique_emprunts(personnes, personne, fichier_emprunt, annees=None):
+    """
+    :param personnes: (RegistrePersonnes) Liste de dictionnaires contenant toutes les personnes
+    :param personne: (dict) la personne dont on veut l'historique
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :param annees: (iterable) années (str) d'archive à lire, toutes par défaut
+    :return: (dict) numéro -> emprunt, tous les emprunts de la personne (emprunt.csv et archives),
+             par numéro croissant
+    """
+    charger_historique(personnes, personne, fichier_emprunt)
+    emprunts = {num: emprunt for _, _, num, emprunt
+                in lire_archives(fichier_emprunt, personne["nom"], personne["prenom"], annees)}
+    emprunts.update(personne["emprunts"])
+    return dict(sorted(emprunts.items(), key=lambda e: int(e[0])))
+
+
+def renommer_dans_archives(fichier_emprunt, ancien, nouveau):
+    """
+    Reporte le changement de nom d'une personne dans les fichiers d'archive qui la mentionnent.
+
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :param ancien: (tuple) (nom, prénom) avant modification
+    :param nouveau: (tuple) (nom, prénom) après modification
+    :return: (int) le nombre d'emprunts archivés renommés
+    """
+    cle = cle_personne(*ancien)
+    nbr_renommes = 0
+    for _, chemin in fichiers_archives(fichier_emprunt):
+        with open(chemin, "r", encoding="utf-8", newline="") as file:
+            if not any(cle_personne(row[0], row[1]) == cle for row in csv.reader(file, delimiter=";")):
+                continue
+        with open(chemin, "r", encoding="utf-8", newline="") as source, \
+                ecriture_atomique(chemin, newline="") as file:
+            writer = csv.writer(file, delimiter=";")
+            for row in csv.reader(source, delimiter=";"):
+                if cle_personne(row[0], row[1]) == cle:
+                    row[0], row[1] = nouveau
+                    nbr_renommes += 1
+                writer.writerow(row)
+    return nbr_renommes
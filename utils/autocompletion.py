@@ -0,0 +1,94 @@
+"""
+    Autocomplétion des titres de livres dans les formulaires de l'interface
+
+    Pendant la saisie, une liste déroulante placée sous le champ propose les titres du catalogue commençant
+    par le texte de la ligne en cours (sans tenir compte des accents ni de la casse). Flèche bas pour entrer
+    dans la liste, Entrée, Tab ou double-clic pour choisir un titre, Échap pour fermer la liste.
+"""
+import tkinter as tk
+
+# Nombre maximal de titres proposés
+NBR_PROPOSITIONS = 8
+
+
+def ajouter_autocompletion(livres_text, livres, font=("Helvetica", 16)):
+    """
+    :param livres_text: Widget tk.Text dans lequel les titres sont saisis (un titre par ligne)
+    :param livres: Catalogue contenant les données des livres
+    :param font: Tuple représentant la police et la taille de la liste déroulante
+    :return: Listbox utilisée comme liste déroulante
+    """
+    propositions = tk.Listbox(livres_text.master, font=font, height=NBR_PROPOSITIONS, activestyle="dotbox",
+                              exportselection=False)
+
+    def fermer(event=None):
+        """Cache la liste déroulante."""
+        propositions.place_forget()
+
+    def ligne_en_cours():
+        """Texte de la ligne où se trouve le curseur."""
+        return livres_text.get("insert linestart", "insert lineend")
+
+    def mettre_a_jour(event=None):
+        """Propose les titres qui commencent par le texte de la ligne en cours."""
+        if event is not None and event.keysym in ("Down", "Up", "Escape", "Return", "Tab"):
+            return
+        titres = livres.completer(ligne_en_cours())
+        if not titres or titres == [ligne_en_cours().strip()]:
+            fermer()
+            return
+        propositions.delete(0, tk.END)
+        propositions.insert(tk.END, *titres)
+        propositions.config(height=len(titres))
+        # Juste sous la ligne en cours, par-dessus les widgets suivants du formulaire
+        x, y, _, hauteur = livres_text.bbox("insert linestart") or (0, 0, 0, 0)
+        propositions.place(in_=livres_text, x=0, y=y + hauteur + 2, relwidth=1.0)
+        propositions.lift()
+
+    def choisir(event=None):
+        """Remplace la ligne en cours par le titre sélectionné."""
+        selection = propositions.curselection()
+        if not selection:
+            return None
+        titre = propositions.get(selection[0])
+        livres_text.delete("insert linestart", "insert lineend")
+        livres_text.insert("insert linestart", titre)
+        fermer()
+        livres_text.focus_set()
+        livres_text.mark_set("insert", "insert lineend")
+        return "break"
+
+    def entrer_dans_liste(event=None):
+        """Donne le focus à la liste déroulante (flèche bas dans le champ)."""
+        if not propositions.winfo_ismapped():
+            return None
+        propositions.focus_set()
+        propositions.selection_clear(0, tk.END)
+        propositions.selection_set(0)
+        propositions.activate(0)
+        return "break"
+
+    def completer_premier(event=None):
+        """Tab dans le champ : choisit la première proposition."""
+        if not propositions.winfo_ismapped():
+            return None
+        propositions.selection_clear(0, tk.END)
+        propositions.selection_set(0)
+        return choisir()
+
+    def fermer_si_hors_liste():
+        """Ferme la liste si le focus n'est ni dans le champ ni dans la liste."""
+        if propositions.winfo_exists() and livres_text.focus_get() not in (livres_text, propositions):
+            fermer()
+
+    livres_text.bind("<KeyRelease>", mettre_a_jour, add="+")
+    livres_text.bind("<Down>", entrer_dans_liste, add="+")
+    livres_text.bind("<Tab>", completer_premier, add="+")
+    livres_text.bind("<Escape>", fermer, add="+")
+    livres_text.bind("<FocusOut>", lambda event: livres_text.after(150, fermer_si_hors_liste), add="+")
+    propositions.bind("<Return>", choisir)
+    propositions.bind("<Tab>", choisir)
+    propositions.bind("<Double-Button-1>", choisir)
+    propositions.bind("<Escape>", lambda event: (fermer(), livres_text.focus_set()))
+
+    return propositions
@@ -2,6 +2,8 @@
     Module bibliotheque : gestion des livres
 
     Fonctions :
+        • valider_annee
+        • valider_exemplaires
         • ajouter_livre
         • supprimer_livre
         • chercher_livre (par titre, auteur ou genre)
@@ -20,8 +22,38 @@ from utils.emprunt import selectionner_retour
 from utils.emprunt import retours_possibles
 from utils.emprunt import verifier_emprunts_en_cours
 
+from utils.gestion_fichiers import journaliser_personne
 from utils.gestion_fichiers import sauvegarder_bibliotheque
-from utils.gestion_fichiers import sauvegarder_emprunts
+
+
+def valider_annee(valeur):
+    """
+    :param valeur: (str | int) l'année de publication saisie
+    :return: (int) l'année, si c'est un nombre compris entre 0 et l'année en cours
+    :raise ValueError: avec le message à afficher si l'année est invalide
+    """
+    try:
+        annee = int(valeur)
+    except (TypeError, ValueError):
+        raise ValueError("L'année doit être un nombre !")
+    if annee < 0 or annee > date.today().year:
+        raise ValueError("Année invalide !")
+    return annee
+
+
+def valider_exemplaires(valeur):
+    """
+    :param valeur: (str | int) le nombre d'exemplaires saisi
+    :return: (int) le nombre d'exemplaires, s'il est positif ou nul
+    :raise ValueError: avec le message à afficher si le nombre est invalide
+    """
+    try:
+        exemplaires = int(valeur)
+    except (TypeError, ValueError):
+        raise ValueError("Le nombre d'exemplaires doit être un nombre !")
+    if exemplaires < 0:
+        raise ValueError("Le nombre d'exemplaires ne peut pas être négatif !")
+    return exemplaires
 
 
 def ajouter_livre(livres, fichier_bibliotheque):
@@ -35,25 +67,19 @@ def ajouter_livre(livres, fichier_bibliotheque):
 
     while True:
         try:
-            annee = int(input("Année : "))
-            if annee < 0 or annee > date.today().year:
-                print("Année invalide !")
-                continue
+            annee = valider_annee(input("Année : "))
             break
-        except ValueError:
-            print("L'année doit être un nombre !")
+        except ValueError as e:
+            print(e)
 
     genre = input("Genre : ").strip()
 
     while True:
         try:
-            exemplaires = int(input("Nombre d'exemplaire : "))
-            if exemplaires < 0:
-                print("Le nombre d'exemplaires ne peut pas être négatif !")
-                continue
+            exemplaires = valider_exemplaires(input("Nombre d'exemplaire : "))
             break
-        except ValueError:
-            print("Le nombre d'exemplaires doit être un nombre !")
+        except ValueError as e:
+            print(e)
 
     livres[titre] = {
         "Auteur": auteur,
@@ -68,17 +94,16 @@ def ajouter_livre(livres, fichier_bibliotheque):
 
 def supprimer_livre(livres, fichier_bibliotheque):
     """
-    :param livres: (dict) un dictionnaire contenant tous les livres disponibles
+    :param livres: (Catalogue) un dictionnaire contenant tous les livres disponibles
     :param fichier_bibliotheque: (str) le chemin vers le fichier bibliotheque.json
     :return: ne retourne rien, supprime un livre du dictionnaire "livres"
     """
-    livre_a_supprimer = input("\nTitre du livre à supprimer : ").lower()
-    titre_a_supprimer = ''
-    for titre in livres:
-        if titre.lower() == livre_a_supprimer:
-            titre_a_supprimer = titre
-            livres.pop(titre, None)
-            break
+    livre_a_supprimer = input("\nTitre du livre à supprimer : ")
+    titre_a_supprimer = livres.trouver_titre(livre_a_supprimer)
+    if not titre_a_supprimer:
+        print("Livre non trouvé !")
+        return
+    livres.pop(titre_a_supprimer, None)
 
     sauvegarder_bibliotheque(livres, fichier_bibliotheque)
     print(f'Le livre : "{titre_a_supprimer}" a été supprimé de la bibilothèque !')
@@ -89,27 +114,22 @@ def filtrer_livres(livres, filtre):
     L'utilisateur est invité à entrer soit le titre, l'auteur ou le genre du livre qu'il recherche
     en fonction du filtre qu'il a choisi.
 
-    :param livres: (dict) un dictionnaire contenant tous les livres disponibles
+    :param livres: (Catalogue) un dictionnaire contenant tous les livres disponibles
     :param filtre: (str) le filtre qui sert à rechercher des livres (Titre, Auteur, Genre)
     :return: ne retourne rien, sert à filtrer les livres
     """
-    valeur_cherche = input(f"\n{filtre} recherché : ").lower()
+    valeur_cherche = input(f"\n{filtre} recherché : ")
 
-    livres_cherches = {}
-
-    if filtre == 'Titre':
-        for titre, infos in livres.items():
-            if valeur_cherche in titre.lower():
-                livres_cherches[titre] = infos
-    else:
-        for titre, infos in livres.items():
-            if valeur_cherche in infos[filtre].lower():
-                livres_cherches[titre] = infos
+    # Recherche dans l'index (sans tenir compte des accents ni de la casse), du plus pertinent au moins pertinent
+    livres_cherches = {titre: livres[titre] for titre in livres.rechercher(valeur_cherche, filtre)}
 
     if livres_cherches:
         afficher_livres(livres_cherches)
     else:
         print(f"\n{filtre} non trouvé !")
+        suggestions = livres.suggerer(valeur_cherche, filtre)
+        if suggestions:
+            print(f"Vouliez-vous dire : {', '.join(suggestions)} ?")
 
 
 def rechercher_livre(livres):
@@ -161,12 +181,12 @@ def emprunter_livre(livres, fichier_bibliotheque, personnes, fichier_emprunt):
         return
 
     # Création du nouvel emprunt avec décrémentation des nouveaux livres empruntés
-    personne = creer_emprunt(personne, livres)
+    personne = creer_emprunt(personne, livres, personnes)
 
-    # Ajouter le nouvel emprunt à la liste des emprunts et ensuite sauvegrader les emprunts
+    # Ajouter le nouvel emprunt à la liste des emprunts et ensuite journaliser l'emprunt
     if not est_deja_enregistree:
         personnes.append(personne)
-    sauvegarder_emprunts(personnes, fichier_emprunt)
+    journaliser_personne(personnes, personne, fichier_emprunt)
 
     # Sauvegarder les livres avec le nombre d'exemplaires des livres empruntés mis à jour
     sauvegarder_bibliotheque(livres, fichier_bibliotheque)
@@ -199,8 +219,8 @@ def rendre_livre(livres, fichier_bibliotheque, personnes, fichier_emprunt):
     # Création du retour avec incrémentation des livres rendus et ajout de la date de retour
     creer_retour(retours_selectionnes, personnes, personne, livres)
 
-    # Enregistrer les emprunts mis à jour suite aux retours
-    sauvegarder_emprunts(personnes, fichier_emprunt)
+    # Journaliser les emprunts mis à jour suite aux retours
+    journaliser_personne(personnes, personne, fichier_emprunt)
 
     # Sauvegarder les livres avec le nombre d'exemplaires des livres rendus mis à jour
     sauvegarder_bibliotheque(livres, fichier_bibliotheque)
@@ -6,7 +6,9 @@
         • ajouter_livre
         • supprimer_livre
         • chercher_livre (par titre, auteur ou genre)
+        • recherche_rapide (recherche au fil de la frappe dans la fenêtre principale)
         • afficher_livres
+        • afficher_inventaire (totaux par genre et livres en rupture de stock)
         • emprunter_livre (mettre à jour le nombre d’exemplaires et le fichier csv)
         • rendre_livre (mettre à jour le nombre d’exemplaires et le fichier csv)
         • afficher_menu (+ gestion des interactions)
@@ -16,10 +18,18 @@ from tkinter import messagebox, ttk
 import tkinter.font as tkfont
 from datetime import date
 
+from utils.affichage import Rendu
+from utils.affichage import afficher_lignes
+from utils.affichage import effacer_resultat
+from utils.catalogue import RechercheIncrementale
 from utils.custom_messagebox import custom_messagebox
 from utils.custom_form_window import custom_form_window
 from utils.custom_form_window import resize_form_window
-from utils.gestion_fichiers import sauvegarder_bibliotheque
+from utils.liste_livres import ListeLivres
+from utils.persistance import sauvegarder_livres
+
+# Nombre de millisecondes sans frappe avant de lancer la recherche rapide
+DELAI_RECHERCHE_RAPIDE = 150
 
 
 def clear_result(result_text):
@@ -27,7 +37,7 @@ def clear_result(result_text):
     :param result_text: Widget de texte à vider
     :return: Aucun
     """
-    result_text.delete(1.0, tk.END)
+    effacer_resultat(result_text)
 
 
 def ajouter_livre(root, result_text, livres, fichier_bibliotheque):
@@ -77,11 +87,10 @@ def ajouter_livre(root, result_text, livres, fichier_bibliotheque):
                 "Genre": genre,
                 "Exemplaires": copies
             }
-            sauvegarder_bibliotheque(livres, fichier_bibliotheque)
+            sauvegarder_livres(livres, fichier_bibliotheque)
 
             form_window.destroy()
-            clear_result(result_text)
-            result_text.insert(tk.END, f'Le livre "{title}" a été ajouté à la bibliothèque !\n')
+            afficher_lignes(result_text, Rendu().ligne(f'Le livre "{title}" a été ajouté à la bibliothèque !', "succes"))
         except ValueError:
             custom_messagebox(form_window, "Erreur", "année et exemplaires doivent être des nombres !")
 
@@ -109,12 +118,7 @@ def modifier_livre(root, result_text, livres, fichier_bibliotheque):
 
     def continue_action():
         """Valide le titre original et affiche les anciennes valeurs ainsi que les champs de modification."""
-        titre_original = titre_original_input.get().strip().lower()
-        titre_trouve = None
-        for titre in livres:
-            if titre.lower() == titre_original:
-                titre_trouve = titre
-                break
+        titre_trouve = livres.trouver_titre(titre_original_input.get())
 
         if not titre_trouve:
             custom_messagebox(form_window, "Erreur", "Livre non trouvé !")
@@ -234,20 +238,22 @@ def modifier_livre(root, result_text, livres, fichier_bibliotheque):
                 livres[titre_actuel]['Année'] = nouvelle_annee
             if nouveau_genre:
                 livres[titre_actuel]['Genre'] = nouveau_genre
+            livres.marquer_modifie(titre_actuel)
 
-            sauvegarder_bibliotheque(livres, fichier_bibliotheque)
+            sauvegarder_livres(livres, fichier_bibliotheque)
             form_window.destroy()
-            clear_result(result_text)
-            result_text.insert(tk.END, f'Anciennes valeurs : Titre="{anciennes_valeurs["Titre"]}", '
-                                       f'Auteur="{anciennes_valeurs["Auteur"]}", '
-                                       f'Année={anciennes_valeurs["Année"]}, '
-                                       f'Genre="{anciennes_valeurs["Genre"]}", '
-                                       f'Exemplaires={anciennes_valeurs["Exemplaires"]}')
-            result_text.insert(tk.END, f'\nNouvelles valeurs : Titre="{titre_actuel}", '
-                                       f'Auteur="{livres[titre_actuel].get("Auteur", "Inconnu")}", '
-                                       f'Année={livres[titre_actuel].get("Année", "Inconnue")}, '
-                                       f'Genre="{livres[titre_actuel].get("Genre", "Inconnu")}", '
-                                       f'Exemplaires={livres[titre_actuel].get("Exemplaires", 0)}')
+            rendu = Rendu()
+            rendu.ligne(f'Anciennes valeurs : Titre="{anciennes_valeurs["Titre"]}", '
+                        f'Auteur="{anciennes_valeurs["Auteur"]}", '
+                        f'Année={anciennes_valeurs["Année"]}, '
+                        f'Genre="{anciennes_valeurs["Genre"]}", '
+                        f'Exemplaires={anciennes_valeurs["Exemplaires"]}')
+            rendu.ligne(f'Nouvelles valeurs : Titre="{titre_actuel}", '
+                        f'Auteur="{livres[titre_actuel].get("Auteur", "Inconnu")}", '
+                        f'Année={livres[titre_actuel].get("Année", "Inconnue")}, '
+                        f'Genre="{livres[titre_actuel].get("Genre", "Inconnu")}", '
+                        f'Exemplaires={livres[titre_actuel].get("Exemplaires", 0)}', "succes")
+            afficher_lignes(result_text, rendu)
 
         ttk.Button(frame, text="Modifier", command=submit, style="Custom.TButton").pack(pady=5)
         ttk.Button(frame, text="Annuler", command=form_window.destroy, style="Custom.TButton").pack(pady=5)
@@ -282,19 +288,14 @@ def supprimer_livre(root, result_text, livres, fichier_bibliotheque):
 
     def submit():
         """Valide le titre saisi pour supprimer un livre et met à jour la bibliothèque."""
-        titre = titre_input.get().strip().lower()
-        titre_trouve = None
-        for t in livres:
-            if t.lower() == titre.lower():
-                titre_trouve = t
-                break
+        titre_trouve = livres.trouver_titre(titre_input.get())
 
         if titre_trouve:
             del livres[titre_trouve]
-            sauvegarder_bibliotheque(livres, fichier_bibliotheque)
+            sauvegarder_livres(livres, fichier_bibliotheque)
             form_window.destroy()
-            clear_result(result_text)
-            result_text.insert(tk.END, f'Le livre "{titre_trouve}" a été supprimé de la bibliothèque !\n')
+            afficher_lignes(result_text,
+                            Rendu().ligne(f'Le livre "{titre_trouve}" a été supprimé de la bibliothèque !', "succes"))
         else:
             custom_messagebox(form_window, "Erreur", "Livre non trouvé !")
 
@@ -334,30 +335,9 @@ def rechercher_livre(root, result_text, livres):
     def submit():
         """Effectue la recherche d'un livre selon le critère et le terme saisis, puis affiche les résultats."""
         filter_type = search_var.get()
-        term = search_term.get().strip().lower()
-        livres_trouves = {}
-
-        if filter_type == "Titre":
-            for titre, info in livres.items():
-                if term in titre.lower():
-                    livres_trouves[titre] = info
-        else:
-            for titre, info in livres.items():
-                if term in str(info[filter_type]).lower():
-                    livres_trouves[titre] = info
-
-        clear_result(result_text)
-        if livres_trouves:
-            result_text.insert(tk.END, "Titre, Auteur, Date de publication, Genre, Exemplaires\n")
-            result_text.insert(tk.END, "--------------------------------------------------------\n")
-            for titre, info in livres_trouves.items():
-                result_text.insert(tk.END,
-                                   f"{titre}, {info['Auteur']}, {info['Année']}, {info['Genre']}, "
-                                   f"{info['Exemplaires']}\n")
-        else:
-            result_text.insert(tk.END, f"Aucun livre trouvé pour "
-                                       f"{'l\'' if filter_type == 'Auteur' else 'le '}"
-                                       f"{filter_type.lower()} : {term}\n")
+        term = search_term.get().strip()
+        titres_trouves = livres.rechercher(term, filter_type)
+        afficher_lignes(result_text, rendu_recherche(livres, titres_trouves, term, filter_type))
         form_window.destroy()
 
     (ttk.Button(form_window, text="Rechercher", command=submit, style="Custom.TButton")
@@ -366,15 +346,124 @@ def rechercher_livre(root, result_text, livres):
         .grid(row=3, column=0, columnspan=2))
 
 
-def afficher_livres(result_text, livres):
+def rendu_recherche(livres, titres_trouves, term, filter_type):
+    """
+    :param livres: Dictionnaire contenant les données des livres
+    :param titres_trouves: Liste des titres trouvés, du plus pertinent au moins pertinent
+    :param term: Chaîne recherchée
+    :param filter_type: Chaîne représentant le filtre (Titre, Auteur ou Genre), None pour tous les champs
+    :return: Rendu des livres trouvés, ou des suggestions si aucun livre n'a été trouvé
+    """
+    rendu = Rendu()
+    if titres_trouves:
+        rendu.ligne("Titre, Auteur, Date de publication, Genre, Exemplaires", "entete")
+        rendu.ligne("--------------------------------------------------------", "separateur")
+        rendu.lignes(f"{titre}, {livres[titre]['Auteur']}, {livres[titre]['Année']}, {livres[titre]['Genre']}, "
+                     f"{livres[titre]['Exemplaires']}" for titre in titres_trouves)
+    else:
+        if filter_type:
+            rendu.ligne(f"Aucun livre trouvé pour "
+                        f"{'l\'' if filter_type == 'Auteur' else 'le '}"
+                        f"{filter_type.lower()} : {term}", "erreur")
+        else:
+            rendu.ligne(f"Aucun livre trouvé pour : {term}", "erreur")
+        suggestions = livres.suggerer(term, filter_type or "Titre")
+        if suggestions:
+            rendu.ligne("Vouliez-vous dire :")
+            rendu.lignes((f"📖 {titre}, {livres[titre]['Auteur']}" for titre in suggestions), "suggestion")
+    return rendu
+
+
+def recherche_rapide(parent, result_text, livres):
     """
+    :param parent: Widget dans lequel placer le champ de recherche
     :param result_text: Widget de texte pour afficher le résultat
     :param livres: Dictionnaire contenant les données des livres
-    :return: Aucun
+    :return: Frame contenant le champ de recherche (à placer par l'appelant)
+    """
+    custom_font = tkfont.Font(family="Helvetica", size=14)
+    frame = ttk.Frame(parent)
+
+    ttk.Label(frame, text="Recherche rapide : ", font=custom_font).grid(row=0, column=0, padx=5)
+    search_term = tk.StringVar()
+    search_entry = ttk.Entry(frame, textvariable=search_term, font=custom_font, width=40)
+    search_entry.grid(row=0, column=1, padx=5)
+    search_var = tk.StringVar(value="Tous")
+    search_type = tk.OptionMenu(frame, search_var, "Tous", "Titre", "Auteur", "Genre")
+    search_type.config(font=custom_font)
+    search_type["menu"].config(font=custom_font)
+    search_type.grid(row=0, column=2, padx=5)
+
+    recherche = RechercheIncrementale(livres)
+    attente = [None]
+
+    def lancer_recherche():
+        """Affiche les livres correspondant au texte saisi (les résultats précédents sont affinés si possible)."""
+        attente[0] = None
+        term = search_term.get().strip()
+        if not term:
+            effacer_resultat(result_text)
+            return
+        filter_type = None if search_var.get() == "Tous" else search_var.get()
+        titres_trouves = recherche.rechercher(term, filter_type)
+        afficher_lignes(result_text, rendu_recherche(livres, titres_trouves, term, filter_type))
+
+    def programmer_recherche(*args):
+        """Relance le délai d'attente à chaque frappe : la recherche n'a lieu qu'une fois la saisie interrompue."""
+        if attente[0] is not None:
+            frame.after_cancel(attente[0])
+        attente[0] = frame.after(DELAI_RECHERCHE_RAPIDE, lancer_recherche)
+
+    search_term.trace_add("write", programmer_recherche)
+    search_var.trace_add("write", programmer_recherche)
+    search_entry.bind("<Escape>", lambda event: search_term.set(""))
+    return frame
+
+
+def afficher_livres(root, livres):
+    """
+    :param root: Fenêtre principale de l'application
+    :param livres: Dictionnaire contenant les données des livres
+    :return: Aucun, ouvre une fenêtre listant tous les livres (colonnes triables par un clic sur leur en-tête)
+    """
+    list_window = tk.Toplevel(root)
+    list_window.title(f"Livres de la bibliothèque ({len(livres)})")
+    list_window.geometry(resize_form_window(root, 1100, 700))
+    list_window.transient(root)
+
+    liste = ListeLivres(list_window, livres)
+    liste.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
+    list_window.rowconfigure(0, weight=1)
+    list_window.columnconfigure(0, weight=1)
+    liste.afficher(livres)
+    liste.tree.focus_set()
+
+    (ttk.Button(list_window, text="Fermer", command=list_window.destroy, style="Custom.TButton")
+        .grid(row=1, column=0, pady=10))
+
+
+def afficher_inventaire(result_text, livres):
+    """
+    :param result_text: Widget de texte pour afficher le résultat
+    :param livres: Catalogue contenant les données des livres
+    :return: Aucun, affiche les totaux du catalogue, les exemplaires par genre et les livres en rupture de stock
     """
-    clear_result(result_text)
-    result_text.insert(tk.END, "Titre, Auteur, Date de publication, Genre, Exemplaires\n")
-    result_text.insert(tk.END, "--------------------------------------------------------\n")
-    for title, info in livres.items():
-        result_text.insert(tk.END,
-                           f"{title}, {info['Auteur']}, {info['Année']}, {info['Genre']}, {info['Exemplaires']}\n")
+    colonnes = livres.colonnes()
+    par_genre = colonnes.par_genre()
+    totaux = colonnes.totaux(par_genre)
+    rendu = Rendu()
+    rendu.ligne(f"Inventaire : {totaux['titres']} livre(s), {totaux['exemplaires']} exemplaire(s) disponible(s), "
+                f"{totaux['en_rupture']} livre(s) en rupture de stock", "entete")
+    rendu.ligne("Genre : livres, exemplaires disponibles, livres en rupture", "entete")
+    rendu.ligne("--------------------------------------------------------", "separateur")
+    rendu.lignes(f"{genre or '(sans genre)'} : {infos['titres']}, {infos['exemplaires']}, "
+                 f"{infos['en_rupture']}" for genre, infos in par_genre.items())
+    en_rupture = colonnes.filtrer(en_rupture=True)
+    rendu.ligne("- - -", "separateur")
+    if not en_rupture:
+        rendu.ligne("Aucun livre en rupture de stock !", "succes")
+    else:
+        rendu.ligne("Livres en rupture de stock :", "entete")
+        rendu.lignes((f"📕 {titre}, {livres[titre]['Auteur']}" for titre in sorted(en_rupture, key=str.casefold)),
+                     "erreur")
+    afficher_lignes(result_text, rendu)
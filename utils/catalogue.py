@@ -0,0 +1,228 @@
+"""
+    Module catalogue : dictionnaire des livres de la bibliothèque
+
+    Le catalogue se comporte comme le dictionnaire "livres" habituel (titre -> informations du livre),
+    mais :
+        • mémorise les titres ajoutés, modifiés ou supprimés depuis la dernière sauvegarde afin que
+          seules ces modifications soient écrites sur le disque ;
+        • maintient un index titre sans casse -> titre exact pour retrouver un livre sans parcourir
+          tout le catalogue ;
+        • maintient (dès la première recherche) un index inversé des mots et un index des trigrammes
+          des titres, auteurs et genres ;
+        • maintient (dès la première autocomplétion) une liste triée des titres sans accents ni casse ;
+        • maintient (dès la première statistique) un index en colonnes des auteurs, genres, années et
+          exemplaires (ColonnesCatalogue) ;
+        • garde chaque livre sous forme d'objet Livre (utils.modeles) : un livre ajouté sous forme de
+          dictionnaire est converti, et reste lisible et modifiable comme un dictionnaire.
+
+    RechercheIncrementale sert à la recherche au fil de la frappe : lorsque la requête prolonge la précédente,
+    seuls les résultats précédents sont vérifiés au lieu de tout le catalogue.
+"""
+from utils.catalogue_colonnes import ColonnesCatalogue
+from utils.modeles import Livre
+from utils.recherche import IndexInverse
+from utils.recherche import IndexPrefixes
+from utils.recherche import IndexTrigrammes
+from utils.recherche import normaliser_texte
+
+# Les résultats précédents ne sont affinés que s'ils représentent au plus cette part du catalogue
+# (au-delà, les index sont aussi rapides que la vérification des résultats un par un)
+PART_MAX_AFFINAGE = 0.1
+
+
+def normaliser_titre(titre):
+    """
+    :param titre: (str) un titre tel que saisi par l'utilisateur
+    :return: (str) le titre sans espaces superflus ni distinction de casse
+    """
+    return titre.strip().casefold()
+
+
+class Catalogue(dict):
+    """Dictionnaire titre -> livre qui garde la trace des titres modifiés depuis la dernière sauvegarde."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        for titre, livre in dict(*args, **kwargs).items():
+            super().__setitem__(titre, livre if type(livre) is Livre else Livre.depuis_dict(livre))
+        self.titres_modifies = set()
+        # Incrémenté à chaque ajout, modification ou suppression (invalide les résultats de recherche mémorisés)
+        self.version = 0
+        # Index (IndexInverse, IndexTrigrammes, ColonnesCatalogue...), construits lors de leur première utilisation
+        self._index_recherche = {}
+        # Titre normalisé -> titres exacts (plusieurs si seule la casse diffère)
+        self._index_titres = {}
+        for titre in self:
+            self._indexer(titre)
+
+    def _indexer(self, titre):
+        self.version += 1
+        titres = self._index_titres.setdefault(normaliser_titre(titre), [])
+        if titre not in titres:
+            titres.append(titre)
+        for index in self._index_recherche.values():
+            index.ajouter(titre, self[titre])
+
+    def _desindexer(self, titre):
+        self.version += 1
+        cle = normaliser_titre(titre)
+        titres = self._index_titres.get(cle, [])
+        if titre in titres:
+            titres.remove(titre)
+        if not titres:
+            self._index_titres.pop(cle, None)
+        for index in self._index_recherche.values():
+            index.retirer(titre)
+
+    def __setitem__(self, titre, livre):
+        super().__setitem__(titre, Livre.depuis_dict(livre))
+        self._indexer(titre)
+        self.titres_modifies.add(titre)
+
+    def __delitem__(self, titre):
+        super().__delitem__(titre)
+        self._desindexer(titre)
+        self.titres_modifies.add(titre)
+
+    def pop(self, titre, *defaut):
+        if titre in self:
+            self._desindexer(titre)
+            self.titres_modifies.add(titre)
+        return super().pop(titre, *defaut)
+
+    def popitem(self):
+        titre, livre = super().popitem()
+        self._desindexer(titre)
+        self.titres_modifies.add(titre)
+        return titre, livre
+
+    def setdefault(self, titre, defaut=None):
+        if titre not in self:
+            self[titre] = defaut
+        return self[titre]
+
+    def update(self, *args, **kwargs):
+        # dict.update n'appelle pas __setitem__ : chaque livre passe par l'ajout suivi
+        for titre, livre in dict(*args, **kwargs).items():
+            self[titre] = livre
+
+    def __ior__(self, autre):
+        self.update(autre)
+        return self
+
+    def clear(self):
+        self.titres_modifies.update(self)
+        self.version += 1
+        super().clear()
+        self._index_titres.clear()
+        # Les index de recherche seront reconstruits (vides) lors de leur prochaine utilisation
+        self._index_recherche.clear()
+
+    def trouver_titre(self, titre):
+        """
+        :param titre: (str) le titre recherché, quels que soient sa casse et ses accents
+        :return: (str) le titre exact tel qu'enregistré dans le catalogue, None si le livre n'existe pas
+        """
+        if titre in self:
+            return titre
+        titres = self._index_titres.get(normaliser_titre(titre))
+        if titres:
+            return titres[0]
+        return self._index(IndexPrefixes).trouver(titre)
+
+    def marquer_modifie(self, titre):
+        """
+        À appeler après avoir modifié directement les informations d'un livre (ex : livre['Exemplaires'] -= 1).
+
+        :param titre: (str) le titre du livre modifié
+        :return: None
+        """
+        self.titres_modifies.add(titre)
+        self.version += 1
+        if titre in self:
+            for index in self._index_recherche.values():
+                index.ajouter(titre, self[titre])
+
+    def _index(self, type_index):
+        """
+        :param type_index: (type) IndexInverse, IndexTrigrammes, IndexPrefixes ou ColonnesCatalogue
+        :return: l'index demandé, construit à partir de tout le catalogue lors du premier appel
+        """
+        if type_index not in self._index_recherche:
+            self._index_recherche[type_index] = type_index(self)
+        return self._index_recherche[type_index]
+
+    def rechercher(self, requete, filtre=None, parmi=None):
+        """
+        Les livres dont les mots correspondent à la requête viennent en premier (classés par pertinence),
+        suivis des livres qui contiennent simplement la requête comme sous-chaîne.
+
+        :param requete: (str) les mots recherchés (sans tenir compte des accents ni de la casse)
+        :param filtre: (str) Titre, Auteur ou Genre pour restreindre la recherche, None pour tous les champs
+        :param parmi: (iterable) titres auxquels restreindre la recherche, None pour tout le catalogue
+        :return: (list) les titres trouvés, du plus pertinent au moins pertinent
+        """
+        titres = self._index(IndexInverse).rechercher(requete, filtre, parmi)
+        deja_trouves = set(titres)
+        titres += [titre for titre in self._index(IndexTrigrammes).rechercher_sous_chaine(requete, filtre, parmi)
+                   if titre not in deja_trouves]
+        return titres
+
+    def completer(self, debut, limite=10):
+        """
+        :param debut: (str) le début d'un titre (sans tenir compte des accents ni de la casse)
+        :param limite: (int) le nombre maximal de titres proposés
+        :return: (list) les titres qui commencent par ce texte, dans l'ordre alphabétique
+        """
+        if not debut.strip():
+            return []
+        return self._index(IndexPrefixes).completer(debut, limite)
+
+    def suggerer(self, requete, filtre="Titre", limite=5):
+        """
+        :param requete: (str) un texte éventuellement mal orthographié
+        :param filtre: (str) Titre, Auteur ou Genre
+        :param limite: (int) le nombre maximal de suggestions
+        :return: (list) les titres des livres les plus proches de la requête
+        """
+        return self._index(IndexTrigrammes).rechercher_approchant(requete, filtre, limite)
+
+    def colonnes(self):
+        """
+        :return: (ColonnesCatalogue) l'index en colonnes du catalogue (filtres et totaux par genre, période,
+                 rupture de stock), construit lors du premier appel puis tenu à jour
+        """
+        return self._index(ColonnesCatalogue)
+
+
+class RechercheIncrementale:
+    """Mémorise la dernière recherche pour n'affiner que ses résultats lorsque la requête est prolongée."""
+
+    def __init__(self, livres):
+        """
+        :param livres: (Catalogue) le catalogue dans lequel chercher
+        """
+        self.livres = livres
+        self._requete = ""
+        self._filtre = None
+        self._version = None
+        self._titres = []
+
+    def rechercher(self, requete, filtre=None):
+        """
+        Tout livre correspondant à une requête correspond aussi à tout début de cette requête : si la requête
+        prolonge la précédente (même filtre, catalogue inchangé), il suffit de vérifier les résultats précédents.
+
+        :param requete: (str) le texte saisi
+        :param filtre: (str) Titre, Auteur ou Genre pour restreindre la recherche, None pour tous les champs
+        :return: (list) les titres trouvés, du plus pertinent au moins pertinent
+        """
+        requete_normalisee = normaliser_texte(requete.strip())
+        affiner = (self._requete and requete_normalisee.startswith(self._requete)
+                   and filtre == self._filtre and self.livres.version == self._version
+                   and len(self._titres) <= PART_MAX_AFFINAGE * len(self.livres))
+        self._titres = self.livres.rechercher(requete, filtre, self._titres if affiner else None)
+        self._requete = requete_normalisee
+        self._filtre = filtre
+        self._version = self.livres.version
+        return self._titres
@@ -0,0 +1,225 @@
+"""
+    Module catalogue en colonnes : les livres rangés colonne par colonne pour les statistiques du catalogue
+
+    Chaque livre occupe une position ; chaque information est une colonne de nombres (array, éventuellement lue
+    par NumPy sans copie) :
+        • l'auteur et le genre sont codés : chaque valeur distincte n'est enregistrée qu'une fois ;
+        • l'année et le nombre d'exemplaires sont des entiers.
+    Les filtres (genre, période, rupture de stock) et les totaux par genre sont ainsi calculés sur des tableaux
+    d'entiers, sans parcourir les livres un par un en Python.
+
+    NumPy est une dépendance facultative (pip install numpy) : s'il n'est pas installé, les mêmes calculs sont
+    faits en Python, colonne par colonne, avec les mêmes résultats. Les colonnes sont lues par NumPy avec le type
+    de leur array (typecode) : la taille des entiers C de la plateforme n'a pas à être connue.
+
+    L'index est tenu à jour par le Catalogue (ajout, modification, suppression, marquer_modifie), comme les
+    index de recherche : voir Catalogue.colonnes.
+
+    Fonctions :
+        • numpy_disponible
+        • ColonnesCatalogue (index en colonnes du catalogue)
+"""
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Année enregistrée pour un livre dont l'année n'est pas un nombre
+ANNEE_INCONNUE = 0
+
+
+def numpy_disponible():
+    """
+    :return: (bool) True si les calculs sont faits avec NumPy
+    """
+    return numpy is not None
+
+
+def _entier(valeur, defaut):
+    """
+    :param valeur: (int | str) une valeur lue dans le catalogue
+    :param defaut: (int) la valeur renvoyée si ce n'est pas un nombre
+    :return: (int) la valeur sous forme d'entier
+    """
+    try:
+        return int(valeur)
+    except (TypeError, ValueError):
+        return defaut
+
+
+class ColonnesCatalogue:
+    """Index en colonnes du catalogue : auteur, genre, année et exemplaires de chaque livre."""
+
+    def __init__(self, livres=None):
+        """
+        :param livres: (dict) titre -> livre, les livres à indexer
+        """
+        livres = livres or {}
+        # Position -> titre (None pour une position libérée par une suppression)
+        self._titres = list(livres)
+        self._positions = {titre: position for position, titre in enumerate(self._titres)}
+        # Positions libérées, réutilisées par les ajouts suivants
+        self._libres = []
+        # Valeurs distinctes de l'auteur et du genre : code -> valeur et valeur -> code
+        self._valeurs = {"Auteur": [], "Genre": []}
+        self._codes = {"Auteur": {}, "Genre": {}}
+        # Colonnes (une case par position), remplies colonne par colonne
+        valeurs = list(livres.values())
+        self._actifs = array("b", [1]) * len(valeurs)
+        self._auteurs = array("i", [self._coder("Auteur", livre.get("Auteur", "")) for livre in valeurs])
+        self._genres = array("i", [self._coder("Genre", livre.get("Genre", "")) for livre in valeurs])
+        self._annees = array("q", [_entier(livre.get("Année"), ANNEE_INCONNUE) for livre in valeurs])
+        self._exemplaires = array("q", [_entier(livre.get("Exemplaires"), 0) for livre in valeurs])
+
+    def __len__(self):
+        return len(self._positions)
+
+    def _coder(self, champ, valeur):
+        """
+        :param champ: (str) Auteur ou Genre
+        :param valeur: (str) la valeur du champ pour un livre
+        :return: (int) le code de cette valeur (créé lors de sa première apparition)
+        """
+        codes = self._codes[champ]
+        code = codes.get(valeur)
+        if code is None:
+            code = codes[valeur] = len(self._valeurs[champ])
+            self._valeurs[champ].append(valeur)
+        return code
+
+    def ajouter(self, titre, livre):
+        """
+        Indexe (ou réindexe) un livre.
+
+        :param titre: (str) le titre du livre
+        :param livre: (dict) les informations du livre
+        :return: None
+        """
+        position = self._positions.get(titre)
+        if position is None:
+            if self._libres:
+                position = self._libres.pop()
+                self._titres[position] = titre
+            else:
+                position = len(self._titres)
+                self._titres.append(titre)
+                for colonne in (self._actifs, self._auteurs, self._genres, self._annees, self._exemplaires):
+                    colonne.append(0)
+            self._positions[titre] = position
+        self._actifs[position] = 1
+        self._auteurs[position] = self._coder("Auteur", livre.get("Auteur", ""))
+        self._genres[position] = self._coder("Genre", livre.get("Genre", ""))
+        self._annees[position] = _entier(livre.get("Année"), ANNEE_INCONNUE)
+        self._exemplaires[position] = _entier(livre.get("Exemplaires"), 0)
+
+    def retirer(self, titre):
+        """
+        :param titre: (str) le titre du livre à retirer de l'index
+        :return: None
+        """
+        position = self._positions.pop(titre, None)
+        if position is None:
+            return
+        self._titres[position] = None
+        self._actifs[position] = 0
+        self._libres.append(position)
+
+    def exemplaires(self, titre):
+        """
+        :param titre: (str) le titre exact d'un livre
+        :return: (int) le nombre d'exemplaires disponibles, None si le livre n'existe pas
+        """
+        position = self._positions.get(titre)
+        return None if position is None else self._exemplaires[position]
+
+    def filtrer(self, genre=None, auteur=None, annee_min=None, annee_max=None, en_rupture=False):
+        """
+        :param genre: (str) si fourni, seuls les livres de ce genre sont gardés
+        :param auteur: (str) si fourni, seuls les livres de cet auteur sont gardés
+        :param annee_min: (int) si fourni, seuls les livres parus cette année-là ou après sont gardés
+        :param annee_max: (int) si fourni, seuls les livres parus cette année-là ou avant sont gardés
+        :param en_rupture: (bool) True pour ne garder que les livres sans exemplaire disponible
+        :return: (list) les titres des livres correspondants, dans l'ordre de leur position dans l'index
+        """
+        conditions = []
+        for champ, colonne, valeur in (("Genre", self._genres, genre), ("Auteur", self._auteurs, auteur)):
+            if valeur is not None:
+                code = self._codes[champ].get(valeur)
+                if code is None:
+                    return []
+                conditions.append((colonne, "==", code))
+        if annee_min is not None:
+            conditions.append((self._annees, ">=", annee_min))
+        if annee_max is not None:
+            conditions.append((self._annees, "<=", annee_max))
+        if en_rupture:
+            conditions.append((self._exemplaires, "<=", 0))
+
+        if numpy is not None:
+            if not self._titres:
+                return []
+            masque = numpy.frombuffer(self._actifs, dtype=self._actifs.typecode) != 0
+            for colonne, operateur, valeur in conditions:
+                vue = numpy.frombuffer(colonne, dtype=colonne.typecode)
+                if operateur == "==":
+                    masque &= vue == valeur
+                elif operateur == ">=":
+                    masque &= vue >= valeur
+                else:
+                    masque &= vue <= valeur
+            return [self._titres[position] for position in numpy.flatnonzero(masque).tolist()]
+
+        positions = [position for position, actif in enumerate(self._actifs) if actif]
+        for colonne, operateur, valeur in conditions:
+            if operateur == "==":
+                positions = [position for position in positions if colonne[position] == valeur]
+            elif operateur == ">=":
+                positions = [position for position in positions if colonne[position] >= valeur]
+            else:
+                positions = [position for position in positions if colonne[position] <= valeur]
+        return [self._titres[position] for position in positions]
+
+    def par_genre(self):
+        """
+        :return: (dict) genre -> dictionnaire, par genre (ordre alphabétique) :
+            - "titres" : (int) le nombre de livres
+            - "exemplaires" : (int) le nombre d'exemplaires disponibles
+            - "en_rupture" : (int) le nombre de livres sans exemplaire disponible
+        """
+        nbr_genres = len(self._valeurs["Genre"])
+        if numpy is not None and self._titres:
+            actifs = numpy.frombuffer(self._actifs, dtype=self._actifs.typecode) != 0
+            genres = numpy.frombuffer(self._genres, dtype=self._genres.typecode)[actifs]
+            exemplaires = numpy.frombuffer(self._exemplaires, dtype=self._exemplaires.typecode)[actifs]
+            titres = numpy.bincount(genres, minlength=nbr_genres).tolist()
+            totaux = numpy.bincount(genres, weights=numpy.maximum(exemplaires, 0), minlength=nbr_genres).tolist()
+            ruptures = numpy.bincount(genres[exemplaires <= 0], minlength=nbr_genres).tolist()
+        else:
+            titres = [0] * nbr_genres
+            totaux = [0] * nbr_genres
+            ruptures = [0] * nbr_genres
+            for actif, genre, exemplaires in zip(self._actifs, self._genres, self._exemplaires):
+                if actif:
+                    titres[genre] += 1
+                    totaux[genre] += max(exemplaires, 0)
+                    ruptures[genre] += exemplaires <= 0
+
+        statistiques = {}
+        for code, genre in sorted(enumerate(self._valeurs["Genre"]), key=lambda g: g[1].casefold()):
+            if titres[code]:
+                statistiques[genre] = {"titres": titres[code], "exemplaires": int(totaux[code]),
+                                       "en_rupture": ruptures[code]}
+        return statistiques
+
+    def totaux(self, par_genre=None):
+        """
+        :param par_genre: (dict) le résultat de par_genre s'il vient d'être calculé (il n'est alors pas recalculé)
+        :return: (dict) totaux du catalogue :
+            - "titres" : (int) le nombre de livres
+            - "exemplaires" : (int) le nombre d'exemplaires disponibles
+            - "en_rupture" : (int) le nombre de livres sans exemplaire disponible
+        """
+        genres = (par_genre if par_genre is not None else self.par_genre()).values()
+        return {cle: sum(genre[cle] for genre in genres) for cle in ("titres", "exemplaires", "en_rupture")}
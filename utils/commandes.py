@@ -0,0 +1,326 @@
+"""
+    Module commandes : interface en ligne de commande non interactive (scripts, tâches planifiées)
+
+    Exemples :
+        python main.py chercher "guerre et paix"
+        python main.py chercher tolstoi --filtre Auteur
+        python main.py importer dons.csv
+        python main.py exporter catalogue.csv
+        python main.py emprunter Dubois Claire "1984" "Le Petit Prince"
+        python main.py rendre "1984" --nom Dubois --prenom Claire
+        python main.py lot boite_retour.csv
+        python main.py retards --date 2025-05-01
+        python main.py retards --tous
+        python main.py retards --code-retour
+        python main.py archiver --avant 2024-01-01
+        python main.py historique Dubois Claire
+
+    Chaque commande ne lit que les fichiers dont elle a besoin : une recherche, un import ou un export
+    ne lit pas le fichier des emprunts, le rapport des retards ne lit pas la bibliothèque.
+    Si les emprunts sont dans une base SQLite, emprunter, rendre (avec le nom) et historique ne lisent que
+    les personnes concernées.
+    Les emprunts clos (rendus) ne sont pas chargés : seuls les emprunts en cours sont utiles aux commandes.
+    Le code de sortie vaut 0 si tout s'est bien passé, 1 sinon (aucun résultat, opération refusée...) et 2 si
+    un argument est invalide (date, année...). Avec --code-retour, la commande retards sort avec le code 3 s'il
+    y a des emprunts en retard, pour qu'un script les distingue d'une erreur.
+
+    Fonctions :
+        • executer_commande
+"""
+import argparse
+import csv
+import json
+from datetime import date
+from datetime import datetime
+
+from utils.archives import archiver_emprunts
+from utils.archives import date_limite_par_defaut
+from utils.archives import historique_emprunts
+from utils.emprunts_lot import lire_operations
+from utils.emprunts_lot import traiter_lot
+from utils.gestion_fichiers import ecriture_atomique
+from utils.gestion_fichiers import lire_bibliotheque
+from utils.gestion_fichiers import lire_emprunteurs
+from utils.gestion_fichiers import lire_emprunts
+from utils.import_catalogue import importer_catalogue
+from utils.modeles import vers_json
+from utils.retards import total_par_personne
+
+FICHIER_BIBLIOTHEQUE = "data/bibliotheque.json"
+FICHIER_EMPRUNT = "data/emprunt.csv"
+CODE_RETARDS = 3
+
+
+def afficher_ligne_livre(titre, livre):
+    """
+    :param titre: (str) le titre du livre
+    :param livre: (dict) les informations du livre
+    :return: ne retourne rien, affiche le livre sur une ligne
+    """
+    print(f"{titre}, {livre['Auteur']}, {livre['Année']}, {livre['Genre']}, {livre['Exemplaires']}")
+
+
+def commande_chercher(arguments):
+    """
+    :param arguments: (argparse.Namespace) requete, filtre, bibliotheque
+    :return: (int) le code de sortie
+    """
+    livres = lire_bibliotheque(arguments.bibliotheque)
+    titres = livres.rechercher(arguments.requete, arguments.filtre)
+    for titre in titres:
+        afficher_ligne_livre(titre, livres[titre])
+    if not titres:
+        print("Aucun livre trouvé !")
+        suggestions = livres.suggerer(arguments.requete, arguments.filtre or "Titre")
+        if suggestions:
+            print(f"Vouliez-vous dire : {', '.join(suggestions)} ?")
+        return 1
+    return 0
+
+
+def commande_importer(arguments):
+    """
+    :param arguments: (argparse.Namespace) fichier (.csv, .jsonl, .ndjson ou .json), bibliotheque
+    :return: (int) le code de sortie
+    """
+    livres = lire_bibliotheque(arguments.bibliotheque)
+    try:
+        bilan = importer_catalogue(arguments.fichier, livres, arguments.bibliotheque)
+    except ValueError as e:
+        print(e)
+        return 1
+    for numero, message in bilan["erreurs"]:
+        print(f"Ligne {numero} ignorée : {message}")
+    print(f"{bilan['ajoutes']} livre(s) ajouté(s), {bilan['fusionnes']} fusionné(s) avec un livre existant, "
+          f"{len(bilan['erreurs'])} ignoré(s).")
+    return 1 if bilan["erreurs"] else 0
+
+
+def commande_exporter(arguments):
+    """
+    :param arguments: (argparse.Namespace) fichier (.csv ou .json), bibliotheque
+    :return: (int) le code de sortie
+    """
+    livres = lire_bibliotheque(arguments.bibliotheque)
+    if arguments.fichier.lower().endswith(".csv"):
+        with ecriture_atomique(arguments.fichier, newline="") as file:
+            writer = csv.writer(file, delimiter=";")
+            writer.writerow(["Titre", "Auteur", "Année", "Genre", "Exemplaires"])
+            writer.writerows([titre, livre["Auteur"], livre["Année"], livre["Genre"], livre["Exemplaires"]]
+                             for titre, livre in livres.items())
+    else:
+        with ecriture_atomique(arguments.fichier) as file:
+            json.dump(livres, file, default=vers_json, indent=4, ensure_ascii=False)
+    print(f"{len(livres)} livre(s) exporté(s) dans {arguments.fichier}")
+    return 0
+
+
+def _executer_operations(arguments, operations):
+    """
+    :param arguments: (argparse.Namespace) bibliotheque, emprunts
+    :param operations: (list) les opérations d'emprunt et de retour à appliquer
+    :return: (int) le code de sortie
+    """
+    livres = lire_bibliotheque(arguments.bibliotheque)
+    noms = [(operation.get("nom", ""), operation.get("prenom", "")) for operation in operations]
+    if all(nom.strip() and prenom.strip() for nom, prenom in noms):
+        # Base SQLite : seules les personnes concernées sont lues
+        personnes = lire_emprunteurs(arguments.emprunts, noms)
+    else:
+        # Un retour sans nom est retrouvé d'après le titre, parmi tous les emprunts en cours
+        personnes = lire_emprunts(arguments.emprunts, historique=False)
+    bilan = traiter_lot(operations, livres, arguments.bibliotheque, personnes, arguments.emprunts)
+    for numero, message in bilan["erreurs"]:
+        print(f"Opération {numero} : {message}")
+    print(f"{bilan['emprunts']} emprunt(s), {bilan['retours']} retour(s) enregistré(s).")
+    if bilan["penalites"]:
+        print(f"Pénalité totale : {bilan['penalites']:.2f}€")
+    return 1 if bilan["erreurs"] else 0
+
+
+def commande_emprunter(arguments):
+    """
+    :param arguments: (argparse.Namespace) nom, prenom, titres, bibliotheque, emprunts
+    :return: (int) le code de sortie
+    """
+    return _executer_operations(arguments, [
+        {"operation": "emprunt", "nom": arguments.nom, "prenom": arguments.prenom, "titre": titre}
+        for titre in arguments.titres
+    ])
+
+
+def commande_rendre(arguments):
+    """
+    :param arguments: (argparse.Namespace) titres, nom, prenom (facultatifs), bibliotheque, emprunts
+    :return: (int) le code de sortie
+    """
+    return _executer_operations(arguments, [
+        {"operation": "retour", "nom": arguments.nom or "", "prenom": arguments.prenom or "", "titre": titre}
+        for titre in arguments.titres
+    ])
+
+
+def commande_lot(arguments):
+    """
+    :param arguments: (argparse.Namespace) fichier (voir emprunts_lot.lire_operations), bibliotheque, emprunts
+    :return: (int) le code de sortie
+    """
+    return _executer_operations(arguments, lire_operations(arguments.fichier))
+
+
+def commande_retards(arguments):
+    """
+    :param arguments: (argparse.Namespace) date (AAAA-MM-JJ, aujourd'hui par défaut), tous, code_retour, emprunts
+    :return: (int) le code de sortie (CODE_RETARDS s'il y a des retards et que code_retour est demandé)
+    """
+    date_reference = date.fromisoformat(arguments.date) if arguments.date else date.today()
+    personnes = lire_emprunts(arguments.emprunts, historique=False)
+    retards = personnes.retards()
+    lignes = retards.previsions(date_reference) if arguments.tous else retards.en_retard(date_reference)
+    for ligne in lignes:
+        personne, emprunt = ligne["personne"], ligne["emprunt"]
+        print(f"{personne['prenom']} {personne['nom']} : {emprunt['titre']} "
+              f"(à rendre le {ligne['echeance'].strftime('%d/%m/%Y')}), "
+              f"{ligne['jours']} jour(s) de retard, {ligne['montant']:.2f}€")
+    en_retard = [ligne for ligne in lignes if ligne["jours"]]
+    if en_retard:
+        print("Par personne :")
+        for personne, nbr_emprunts, montant in total_par_personne(en_retard):
+            print(f"    {personne['prenom']} {personne['nom']} : {nbr_emprunts} livre(s), {montant:.2f}€")
+    print(f"{len(en_retard)} emprunt(s) en retard, {sum(ligne['montant'] for ligne in en_retard):.2f}€ "
+          f"de pénalités au {date_reference.strftime('%Y-%m-%d')}.")
+    return CODE_RETARDS if en_retard and arguments.code_retour else 0
+
+
+def commande_archiver(arguments):
+    """
+    :param arguments: (argparse.Namespace) avant (AAAA-MM-JJ, il y a un an par défaut), emprunts
+    :return: (int) le code de sortie
+    """
+    date_limite = arguments.avant or date_limite_par_defaut()
+    # Tout l'historique est nécessaire pour savoir quels emprunts déplacer
+    personnes = lire_emprunts(arguments.emprunts)
+    try:
+        archives = archiver_emprunts(personnes, arguments.emprunts, date_limite)
+    except ValueError as e:
+        print(e)
+        return 1
+    for annee, nbr_emprunts in archives.items():
+        print(f"{annee} : {nbr_emprunts} emprunt(s) archivé(s)")
+    print(f"{sum(archives.values())} emprunt(s) rendu(s) avant le {date_limite} archivé(s).")
+    return 0
+
+
+def commande_historique(arguments):
+    """
+    :param arguments: (argparse.Namespace) nom, prenom, annee (facultative), emprunts
+    :return: (int) le code de sortie
+    """
+    personnes = lire_emprunteurs(arguments.emprunts, [(arguments.nom, arguments.prenom)])
+    personne = personnes.trouver(arguments.nom, arguments.prenom)
+    if personne is None:
+        print(f"Aucune personne trouvée du nom de {arguments.prenom} {arguments.nom} !")
+        return 1
+    annees = [arguments.annee] if arguments.annee else None
+    emprunts = historique_emprunts(personnes, personne, arguments.emprunts, annees)
+    if annees:
+        emprunts = {num: e for num, e in emprunts.items()
+                    if e["date_emprunt"].startswith(arguments.annee) or e["date_retour"].startswith(arguments.annee)}
+    for emprunt in emprunts.values():
+        retour = f"rendu le {emprunt['date_retour']}" if emprunt['date_retour'] else "en cours"
+        print(f"{emprunt['date_emprunt']} : {emprunt['titre']} ({retour})")
+    print(f"{len(emprunts)} emprunt(s) pour {personne['prenom']} {personne['nom']}.")
+    return 0
+
+
+def _date(texte):
+    """
+    :param texte: (str) une date saisie en ligne de commande
+    :return: (str) la date, si elle est au format AAAA-MM-JJ
+    """
+    try:
+        datetime.strptime(texte, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"date invalide (format AAAA-MM-JJ attendu) : {texte}")
+    return texte
+
+
+def _annee(texte):
+    """
+    :param texte: (str) une année saisie en ligne de commande
+    :return: (str) l'année, si elle est écrite avec quatre chiffres (comme dans les dates AAAA-MM-JJ)
+    """
+    if not (len(texte) == 4 and texte.isascii() and texte.isdigit()):
+        raise argparse.ArgumentTypeError(f"année invalide (format AAAA attendu) : {texte}")
+    return texte
+
+
+def creer_parseur():
+    """
+    :return: (argparse.ArgumentParser) le parseur des commandes et de leurs options
+    """
+    parseur = argparse.ArgumentParser(prog="main.py", description="Gestion de la bibliothèque sans menu interactif.")
+    parseur.add_argument("--bibliotheque", default=FICHIER_BIBLIOTHEQUE, help="fichier des livres")
+    parseur.add_argument("--emprunts", default=FICHIER_EMPRUNT, help="fichier des emprunts")
+    commandes = parseur.add_subparsers(dest="commande", required=True)
+
+    chercher = commandes.add_parser("chercher", help="chercher des livres")
+    chercher.add_argument("requete")
+    chercher.add_argument("--filtre", choices=["Titre", "Auteur", "Genre"], help="champ dans lequel chercher")
+    chercher.set_defaults(fonction=commande_chercher)
+
+    importer = commandes.add_parser("importer", help="importer des livres (.csv, .jsonl ou .json)")
+    importer.add_argument("fichier")
+    importer.set_defaults(fonction=commande_importer)
+
+    exporter = commandes.add_parser("exporter", help="exporter le catalogue (.csv ou .json)")
+    exporter.add_argument("fichier")
+    exporter.set_defaults(fonction=commande_exporter)
+
+    emprunter = commandes.add_parser("emprunter", help="emprunter un ou plusieurs livres")
+    emprunter.add_argument("nom")
+    emprunter.add_argument("prenom")
+    emprunter.add_argument("titres", nargs="+")
+    emprunter.set_defaults(fonction=commande_emprunter)
+
+    rendre = commandes.add_parser("rendre", help="rendre un ou plusieurs livres")
+    rendre.add_argument("titres", nargs="+")
+    rendre.add_argument("--nom")
+    rendre.add_argument("--prenom")
+    rendre.set_defaults(fonction=commande_rendre)
+
+    lot = commandes.add_parser("lot", help="appliquer un fichier d'emprunts et de retours (CSV)")
+    lot.add_argument("fichier")
+    lot.set_defaults(fonction=commande_lot)
+
+    retards = commandes.add_parser("retards", help="lister les emprunts en retard",
+                                   description="Liste les emprunts en retard. Le code de sortie vaut 0 si le rapport "
+                                               "a pu être établi, même s'il y a des retards (voir --code-retour).")
+    retards.add_argument("--date", type=_date, help="date de référence (AAAA-MM-JJ)")
+    retards.add_argument("--tous", action="store_true",
+                         help="lister tous les emprunts en cours avec leur pénalité à la date de référence")
+    retards.add_argument("--code-retour", action="store_true",
+                         help=f"sortir avec le code {CODE_RETARDS} si au moins un emprunt est en retard "
+                              f"(1 reste réservé aux erreurs, 2 aux arguments invalides)")
+    retards.set_defaults(fonction=commande_retards)
+
+    archiver = commandes.add_parser("archiver", help="archiver par année les emprunts rendus depuis longtemps")
+    archiver.add_argument("--avant", type=_date, help="archiver les emprunts rendus avant cette date (AAAA-MM-JJ)")
+    archiver.set_defaults(fonction=commande_archiver)
+
+    historique = commandes.add_parser("historique", help="lister tous les emprunts d'une personne (archives comprises)")
+    historique.add_argument("nom")
+    historique.add_argument("prenom")
+    historique.add_argument("--annee", type=_annee, help="limiter l'historique à une année (AAAA)")
+    historique.set_defaults(fonction=commande_historique)
+
+    return parseur
+
+
+def executer_commande(arguments_ligne):
+    """
+    :param arguments_ligne: (list) les arguments de la ligne de commande (sans le nom du programme)
+    :return: (int) le code de sortie
+    """
+    arguments = creer_parseur().parse_args(arguments_ligne)
+    return arguments.fonction(arguments)
@@ -1,12 +1,11 @@
 """
     Box personnalisé pour les différents messages à afficher (info, succès, erreur)
 """
-import os
-
 import tkinter as tk
 from tkinter import ttk
 
-from PIL import Image, ImageTk
+from utils.photos import TAILLE_FICHE
+from utils.photos import afficher_photo_dans
 
 
 def afficher_photo(msg_window, photo_id):
@@ -17,17 +16,9 @@ def afficher_photo(msg_window, photo_id):
     """
     photo_label = ttk.Label(msg_window)
     photo_label.grid(row=1, column=0, columnspan=2, padx=50, pady=5)
-    photo_image = None  # Référence nécessaire pour éviter la collecte par le garbage collector
     if photo_id:
-        photo_path = os.path.join("data/photos", photo_id)
-        if os.path.exists(photo_path):
-            img = Image.open(photo_path)
-            img = img.resize((180, 180), Image.Resampling.LANCZOS)
-            photo_image = ImageTk.PhotoImage(img)
-            photo_label.config(image=photo_image)
-            photo_label.image = photo_image  # Garder la référence
-        else:
-            photo_label.config(text="Photo non trouvée")
+        # La photo est chargée en arrière-plan : un texte d'attente est affiché en attendant
+        afficher_photo_dans(photo_label, photo_id, TAILLE_FICHE)
     else:
         photo_label.config(text="Aucune photo")
 
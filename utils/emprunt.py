@@ -4,22 +4,31 @@
     Fonctions :
         • ajouter_personne
         • verifier_emprunts_en_cours
+        • saisir_titre (avec autocomplétion par la touche Tab si le module readline est disponible)
         • creer_emprunt
         • retours_possibles
         • selectionner_retour
+        • calculer_penalite
         • creer_retour
         • modifier_personne (image ????)
 """
 from datetime import date
-from datetime import datetime
-from datetime import timedelta
+
+from utils.modeles import Emprunt
+from utils.modeles import Emprunteur
+
+try:
+    import readline
+except ImportError:
+    # Windows : pas de module readline, la saisie se fait sans autocomplétion
+    readline = None
 
 
 def ajouter_personne(personnes):
     """
     Recherche une personne existante dans la liste ou en crée une nouvelle.
 
-    :param personnes: (list) Liste de dictionnaires représentant les personnes et leurs emprunts
+    :param personnes: (RegistrePersonnes) Liste de dictionnaires représentant les personnes et leurs emprunts
     :return: (tuple)
         - (bool) True si la personne existe déjà, False sinon
         - (dict) Dictionnaire contenant les informations de la personne (existante ou nouvellement créée)
@@ -28,16 +37,11 @@ def ajouter_personne(personnes):
     nom = input('Nom : ').strip()
     prenom = input('Prénom : ').strip()
 
-    for personne in personnes:
-        if nom == personne['nom'] and prenom == personne['prenom']:
-            return True, personne
+    personne = personnes.trouver(nom, prenom)
+    if personne:
+        return True, personne
 
-    personne = {
-        "nom": nom,
-        "prenom": prenom,
-        "nbr_livres_empruntes": 0,
-        "emprunts": {}
-    }
+    personne = Emprunteur(nom, prenom)
 
     return False, personne
 
@@ -84,35 +88,70 @@ def verifier_emprunts_en_cours(personne):
             return 3
 
 
-def creer_emprunt(personne, livres):
+def saisir_titre(livres, message='\nTitre du livre : '):
+    """
+    Demande un titre ; la touche Tab complète le début de titre saisi à partir du catalogue.
+
+    :param livres: (Catalogue) Dictionnaire contenant tous les livres de la bibliothèque
+    :param message: (str) Texte affiché avant la saisie
+    :return: (str) Le texte saisi
+    """
+    if readline is None:
+        return input(message)
+
+    propositions = []
+
+    def completer(texte, etat):
+        """Fonction appelée par readline : retourne la proposition numéro "etat" pour le texte saisi."""
+        if etat == 0:
+            propositions[:] = livres.completer(texte)
+        return propositions[etat] if etat < len(propositions) else None
+
+    ancien_completer = readline.get_completer()
+    anciens_delimiteurs = readline.get_completer_delims()
+    readline.set_completer(completer)
+    # Toute la ligne est complétée (les titres contiennent des espaces)
+    readline.set_completer_delims("")
+    readline.parse_and_bind("tab: complete")
+    try:
+        return input(message)
+    finally:
+        readline.set_completer(ancien_completer)
+        readline.set_completer_delims(anciens_delimiteurs)
+
+
+def creer_emprunt(personne, livres, personnes):
     """
     Emprunter des livres (en fonction du nombre de livres non rendus).
 
     :param personne: (dict) Informations sur la personne et ses emprunts
-    :param livres: (dict) Dictionnaire contenant tous les livres de la bibliothèque
+    :param livres: (Catalogue) Dictionnaire contenant tous les livres de la bibliothèque
+    :param personnes: (RegistrePersonnes) Liste de dictionnaires représentant les personnes et leurs emprunts
     :return: (dict) Personne mise à jour avec le nouvel emprunt
     """
     # Vérifier si la bibliothèque contient ce livre, ainsi que le nombre d'exemplaires disponibles
     while personne['nbr_livres_empruntes'] < 3:
-        livre = input('\nTitre du livre : ').strip()
-        livre_trouve = livres.get(livre, None)
-        if not livre_trouve:
+        saisie = saisir_titre(livres)
+        livre = livres.trouver_titre(saisie)
+        if not livre:
             print("Livre non trouvé !")
+            suggestions = livres.completer(saisie, 5) or livres.suggerer(saisie)
+            if suggestions:
+                print(f"Vouliez-vous dire : {', '.join(suggestions)} ?")
             continue
+        livre_trouve = livres[livre]
         if livre_trouve['Exemplaires'] == 0:
             print("Ce livre n'est pas disponible pour le moment !")
             continue
 
         # Ajouter le livre aux emprunts
-        emprunt_id = str(max([int(k) for k in personne['emprunts'].keys()] + [0]) + 1)
-        personne['emprunts'][emprunt_id] = {
-            "titre": livre,
-            "date_emprunt": date.today().strftime("%Y-%m-%d"),
-            "date_retour": "",
-        }
+        emprunt_id = personnes.prochain_emprunt_id(personne)
+        personne['emprunts'][emprunt_id] = Emprunt(livre, date.today().toordinal())
+        personnes.noter_emprunt(personne, emprunt_id)
 
         # Décrémenter le nombre d'exemplaires
         livre_trouve['Exemplaires'] -= 1
+        livres.marquer_modifie(livre)
 
         # Incrémenter le nombre de livres empruntés
         personne['nbr_livres_empruntes'] += 1
@@ -140,24 +179,24 @@ def retours_possibles(personnes):
     """
     Identifie les emprunts en cours pour une personne.
 
-    :param personnes: (list) Liste des dictionnaires contenant les emprunts enregistrés
+    :param personnes: (RegistrePersonnes) Liste des dictionnaires contenant les emprunts enregistrés
     :return: (list) liste de tous les emprunts en cours (livres non rendus)
     """
     print('\n--- Retour de livres ---')
     nom = input('Nom : ').strip()
     prenom = input('Prénom : ').strip()
 
-    for personne in personnes:
-        if nom == personne['nom'] and prenom == personne['prenom']:
-            retours = [
-                {"emprunt_id": num, **emprunt}
-                for num, emprunt in personne['emprunts'].items()
-                if not emprunt['date_retour']
-            ]
-            if not retours:
-                print(f"Pas d'emprunt en cours trouvé pour {prenom} {nom} !")
-                return [], personne
-            return retours, personne
+    personne = personnes.trouver(nom, prenom)
+    if personne:
+        retours = [
+            {"emprunt_id": num, **emprunt}
+            for num, emprunt in personne['emprunts'].items()
+            if not emprunt['date_retour']
+        ]
+        if not retours:
+            print(f"Pas d'emprunt en cours trouvé pour {prenom} {nom} !")
+            return [], personne
+        return retours, personne
 
     print(f"Personne {prenom} {nom} non trouvée !")
     return [], {"nom": nom, "prenom": prenom}
@@ -225,24 +264,28 @@ def selectionner_retour(retours_eventuels):
     return retours_selectionnes
 
 
+def calculer_penalite(emprunt):
+    """
+    :param emprunt: (Emprunt) l'emprunt concerné (livre rendu)
+    :return: (tuple)
+        - (date) la date de retour théorique (14 jours après l'emprunt)
+        - (int) le nombre de jours de retard
+        - (float) le montant de la pénalité (0.10€ par jour de retard)
+    """
+    # Dates en nombre de jours : le calcul ne relit aucune chaîne
+    jours_supplementaires = emprunt.jours_de_retard()
+    return date.fromordinal(emprunt.echeance), jours_supplementaires, emprunt.penalite()
+
+
 def calculer_montant_total(emprunt, montant_total):
     """
     :param emprunt: (dict) dictionnaire contenant les informations concernant l'emprunt concerné (livres rendus)
     :param montant_total: (float) Montant total accumulé des pénalités avant cet emprunt.
     :return: (float) Montant total mis à jour après ajout de la pénalité de cet emprunt, si retard.
     """
-    date_emprunt = datetime.strptime(emprunt['date_emprunt'], "%Y-%m-%d")
-    date_retour_theorique = date_emprunt + timedelta(days=14)
-
-    date_retour = datetime.strptime(emprunt['date_retour'], "%Y-%m-%d")
-
-    montant_a_payer: float = 0
-    jours_supplementaires = 0
-
-    if date_retour > date_retour_theorique:
-        jours_supplementaires = (date_retour - date_retour_theorique).days
-        montant_a_payer += 0.10 * jours_supplementaires
-        montant_total += montant_a_payer
+    date_emprunt = date.fromordinal(emprunt.jour_emprunt)
+    date_retour_theorique, jours_supplementaires, montant_a_payer = calculer_penalite(emprunt)
+    montant_total += montant_a_payer
 
     print(f"------------------------------------------------------"
           f"\n📚 Emprunt du {date_emprunt.strftime('%d/%m/%Y')} : {emprunt['titre']}")
@@ -251,7 +294,7 @@ def calculer_montant_total(emprunt, montant_total):
         print(f"    Retour avant le {date_retour_theorique.strftime('%d/%m/%Y')} => rien à payer.")
     else:
         print(f"    {jours_supplementaires} jour(s) de retard "
-              f"=> {"{:.2f}".format(0.10 * jours_supplementaires)}€ de pénalités")
+              f"=> {"{:.2f}".format(montant_a_payer)}€ de pénalités")
 
     return montant_total
 
@@ -261,28 +304,33 @@ def creer_retour(retours_selectionnes, personnes, personne, livres):
     Enregistre les retours en mettant à jour les dates de retour et les exemplaires.
 
     :param retours_selectionnes: (list) liste des emprunts en cours dont les livres vont être rendus
-    :param personnes: (list) Liste des dictionnaires contenant les emprunts enregistrés
+    :param personnes: (RegistrePersonnes) Liste des dictionnaires contenant les emprunts enregistrés
     :param personne: (dict) nom et prénom de la personne qui rapporte des livres
     :param livres: (dict) dictionnaire contenant tous les livres de la bibiliothèque
     :return: rien
     """
     montant_total = 0
+    p = personnes.trouver(personne['nom'], personne['prenom'])
+    if not p:
+        return
+
+    emprunts_dict = p['emprunts']
     for retour in retours_selectionnes:
-        for p in personnes:
-            if p['nom'] == personne['nom'] and p['prenom'] == personne['prenom']:
-                emprunts_dict = p['emprunts']
-                emprunt_id = retour['emprunt_id']
-                if emprunt_id in emprunts_dict and emprunts_dict[emprunt_id]['titre'] == retour['titre']:
-                    # Ajouter la date de retour
-                    emprunts_dict[emprunt_id]['date_retour'] = date.today().strftime("%Y-%m-%d")
-                    # Calculer les pénalités si retard
-                    montant_total = calculer_montant_total(emprunts_dict[emprunt_id], montant_total)
-                    # Incrémenter le nombre d'exemplaires du livre rendu
-                    livre = livres.get(emprunts_dict[emprunt_id]['titre'], None)
-                    if livre:
-                        livre['Exemplaires'] += 1
-                    # Recalculer nbr_livres_empruntes
-                    p['nbr_livres_empruntes'] = sum(1 for e in emprunts_dict.values() if not e['date_retour'])
+        emprunt_id = retour['emprunt_id']
+        if emprunt_id in emprunts_dict and emprunts_dict[emprunt_id]['titre'] == retour['titre']:
+            # Ajouter la date de retour
+            emprunts_dict[emprunt_id].jour_retour = date.today().toordinal()
+            personnes.noter_retour(p, emprunt_id)
+            # Calculer les pénalités si retard
+            montant_total = calculer_montant_total(emprunts_dict[emprunt_id], montant_total)
+            # Incrémenter le nombre d'exemplaires du livre rendu
+            livre = livres.get(emprunts_dict[emprunt_id]['titre'], None)
+            if livre:
+                livre['Exemplaires'] += 1
+                livres.marquer_modifie(emprunts_dict[emprunt_id]['titre'])
+
+    # Recalculer nbr_livres_empruntes
+    p['nbr_livres_empruntes'] = sum(1 for e in emprunts_dict.values() if not e['date_retour'])
 
     if montant_total and (len(retours_selectionnes) > 1):
         print(f"------------------------------------------------------"
@@ -8,21 +8,37 @@
         • copier_photo_emprunteur
         • emprunter_livre
         • rendre_livre
+        • afficher_retards
+        • afficher_statistiques
+        • modifier_personne
 """
 import os
-import shutil
 from datetime import date, timedelta, datetime
 
 import tkinter as tk
 from tkinter import ttk, filedialog
 import tkinter.font as tkfont
-from PIL import Image, ImageTk
 
+from utils.affichage import Rendu
+from utils.affichage import afficher_lignes
+from utils.affichage import effacer_resultat
+from utils.archives import renommer_dans_archives
+from utils.autocompletion import ajouter_autocompletion
 from utils.custom_messagebox import custom_messagebox
 from utils.custom_form_window import custom_form_window
 from utils.custom_form_window import resize_form_window
-from utils.gestion_fichiers import sauvegarder_bibliotheque
-from utils.gestion_fichiers import sauvegarder_emprunts
+from utils.modeles import Emprunt
+from utils.modeles import Emprunteur
+from utils.persistance import sauvegarder_livres
+from utils.persistance import sauvegarder_personne
+from utils.photos import TAILLE_FICHE
+from utils.photos import TAILLE_FORMULAIRE
+from utils.photos import afficher_apercu_dans
+from utils.photos import afficher_photo_dans
+from utils.photos import importer_photo_en_arriere_plan
+from utils.photos import supprimer_miniatures
+from utils.retards import total_par_personne
+from utils.statistiques import statistiques_emprunts
 
 
 def clear_result(result_text):
@@ -30,7 +46,7 @@ def clear_result(result_text):
     :param result_text: Widget de texte à vider
     :return: Aucun
     """
-    result_text.delete(1.0, tk.END)
+    effacer_resultat(result_text)
 
 
 def afficher_photo(select_window, photo_id):
@@ -41,59 +57,50 @@ def afficher_photo(select_window, photo_id):
     """
     photo_label = ttk.Label(select_window)
     photo_label.grid(row=1, column=0, columnspan=2, padx=30, pady=5)
-    photo_image = None  # Référence nécessaire pour éviter la collecte par le garbage collector
     if photo_id:
-        photo_path = os.path.join("data/photos", photo_id)
-        if os.path.exists(photo_path):
-            img = Image.open(photo_path)
-            img = img.resize((180, 180), Image.Resampling.LANCZOS)
-            photo_image = ImageTk.PhotoImage(img)
-            photo_label.config(image=photo_image)
-            photo_label.image = photo_image  # Garder la référence
-        else:
-            photo_label.config(text="Photo non trouvée")
+        # La photo est chargée en arrière-plan : un texte d'attente est affiché en attendant
+        afficher_photo_dans(photo_label, photo_id, TAILLE_FICHE)
     else:
         photo_label.config(text="Aucune photo")
 
 
 def trouver_ou_creer_personne(personnes, nom, prenom):
     """
-    :param personnes: Liste de dictionnaires contenant les données des personnes
+    :param personnes: Registre (RegistrePersonnes) contenant les données des personnes
     :param nom: Chaîne représentant le nom de famille de la personne
     :param prenom: Chaîne représentant le prénom de la personne
     :return: Dictionnaire représentant la personne
     """
-    for p in personnes:
-        if nom.capitalize() == p['nom'] and prenom.capitalize() == p['prenom']:
-            return p
-    personne = {
-        "nom": nom.capitalize(),
-        "prenom": prenom.capitalize(),
-        "nbr_livres_empruntes": 0,
-        "emprunts": {},
-        "photo_id": ""
-    }
+    p = personnes.trouver(nom, prenom)
+    if p:
+        return p
+    personne = Emprunteur(nom.capitalize(), prenom.capitalize())
     personnes.append(personne)
     return personne
 
 
-def copier_photo_emprunteur(nom, prenom, chemin_image):
+def copier_photo_emprunteur(widget, nom, prenom, chemin_image, rappel):
     """
+    Enregistre en arrière-plan la photo choisie pour une personne (JPEG de taille bornée, sans métadonnées).
+
+    :param widget: Fenêtre qui reste ouverte jusqu'à la fin de l'import (et affiche l'éventuelle erreur)
     :param nom: Chaîne représentant le nom de famille de la personne
     :param prenom: Chaîne représentant le prénom de la personne
     :param chemin_image: Chaîne représentant le chemin vers le fichier image
-    :return: Chaîne représentant le nouveau nom de fichier photo ou chaîne vide si aucune image
+    :param rappel: Fonction appelée avec le nouveau nom de fichier photo, une fois la photo enregistrée
+    :return: Aucun (si l'image est illisible, un message d'erreur est affiché et le rappel n'est pas appelé)
     """
-    if not chemin_image:
-        return ""
-    photos_dir = "data/photos"
-    if not os.path.exists(photos_dir):
-        os.makedirs(photos_dir)
-    extension = os.path.splitext(chemin_image)[1]
-    nom_fichier = f"{nom.lower()}_{prenom.lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension}"
-    chemin_destination = os.path.join(photos_dir, nom_fichier)
-    shutil.copy(chemin_image, chemin_destination)
-    return nom_fichier
+    nom_fichier = f"{nom.lower()}_{prenom.lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
+
+    def terminer(erreur):
+        """Transmet le nom de la photo enregistrée ou affiche l'erreur (dans le thread Tk)."""
+        if erreur:
+            custom_messagebox(widget, "Erreur", erreur)
+        else:
+            rappel(nom_fichier)
+
+    # Le décodage et le redimensionnement ont lieu hors du thread Tk
+    importer_photo_en_arriere_plan(widget, chemin_image, nom_fichier, terminer)
 
 
 def emprunter_livre(root, result_text, livres, fichier_bibliotheque, personnes, fichier_emprunt):
@@ -102,7 +109,7 @@ def emprunter_livre(root, result_text, livres, fichier_bibliotheque, personnes,
     :param result_text: Widget de texte pour afficher le résultat
     :param livres: Dictionnaire contenant les données des livres
     :param fichier_bibliotheque: Chaîne représentant le chemin du fichier de la bibliothèque
-    :param personnes: Liste de dictionnaires contenant les données des personnes
+    :param personnes: Registre (RegistrePersonnes) contenant les données des personnes
     :param fichier_emprunt: Chaîne représentant le chemin du fichier des emprunts
     :return: Aucun
     """
@@ -111,7 +118,6 @@ def emprunter_livre(root, result_text, livres, fichier_bibliotheque, personnes,
 
     # Variables globales au scope de la fonction
     photo_path = tk.StringVar()
-    photo_image = None  # Référence nécessaire pour éviter la collecte par le garbage collector
 
     # Champs Nom
     (ttk.Label(form_window, text="Nom : ", font=custom_font, width=15, anchor="e")
@@ -135,7 +141,8 @@ def emprunter_livre(root, result_text, livres, fichier_bibliotheque, personnes,
             return
 
         personne = trouver_ou_creer_personne(personnes, nom, prenom)
-        est_une_nouvelle_personne = len(personne['emprunts']) == 0 and not personne["photo_id"]
+        est_une_nouvelle_personne = (len(personne['emprunts']) == 0 and personnes.historique_charge(personne)
+                                     and not personne["photo_id"])
 
         # Supprimer les champs nom et prénom pour faire place aux nouveaux champs
         for widget in form_window.winfo_children():
@@ -145,17 +152,12 @@ def emprunter_livre(root, result_text, livres, fichier_bibliotheque, personnes,
 
         def select_photo():
             """Ouvre une boîte de dialogue pour sélectionner une photo et affiche un aperçu."""
-            nonlocal photo_image
             chemin = filedialog.askopenfilename(filetypes=[("Images", "*.jpg *.jpeg *.png")])
             if chemin:
                 photo_path.set(chemin)
                 photo_label.config(text=os.path.basename(chemin))
-                img = Image.open(chemin)
-                img = img.resize((150, 150), Image.Resampling.LANCZOS)
-                photo_image = ImageTk.PhotoImage(img)
-                preview_label.config(image=photo_image)
-                preview_label.image = photo_image  # Conserver la référence
-                form_window.update()  # Forcer le rafraîchissement de l'interface
+                # L'aperçu est préparé en arrière-plan, l'interface reste réactive
+                afficher_apercu_dans(preview_label, chemin, TAILLE_FORMULAIRE)
 
         if est_une_nouvelle_personne:
             # Cas : Nouvelle personne
@@ -185,6 +187,7 @@ def emprunter_livre(root, result_text, livres, fichier_bibliotheque, personnes,
              .grid(row=3, column=0, padx=100, pady=20))
             livres_text = tk.Text(form_window, height=4, width=30, font=custom_font)
             livres_text.grid(row=4, column=0, padx=100, pady=20)
+            ajouter_autocompletion(livres_text, livres, custom_font)
         else:
             # Cas : Personne existante
             custom_title = tkfont.Font(family="Georgia", size=24, weight="bold")
@@ -197,15 +200,7 @@ def emprunter_livre(root, result_text, livres, fichier_bibliotheque, personnes,
                 form_window.geometry(nouvelles_dimensions)
                 photo_label = ttk.Label(form_window, anchor="center")
                 photo_label.grid(row=1, column=0, padx=200, pady=20)
-                existing_photo_path = os.path.join("data/photos", personne["photo_id"])
-                if os.path.exists(existing_photo_path):
-                    img = Image.open(existing_photo_path)
-                    img = img.resize((150, 150), Image.Resampling.LANCZOS)
-                    photo_image = ImageTk.PhotoImage(img)
-                    photo_label.config(image=photo_image)
-                    photo_label.image = photo_image  # Garder la référence
-                else:
-                    photo_label.config(text="Photo non trouvée")
+                afficher_photo_dans(photo_label, personne["photo_id"], TAILLE_FORMULAIRE)
             else:
                 # Option pour ajouter une photo si elle n'existe pas
                 nouvelles_dimensions = resize_form_window(root, 650, 800)
@@ -231,6 +226,7 @@ def emprunter_livre(root, result_text, livres, fichier_bibliotheque, personnes,
              .grid(row=3, column=0, padx=100, pady=20))
             livres_text = tk.Text(form_window, height=4, width=30, font=custom_font)
             livres_text.grid(row=4, column=0, padx=100, pady=20)
+            ajouter_autocompletion(livres_text, livres, custom_font)
 
         def submit():
             """Valide les informations saisies pour emprunter un livre et met à jour les données."""
@@ -241,11 +237,6 @@ def emprunter_livre(root, result_text, livres, fichier_bibliotheque, personnes,
                 custom_messagebox(form_window, "Erreur", "Aucun livre sélectionné !")
                 return
 
-            # Gérer la photo
-            chemin_image = photo_path.get()
-            if chemin_image and not personne["photo_id"]:
-                personne["photo_id"] = copier_photo_emprunteur(nom, prenom, chemin_image)
-
             emprunts_en_cours = [e for e in personne['emprunts'].values() if not e['date_retour']]
 
             nbr_emprunts_actuels = sum(1 for e in personne['emprunts'].values() if not e['date_retour'])
@@ -254,53 +245,67 @@ def emprunter_livre(root, result_text, livres, fichier_bibliotheque, personnes,
                            f"(actuellement {nbr_emprunts_actuels} livres empruntés) !\n\n")
                 if nbr_emprunts_actuels == 3:
                     for e in emprunts_en_cours:
-                        dt_date_emprunt = datetime.strptime(e['date_emprunt'], "%Y-%m-%d")
-                        message = message + f"📖 {e['titre']} emprunté le {dt_date_emprunt.strftime('%d-%m-%Y')}\n"
+                        dt_date_emprunt = date.fromordinal(e.jour_emprunt)
+                        message = message + f"📖 {e.titre} emprunté le {dt_date_emprunt.strftime('%d-%m-%Y')}\n"
                 custom_messagebox(form_window, "Erreur", message, geometry="550x400",
                                   parent_to_destroy=form_window if len(emprunts_en_cours) == 3 else None)
                 return
 
             nouveaux_emprunts = []
             for title in livres_a_emprunter:
-                livre_trouve = livres.get(title, None)
-                if not livre_trouve:
-                    custom_messagebox(form_window, "Erreur", f"Livre '{title}' non trouvé !")
+                titre_trouve = livres.trouver_titre(title)
+                if not titre_trouve:
+                    suggestions = livres.suggerer(title)
+                    message = f"Livre '{title}' non trouvé !"
+                    if suggestions:
+                        message += f"\nVouliez-vous dire : {', '.join(suggestions)} ?"
+                    custom_messagebox(form_window, "Erreur", message)
                     return
-                elif livre_trouve['Exemplaires'] == 0:
+                title = titre_trouve
+                livre_trouve = livres[title]
+                if livre_trouve['Exemplaires'] == 0:
                     custom_messagebox(form_window, "Erreur", f"Pas de copies disponibles pour '{title}' !")
                     return
                 else:
-                    emprunt_id = str(max([int(k) for k in personne['emprunts'].keys()] + [0]) + 1)
-                    personne['emprunts'][emprunt_id] = {
-                        "titre": title,
-                        "date_emprunt": date.today().strftime("%Y-%m-%d"),
-                        "date_retour": ""
-                    }
+                    emprunt_id = personnes.prochain_emprunt_id(personne)
+                    personne['emprunts'][emprunt_id] = Emprunt(title, date.today().toordinal())
+                    personnes.noter_emprunt(personne, emprunt_id)
                     livre_trouve['Exemplaires'] -= 1
+                    livres.marquer_modifie(title)
                     nouveaux_emprunts.append(title)
 
             personne['nbr_livres_empruntes'] = sum(1 for e in personne['emprunts'].values() if not e['date_retour'])
 
             if nouveaux_emprunts:
-                sauvegarder_emprunts(personnes, fichier_emprunt)
-                sauvegarder_bibliotheque(livres, fichier_bibliotheque)
+                sauvegarder_personne(personnes, personne, fichier_emprunt)
+                sauvegarder_livres(livres, fichier_bibliotheque)
+
+                # Gérer la photo : la personne est à nouveau sauvegardée une fois la photo enregistrée
+                chemin_image = photo_path.get()
+                if chemin_image and not personne["photo_id"]:
+                    def enregistrer_photo(photo_id):
+                        """Associe la photo importée à la personne."""
+                        personne["photo_id"] = photo_id
+                        sauvegarder_personne(personnes, personne, fichier_emprunt)
+
+                    copier_photo_emprunteur(root, nom, prenom, chemin_image, enregistrer_photo)
 
                 date_retour_theorique = date.today() + timedelta(days=14)
 
-                clear_result(result_text)
+                rendu = Rendu()
                 if not emprunts_en_cours:
-                    result_text.insert(tk.END, f"Aucun emprunt en cours pour {prenom} {nom} !\n")
+                    rendu.ligne(f"Aucun emprunt en cours pour {prenom} {nom} !")
                 else:
-                    result_text.insert(tk.END, f"Livre(s) emprunté(s) par {prenom} {nom} :\n")
+                    rendu.ligne(f"Livre(s) emprunté(s) par {prenom} {nom} :", "entete")
                     for e in emprunts_en_cours:
-                        dt_date_emprunt = datetime.strptime(e['date_emprunt'], "%Y-%m-%d")
-                        result_text.insert(tk.END, f"📖 {e['titre']} emprunté le {dt_date_emprunt.strftime('%d-%m-%Y')}\n")
-                result_text.insert(tk.END, f"- - -\n")
+                        dt_date_emprunt = date.fromordinal(e.jour_emprunt)
+                        rendu.ligne(f"📖 {e.titre} emprunté le {dt_date_emprunt.strftime('%d-%m-%Y')}")
+                rendu.ligne("- - -", "separateur")
                 if len(nouveaux_emprunts) > 0:
-                    result_text.insert(tk.END, f"{len(nouveaux_emprunts)} livre(s) emprunté(s) aujourd'hui :\n")
-                    for title in nouveaux_emprunts:
-                        result_text.insert(tk.END, f"📗 {title}\n")
-                    result_text.insert(tk.END, f"👉 Retour avant le {date_retour_theorique.strftime('%d-%m-%Y')} (14 jours)\n")
+                    rendu.ligne(f"{len(nouveaux_emprunts)} livre(s) emprunté(s) aujourd'hui :", "entete")
+                    rendu.lignes((f"📗 {title}" for title in nouveaux_emprunts), "succes")
+                    rendu.ligne(f"👉 Retour avant le {date_retour_theorique.strftime('%d-%m-%Y')} (14 jours)")
+                afficher_lignes(result_text, rendu)
                 form_window.destroy()
 
         # row_numero = 4 if est_une_nouvelle_personne else 5
@@ -321,7 +326,7 @@ def rendre_livre(root, result_text, livres, fichier_bibliotheque, personnes, fic
     :param result_text: Widget de texte pour afficher le résultat
     :param livres: Dictionnaire contenant les données des livres
     :param fichier_bibliotheque: Chaîne représentant le chemin du fichier de la bibliothèque
-    :param personnes: Liste de dictionnaires contenant les données des personnes
+    :param personnes: Registre (RegistrePersonnes) contenant les données des personnes
     :param fichier_emprunt: Chaîne représentant le chemin du fichier des emprunts
     :return: Aucun
     """
@@ -347,11 +352,7 @@ def rendre_livre(root, result_text, livres, fichier_bibliotheque, personnes, fic
             custom_messagebox(root, "Erreur", "Tous les champs sont requis!")
             return
 
-        personne = None
-        for p in personnes:
-            if nom == p['nom'] and prenom == p['prenom']:
-                personne = p
-                break
+        personne = personnes.trouver(nom, prenom)
 
         if not personne:
             custom_messagebox(form_window, "Erreur", f"Aucune personne trouvée du nom de {prenom} {nom}",
@@ -408,21 +409,19 @@ def rendre_livre(root, result_text, livres, fichier_bibliotheque, personnes, fic
             for var, retour in selected_books:
                 if var.get():
                     emprunt = personne['emprunts'][retour['emprunt_id']]
-                    emprunt['date_retour'] = date.today().strftime("%Y-%m-%d")
-                    livre = livres.get(emprunt['titre'], None)
+                    emprunt.jour_retour = date.today().toordinal()
+                    personnes.noter_retour(personne, retour['emprunt_id'])
+                    livre = livres.get(emprunt.titre, None)
                     if livre:
                         livre['Exemplaires'] += 1
+                        livres.marquer_modifie(emprunt.titre)
 
-                    date_emprunt = datetime.strptime(emprunt['date_emprunt'], "%Y-%m-%d")
-                    date_retour_theorique = date_emprunt + timedelta(days=14)
-                    date_retour = datetime.strptime(emprunt['date_retour'], "%Y-%m-%d")
-
-                    if date_retour > date_retour_theorique:
-                        jours_supplementaires = (date_retour - date_retour_theorique).days
-                        montant_total += 0.10 * jours_supplementaires
+                    jours_supplementaires = emprunt.jours_de_retard()
+                    if jours_supplementaires:
+                        montant_total += emprunt.penalite()
                         returned_books.append(
-                            f"{emprunt['titre']} : "
-                            f"{jours_supplementaires} jour(s) de retard, {0.10 * jours_supplementaires:.2f}€")
+                            f"{emprunt.titre} : "
+                            f"{jours_supplementaires} jour(s) de retard, {emprunt.penalite():.2f}€")
                     else:
                         returned_books.append(f"{emprunt['titre']} : Rendu à temps")
 
@@ -431,16 +430,16 @@ def rendre_livre(root, result_text, livres, fichier_bibliotheque, personnes, fic
                 return
 
             personne['nbr_livres_empruntes'] = sum(1 for e in personne['emprunts'].values() if not e['date_retour'])
-            sauvegarder_emprunts(personnes, fichier_emprunt)
-            sauvegarder_bibliotheque(livres, fichier_bibliotheque)
+            sauvegarder_personne(personnes, personne, fichier_emprunt)
+            sauvegarder_livres(livres, fichier_bibliotheque)
 
-            clear_result(result_text)
-            result_text.insert(tk.END, "Livres rendus :\n")
-            for book in returned_books:
-                result_text.insert(tk.END, f"📗{book}\n")
+            rendu = Rendu()
+            rendu.ligne("Livres rendus :", "entete")
+            rendu.lignes(f"📗{book}" for book in returned_books)
             if montant_total > 0:
-                result_text.insert(tk.END, "- - -\n")
-                result_text.insert(tk.END, f"Pénalité totale : {montant_total:.2f}€\n")
+                rendu.ligne("- - -", "separateur")
+                rendu.ligne(f"Pénalité totale : {montant_total:.2f}€", "erreur")
+            afficher_lignes(result_text, rendu)
 
             form_window.destroy()
 
@@ -455,11 +454,73 @@ def rendre_livre(root, result_text, livres, fichier_bibliotheque, personnes, fic
         .grid(row=3, column=0, columnspan=2))
 
 
+def afficher_retards(result_text, personnes):
+    """
+    :param result_text: Widget de texte pour afficher le résultat
+    :param personnes: Registre (RegistrePersonnes) contenant les données des personnes
+    :return: Aucun, affiche les emprunteurs en retard aujourd'hui, leurs livres et le montant dû
+    """
+    en_retard = personnes.retards().en_retard()
+    rendu = Rendu()
+    rendu.ligne(f"Emprunts en retard au {date.today().strftime('%d/%m/%Y')} :", "entete")
+    if not en_retard:
+        rendu.ligne("Aucun emprunt en retard !", "succes")
+    lignes_par_personne = {}
+    for ligne in en_retard:
+        lignes_par_personne.setdefault(id(ligne["personne"]), []).append(ligne)
+    for personne, nbr_emprunts, montant in total_par_personne(en_retard):
+        rendu.ligne(f"{personne['prenom']} {personne['nom']} : {nbr_emprunts} livre(s), {montant:.2f}€", "erreur")
+        rendu.lignes(f"    📕 {ligne['emprunt']['titre']} (à rendre le {ligne['echeance'].strftime('%d/%m/%Y')}), "
+                     f"{ligne['jours']} jour(s) de retard, {ligne['montant']:.2f}€"
+                     for ligne in lignes_par_personne[id(personne)])
+    if en_retard:
+        rendu.ligne("- - -", "separateur")
+        rendu.ligne(f"Total des pénalités : {sum(ligne['montant'] for ligne in en_retard):.2f}€", "erreur")
+    afficher_lignes(result_text, rendu)
+
+
+def afficher_statistiques(result_text, livres, personnes, fichier_emprunt):
+    """
+    :param result_text: Widget de texte pour afficher le résultat
+    :param livres: Catalogue contenant les données des livres
+    :param personnes: Registre (RegistrePersonnes) contenant les données des personnes
+    :param fichier_emprunt: Chaîne représentant le chemin du fichier des emprunts
+    :return: Aucun, affiche les exemplaires en prêt et disponibles par genre, les livres les plus empruntés
+             et les emprunteurs les plus actifs
+    """
+    statistiques = statistiques_emprunts(personnes, fichier_emprunt)
+    par_genre = livres.colonnes().par_genre()
+    en_pret_par_genre = statistiques.en_pret_par_genre(livres)
+    disponibles = livres.colonnes().totaux(par_genre)["exemplaires"]
+
+    rendu = Rendu()
+    rendu.ligne(f"Exemplaires en prêt : {statistiques.exemplaires_en_pret}, disponibles : {disponibles}", "entete")
+    rendu.ligne("Genre : exemplaires disponibles, exemplaires en prêt", "entete")
+    rendu.ligne("--------------------------------------------------------", "separateur")
+    rendu.lignes(f"{genre or '(sans genre)'} : {infos['exemplaires']}, {en_pret_par_genre.get(genre, 0)}"
+                 for genre, infos in par_genre.items())
+
+    rendu.ligne("- - -", "separateur")
+    rendu.ligne("Livres les plus empruntés :", "entete")
+    if not statistiques.emprunts_par_titre:
+        rendu.ligne("Aucun emprunt enregistré !")
+    rendu.lignes(f"📖 {titre} : {nbr_emprunts} emprunt(s)" for titre, nbr_emprunts in statistiques.plus_empruntes())
+
+    rendu.ligne("- - -", "separateur")
+    rendu.ligne("Emprunteurs les plus actifs :", "entete")
+    for (nom, prenom), nbr_emprunts in statistiques.plus_actifs():
+        personne = personnes.trouver(nom, prenom)
+        if personne:
+            nom, prenom = personne['nom'], personne['prenom']
+        rendu.ligne(f"👤 {prenom} {nom} : {nbr_emprunts} emprunt(s)")
+    afficher_lignes(result_text, rendu)
+
+
 def modifier_personne(root, result_text, personnes, fichier_emprunt):
     """
     :param root: Fenêtre principale de l'application
     :param result_text: Widget de texte pour afficher le résultat
-    :param personnes: Liste de dictionnaires contenant les données des personnes
+    :param personnes: Registre (RegistrePersonnes) contenant les données des personnes
     :param fichier_emprunt: Chaîne représentant le chemin du fichier des emprunts
     :return: Aucun
     """
@@ -468,8 +529,6 @@ def modifier_personne(root, result_text, personnes, fichier_emprunt):
 
     # Variables globales pour la photo
     photo_path = tk.StringVar()
-    photo_image_old = None  # Référence pour l'ancienne photo
-    photo_image_new = None  # Référence pour la nouvelle photo
 
     # Champs Nom
     ttk.Label(form_window, text="Nom :", font=custom_font, width=12, anchor="e").grid(row=0, column=0, padx=5, pady=5)
@@ -490,11 +549,7 @@ def modifier_personne(root, result_text, personnes, fichier_emprunt):
             custom_messagebox(form_window, "Erreur", "Le nom et le prénom sont obligatoires !")
             return
 
-        personne = None
-        for p in personnes:
-            if nom == p['nom'] and prenom == p['prenom']:
-                personne = p
-                break
+        personne = personnes.trouver(nom, prenom)
 
         if not personne:
             custom_messagebox(form_window, "Erreur", f"Aucune personne trouvée du nom de {prenom} {nom} !")
@@ -537,16 +592,7 @@ def modifier_personne(root, result_text, personnes, fichier_emprunt):
         old_photo_preview_label = ttk.Label(frame)
         old_photo_preview_label.pack(pady=5)
         if personne["photo_id"]:
-            photo_path_existing = os.path.join("data/photos", personne["photo_id"])
-            if os.path.exists(photo_path_existing):
-                img = Image.open(photo_path_existing)
-                img = img.resize((150, 150), Image.Resampling.LANCZOS)
-                nonlocal photo_image_old
-                photo_image_old = ImageTk.PhotoImage(img)
-                old_photo_preview_label.config(image=photo_image_old)
-                old_photo_preview_label.image = photo_image_old  # Garder la référence
-            else:
-                old_photo_preview_label.config(text="Photo non trouvée")
+            afficher_photo_dans(old_photo_preview_label, personne["photo_id"], TAILLE_FORMULAIRE)
 
         # Forcer le rafraîchissement
         form_window.update()
@@ -576,17 +622,12 @@ def modifier_personne(root, result_text, personnes, fichier_emprunt):
 
         def select_photo():
             """Ouvre une boîte de dialogue pour sélectionner une nouvelle photo et affiche un aperçu."""
-            nonlocal photo_image_new
             chemin = filedialog.askopenfilename(filetypes=[("Images", "*.jpg *.jpeg *.png")])
             if chemin:
                 photo_path.set(chemin)
                 photo_label.config(text=os.path.basename(chemin))
-                img = Image.open(chemin)
-                img = img.resize((150, 150), Image.Resampling.LANCZOS)
-                photo_image_new = ImageTk.PhotoImage(img)
-                new_photo_preview_label.config(image=photo_image_new)
-                new_photo_preview_label.image = photo_image_new  # Conserver la référence
-                form_window.update()
+                # L'aperçu est préparé en arrière-plan, l'interface reste réactive
+                afficher_apercu_dans(new_photo_preview_label, chemin, TAILLE_FORMULAIRE)
 
         ttk.Button(frame, text="Choisir une photo", command=select_photo, style="Custom.TButton").pack(pady=5)
 
@@ -606,6 +647,13 @@ def modifier_personne(root, result_text, personnes, fichier_emprunt):
                 custom_messagebox(form_window, "Erreur", "Aucune modification détectée !")
                 return
 
+            # Deux personnes ne peuvent pas porter le même nom et le même prénom
+            autre = personnes.trouver(nouveau_nom or personne['nom'], nouveau_prenom or personne['prenom'])
+            if autre is not None and autre is not personne:
+                custom_messagebox(form_window, "Erreur",
+                                  f"Une personne du nom de {autre['prenom']} {autre['nom']} existe déjà !")
+                return
+
             # Sauvegarder les anciennes valeurs avant de modifier
             anciennes_valeurs = {
                 'Nom': personne['nom'],
@@ -613,21 +661,23 @@ def modifier_personne(root, result_text, personnes, fichier_emprunt):
                 'Photo': personne['photo_id'] if personne['photo_id'] else 'Aucune'
             }
 
-            # Mettre à jour les informations
-            if nouveau_nom:
-                personne['nom'] = nouveau_nom
-            if nouveau_prenom:
-                personne['prenom'] = nouveau_prenom
+            # Mettre à jour les informations (le registre garde son index à jour)
+            personnes.renommer(personne, nouveau_nom or personne['nom'], nouveau_prenom or personne['prenom'])
 
             # Gérer la photo
             if chemin_image:
-                # Supprimer l'ancienne photo si elle existe
-                if personne['photo_id']:
-                    ancienne_photo_path = os.path.join("data/photos", personne['photo_id'])
-                    if os.path.exists(ancienne_photo_path):
-                        os.remove(ancienne_photo_path)
+                def remplacer_photo(photo_id):
+                    """Supprime l'ancienne photo (si elle existe) une fois la nouvelle enregistrée."""
+                    if personne['photo_id']:
+                        ancienne_photo_path = os.path.join("data/photos", personne['photo_id'])
+                        if os.path.exists(ancienne_photo_path):
+                            os.remove(ancienne_photo_path)
+                        supprimer_miniatures(personne['photo_id'])
+                    personne['photo_id'] = photo_id
+                    sauvegarder_personne(personnes, personne, fichier_emprunt)
+
                 # Copier la nouvelle photo avec les nouveaux nom et prénom
-                personne['photo_id'] = copier_photo_emprunteur(personne['nom'], personne['prenom'], chemin_image)
+                copier_photo_emprunteur(root, personne['nom'], personne['prenom'], chemin_image, remplacer_photo)
             elif personne['photo_id'] and (
                     nouveau_nom != anciennes_valeurs['Nom'] or nouveau_prenom != anciennes_valeurs['Prénom']):
                 # Si une photo existe et que le nom ou le prénom a changé, renommer l'ancienne photo
@@ -639,18 +689,28 @@ def modifier_personne(root, result_text, personnes, fichier_emprunt):
                                            f"_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension}")
                     nouveau_photo_path = os.path.join("data/photos", nouveau_nom_fichier)
                     os.rename(ancienne_photo_path, nouveau_photo_path)
+                    supprimer_miniatures(personne['photo_id'])
                     personne['photo_id'] = nouveau_nom_fichier
 
-            sauvegarder_emprunts(personnes, fichier_emprunt)
+            sauvegarder_personne(personnes, personne, fichier_emprunt,
+                                 cle=(anciennes_valeurs['Nom'], anciennes_valeurs['Prénom']))
+            if (personne['nom'], personne['prenom']) != (anciennes_valeurs['Nom'], anciennes_valeurs['Prénom']):
+                renommer_dans_archives(fichier_emprunt, (anciennes_valeurs['Nom'], anciennes_valeurs['Prénom']),
+                                       (personne['nom'], personne['prenom']))
             form_window.destroy()
-            clear_result(result_text)
-            result_text.insert(tk.END, f'La personne "{nouveau_prenom} {nouveau_nom}" a été modifiée avec succès !\n')
-            result_text.insert(tk.END, f'Anciennes valeurs : Nom="{anciennes_valeurs["Nom"]}", '
-                                       f'Prénom="{anciennes_valeurs["Prénom"]}", '
-                                       f'Photo="{anciennes_valeurs["Photo"]}"\n')
-            result_text.insert(tk.END, f'Nouvelles valeurs : Nom="{personne["nom"]}", '
-                                       f'Prénom="{personne["prenom"]}", '
-                                       f'Photo="{personne["photo_id"] if personne["photo_id"] else "Aucune"}"\n')
+            rendu = Rendu()
+            rendu.ligne(f'La personne "{nouveau_prenom} {nouveau_nom}" a été modifiée avec succès !', "succes")
+            rendu.ligne(f'Anciennes valeurs : Nom="{anciennes_valeurs["Nom"]}", '
+                        f'Prénom="{anciennes_valeurs["Prénom"]}", '
+                        f'Photo="{anciennes_valeurs["Photo"]}"')
+            if chemin_image:
+                nouvelle_photo = f"{os.path.basename(chemin_image)} (import en cours)"
+            else:
+                nouvelle_photo = personne["photo_id"] if personne["photo_id"] else "Aucune"
+            rendu.ligne(f'Nouvelles valeurs : Nom="{personne["nom"]}", '
+                        f'Prénom="{personne["prenom"]}", '
+                        f'Photo="{nouvelle_photo}"')
+            afficher_lignes(result_text, rendu)
 
         ttk.Button(frame, text="Modifier", command=submit, style="Custom.TButton").pack(pady=5)
         ttk.Button(frame, text="Annuler", command=form_window.destroy, style="Custom.TButton").pack(pady=5)
@@ -0,0 +1,178 @@
+"""
+    Module emprunts par lot : traitement d'une série d'emprunts et de retours sans saisie interactive
+
+    Les opérations (par exemple les livres scannés dans la boîte de retour) sont appliquées en un seul passage,
+    avec les mêmes règles qu'au comptoir (livre existant, exemplaire disponible, 3 livres maximum par personne),
+    puis les fichiers ne sont écrits qu'une seule fois, à la fin du lot.
+
+    Une opération est un dictionnaire :
+        • "operation" : "emprunt" ou "retour"
+        • "titre" : le titre du livre (sans tenir compte de la casse ni des accents)
+        • "nom", "prenom" : la personne (facultatifs pour un retour : c'est alors l'emprunt en cours
+          le plus ancien de ce livre qui est clôturé)
+        • "date" : la date de l'opération au format AAAA-MM-JJ (facultative, aujourd'hui par défaut)
+
+    Fonctions :
+        • lire_operations
+        • appliquer_operations
+        • traiter_lot
+"""
+import csv
+from datetime import date
+from datetime import datetime
+
+from utils.gestion_fichiers import journaliser_personnes
+from utils.gestion_fichiers import sauvegarder_bibliotheque
+from utils.modeles import Emprunt
+from utils.modeles import Emprunteur
+from utils.modeles import jour_depuis_texte
+
+OPERATIONS = ("emprunt", "retour")
+
+# Nombre maximal de livres empruntés en même temps par une personne
+MAX_EMPRUNTS = 3
+
+
+def lire_operations(fichier_operations):
+    """
+    :param fichier_operations: (str) Chemin vers un fichier CSV (séparateur ;) dont l'en-tête contient
+                               operation;nom;prenom;titre;date (nom, prenom et date peuvent être vides)
+    :return: (list) Liste de dictionnaires représentant les opérations, dans l'ordre du fichier
+    """
+    with open(fichier_operations, "r", encoding="utf-8", newline="") as file:
+        return [
+            {cle: (valeur or "").strip() for cle, valeur in row.items() if cle}
+            for row in csv.DictReader(file, delimiter=";")
+        ]
+
+
+def _emprunts_en_cours_par_titre(personnes):
+    """
+    :param personnes: (list) Liste de dictionnaires contenant toutes les personnes
+    :return: (dict) titre -> liste de (jour d'emprunt, personne, emprunt_id) des emprunts en cours,
+             du plus ancien au plus récent
+    """
+    en_cours = {}
+    for personne in personnes:
+        for emprunt_id, emprunt in personne['emprunts'].items():
+            if not emprunt.jour_retour:
+                en_cours.setdefault(emprunt.titre, []).append((emprunt.jour_emprunt, personne, emprunt_id))
+    for emprunts in en_cours.values():
+        emprunts.sort(key=lambda e: e[0])
+    return en_cours
+
+
+def appliquer_operations(operations, livres, personnes):
+    """
+    Applique les opérations en mémoire (sans écrire les fichiers). Une opération invalide est ignorée
+    et signalée dans le bilan ; les suivantes sont tout de même appliquées.
+
+    :param operations: (list) Liste de dictionnaires représentant les opérations
+    :param livres: (Catalogue) Dictionnaire contenant tous les livres de la bibliothèque
+    :param personnes: (RegistrePersonnes) Liste des dictionnaires contenant les emprunts enregistrés
+    :return: (dict) bilan du lot :
+        - "emprunts" : (int) nombre d'emprunts enregistrés
+        - "retours" : (int) nombre de retours enregistrés
+        - "penalites" : (float) total des pénalités de retard
+        - "erreurs" : (list) tuples (numéro de l'opération à partir de 1, message)
+        - "personnes_modifiees" : (list) personnes ayant emprunté ou rendu au moins un livre
+    """
+    bilan = {"emprunts": 0, "retours": 0, "penalites": 0.0, "erreurs": [], "personnes_modifiees": []}
+    # Index construits une seule fois pour tout le lot
+    en_cours = _emprunts_en_cours_par_titre(personnes)
+    prochains_ids = {}
+    modifiees = {}
+    aujourdhui = date.today().strftime("%Y-%m-%d")
+
+    for numero, operation in enumerate(operations, 1):
+        type_operation = operation.get("operation", "").strip().lower()
+        nom = operation.get("nom", "").strip()
+        prenom = operation.get("prenom", "").strip()
+        date_operation = operation.get("date") or aujourdhui
+        try:
+            datetime.strptime(date_operation, "%Y-%m-%d")
+            jour_operation = jour_depuis_texte(date_operation)
+        except ValueError:
+            bilan["erreurs"].append((numero, f"Date invalide : {date_operation}"))
+            continue
+        if type_operation not in OPERATIONS:
+            bilan["erreurs"].append((numero, f"Opération inconnue : {type_operation}"))
+            continue
+        titre = livres.trouver_titre(operation.get("titre", "").strip())
+        if not titre:
+            bilan["erreurs"].append((numero, f"Livre '{operation.get('titre', '')}' non trouvé !"))
+            continue
+
+        if type_operation == "emprunt":
+            if not (nom and prenom):
+                bilan["erreurs"].append((numero, "Le nom et le prénom sont obligatoires pour un emprunt !"))
+                continue
+            if livres[titre]['Exemplaires'] <= 0:
+                bilan["erreurs"].append((numero, f"Pas de copies disponibles pour '{titre}' !"))
+                continue
+            personne = personnes.trouver(nom, prenom)
+            if personne is None:
+                personne = Emprunteur(nom.capitalize(), prenom.capitalize())
+                personnes.append(personne)
+            if personne['nbr_livres_empruntes'] >= MAX_EMPRUNTS:
+                bilan["erreurs"].append((numero, f"Limite de {MAX_EMPRUNTS} livres atteinte pour {prenom} {nom} !"))
+                continue
+
+            if id(personne) not in prochains_ids:
+                prochains_ids[id(personne)] = int(personnes.prochain_emprunt_id(personne))
+            emprunt_id = str(prochains_ids[id(personne)])
+            prochains_ids[id(personne)] += 1
+            personne['emprunts'][emprunt_id] = Emprunt(titre, jour_operation)
+            personnes.noter_emprunt(personne, emprunt_id)
+            personne['nbr_livres_empruntes'] += 1
+            livres[titre]['Exemplaires'] -= 1
+            en_cours.setdefault(titre, []).append((jour_operation, personne, emprunt_id))
+            bilan["emprunts"] += 1
+        else:
+            emprunts = en_cours.get(titre, [])
+            if nom and prenom:
+                personne = personnes.trouver(nom, prenom)
+                position = next((i for i, e in enumerate(emprunts) if e[1] is personne), None)
+            else:
+                position = 0 if emprunts else None
+            if position is None:
+                bilan["erreurs"].append((numero, f"Aucun emprunt en cours de '{titre}'"
+                                                 f"{f' pour {prenom} {nom}' if nom and prenom else ''} !"))
+                continue
+
+            jour_emprunt, personne, emprunt_id = emprunts[position]
+            emprunt = personne['emprunts'][emprunt_id]
+            if jour_operation < jour_emprunt:
+                bilan["erreurs"].append((numero, f"Retour de '{titre}' le {date_operation}, avant son emprunt "
+                                                 f"(le {emprunt['date_emprunt']}) !"))
+                continue
+            del emprunts[position]
+            emprunt.jour_retour = jour_operation
+            personnes.noter_retour(personne, emprunt_id)
+            bilan["penalites"] += emprunt.penalite()
+            personne['nbr_livres_empruntes'] -= 1
+            livres[titre]['Exemplaires'] += 1
+            bilan["retours"] += 1
+
+        livres.marquer_modifie(titre)
+        modifiees[id(personne)] = personne
+
+    bilan["personnes_modifiees"] = list(modifiees.values())
+    return bilan
+
+
+def traiter_lot(operations, livres, fichier_bibliotheque, personnes, fichier_emprunt):
+    """
+    Applique les opérations puis enregistre une seule fois les livres et les personnes modifiés.
+
+    :param operations: (list) Liste de dictionnaires représentant les opérations
+    :param livres: (Catalogue) Dictionnaire contenant tous les livres de la bibliothèque
+    :param fichier_bibliotheque: (str) le chemin vers le fichier bibliotheque.json
+    :param personnes: (RegistrePersonnes) Liste des dictionnaires contenant les emprunts enregistrés
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :return: (dict) bilan du lot (voir appliquer_operations)
+    """
+    bilan = appliquer_operations(operations, livres, personnes)
+    journaliser_personnes(personnes, bilan["personnes_modifiees"], fichier_emprunt)
+    sauvegarder_bibliotheque(livres, fichier_bibliotheque)
+    return bilan
@@ -1,42 +1,209 @@
 """
     Module fichier : gère les différents fichiers de données (bibliotheque.py et emprunt.py)
+
+    Chaque fichier de données est un instantané (bibliotheque.json, emprunt.csv) complété par un journal
+    (bibliotheque.json.journal, emprunt.csv.journal) : chaque transaction ajoute une seule ligne au journal,
+    qui est rejoué à la lecture puis replié dans l'instantané lors de la compaction.
+    Les instantanés sont écrits dans un fichier temporaire puis renommés, pour qu'un arrêt brutal
+    ne laisse jamais un fichier tronqué.
+
+    emprunt.csv est lu personne par personne (iterer_personnes). Lu sans historique, seuls les emprunts en cours
+    sont chargés : les emprunts clos restent dans le fichier, sont rechargés à la demande (charger_historique)
+    et recopiés tels quels lors de la compaction.
+
+    Si le chemin d'un fichier de données se termine par .db, .sqlite ou .sqlite3, la lecture et la
+    sauvegarde sont déléguées au module stockage_sqlite.
 """
 import csv
 import json
 import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+from utils import stockage_sqlite
+from utils.catalogue import Catalogue
+from utils.modeles import Emprunt
+from utils.modeles import Emprunteur
+from utils.modeles import Livre
+from utils.modeles import vers_json
+from utils.registre import RegistrePersonnes
+
+# Nombre d'entrées d'un journal au-delà duquel le journal est replié dans l'instantané
+SEUIL_COMPACTION = 500
+
+# Nombre d'entrées actuellement présentes dans chaque journal (clé : chemin du fichier de données)
+_taille_journaux = {}
+
+EXTENSIONS_SQLITE = (".db", ".sqlite", ".sqlite3")
+
+
+def est_base_sqlite(fichier):
+    """
+    :param fichier: (str) Chemin vers un fichier de données
+    :return: (bool) True si le fichier est une base SQLite (d'après son extension)
+    """
+    return os.path.splitext(fichier)[1].lower() in EXTENSIONS_SQLITE
+
+
+def chemin_journal(fichier):
+    """
+    :param fichier: (str) Chemin vers un fichier de données (bibliotheque.json ou emprunt.csv)
+    :return: (str) Chemin vers le journal associé à ce fichier
+    """
+    return fichier + ".journal"
+
+
+@contextmanager
+def ecriture_atomique(fichier, newline=None):
+    """
+    Ouvre un fichier temporaire dans le même dossier que le fichier visé et le renomme en fin d'écriture.
+
+    :param fichier: (str) Chemin du fichier à (ré)écrire
+    :param newline: (str) paramètre newline transmis à open (ex : "" pour le module csv)
+    :return: le fichier temporaire ouvert en écriture
+    """
+    descripteur, chemin_temporaire = tempfile.mkstemp(dir=os.path.dirname(fichier) or ".",
+                                                      prefix=os.path.basename(fichier) + ".", suffix=".tmp")
+    try:
+        with open(descripteur, "w", encoding="utf-8", newline=newline) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        if os.path.exists(fichier):
+            shutil.copymode(fichier, chemin_temporaire)
+        os.replace(chemin_temporaire, fichier)
+    except BaseException:
+        os.remove(chemin_temporaire)
+        raise
+
+
+def _objet_json(objet):
+    """
+    Appelée par json.load pour chaque objet lu, des plus imbriqués (les livres) au catalogue lui-même : chaque livre
+    devient un Livre dès sa lecture, sans que le catalogue complet n'existe jamais sous forme de dictionnaires.
+
+    :param objet: (dict) un objet JSON lu
+    :return: (Livre) le livre si l'objet est un livre, sinon (dict) l'objet inchangé
+    """
+    # Dans le catalogue lui-même, "Exemplaires" ne peut être qu'un titre, associé à un livre déjà converti
+    if "Exemplaires" in objet and not isinstance(objet["Exemplaires"], (dict, Livre)):
+        return Livre.depuis_dict(objet)
+    return objet
 
 
 def lire_bibliotheque(fichier_bibliotheque):
     """
     :param fichier_bibliotheque: (str) le chemin vers le fichier bibliotheque.json
-    :return: (dict) les données (les livres de la bibliothèque) lues à partir du fichier
+    :return: (Catalogue) les données (les livres de la bibliothèque) lues à partir du fichier et de son journal
     """
+    if est_base_sqlite(fichier_bibliotheque):
+        return stockage_sqlite.lire_bibliotheque_sqlite(fichier_bibliotheque)
+
     try:
         with open(fichier_bibliotheque, "r", encoding="UTF-8") as file:
-            return json.load(file)
+            livres = Catalogue(json.load(file, object_hook=_objet_json))
     except FileNotFoundError:
         print('Fichier non trouvé !')
-        return {}
+        livres = Catalogue()
+
+    nbr_entrees = 0
+    fichier_journal = chemin_journal(fichier_bibliotheque)
+    if os.path.isfile(fichier_journal):
+        with open(fichier_journal, "r", encoding="utf-8") as file:
+            for ligne in file:
+                try:
+                    entree = json.loads(ligne)
+                except json.JSONDecodeError:
+                    # Ligne tronquée (arrêt brutal pendant l'écriture) : on l'ignore
+                    print("Entrée du journal illisible ignorée !")
+                    continue
+                if entree["livre"] is None:
+                    livres.pop(entree["titre"], None)
+                else:
+                    livres[entree["titre"]] = entree["livre"]
+                nbr_entrees += 1
+
+    _taille_journaux[fichier_bibliotheque] = nbr_entrees
+    livres.titres_modifies.clear()
+    return livres
 
 
-def sauvegarder_bibliotheque(bibliotheque, fichier_bibliotheque):
+def sauvegarder_bibliotheque(bibliotheque, fichier_bibliotheque, compacter=False):
     """
+    Seuls les livres modifiés depuis la dernière sauvegarde sont ajoutés au journal ; l'instantané complet
+    n'est réécrit que lors de la compaction (demandée, journal trop long ou "bibliotheque" qui n'est pas
+    un Catalogue).
+
     :param bibliotheque: (dict) un dictionnaire contenant la bibliotheque (les livres sont formes de dictionnaires)
     :param fichier_bibliotheque: (str) le chemin vers le fichier bibliotheque.json
+    :param compacter: (bool) True pour réécrire l'instantané complet et vider le journal
     :return: rien, permet de sauvegarder les données
     """
+    if est_base_sqlite(fichier_bibliotheque):
+        stockage_sqlite.sauvegarder_bibliotheque_sqlite(bibliotheque, fichier_bibliotheque, compacter)
+        return
+
+    titres_modifies = getattr(bibliotheque, "titres_modifies", None)
+    nbr_entrees = _taille_journaux.get(fichier_bibliotheque, 0)
     try:
-        with open(fichier_bibliotheque, "w", encoding="UTF-8") as file:
-            json.dump(bibliotheque, file, default=str, indent=4, ensure_ascii=False)
+        if (not compacter and titres_modifies is not None
+                and nbr_entrees + len(titres_modifies) < SEUIL_COMPACTION):
+            ecrire_journal_livres({titre: bibliotheque.get(titre) for titre in titres_modifies}, fichier_bibliotheque)
+        else:
+            with ecriture_atomique(fichier_bibliotheque) as file:
+                json.dump(bibliotheque, file, default=vers_json, indent=4, ensure_ascii=False)
+            # Le journal est désormais replié dans l'instantané
+            if os.path.isfile(chemin_journal(fichier_bibliotheque)):
+                os.remove(chemin_journal(fichier_bibliotheque))
+            _taille_journaux[fichier_bibliotheque] = 0
     except FileNotFoundError:
         print('Fichier non trouvé !')
+        return
+
+    if titres_modifies is not None:
+        titres_modifies.clear()
+
+
+def ecrire_journal_livres(modifications, fichier_bibliotheque):
+    """
+    Ajoute des livres modifiés à la fin du journal (ou les met à jour dans la base SQLite), sans compaction.
+
+    :param modifications: (dict) titre -> informations du livre (None si le livre a été supprimé)
+    :param fichier_bibliotheque: (str) le chemin vers le fichier bibliotheque.json
+    :return: None
+    """
+    if est_base_sqlite(fichier_bibliotheque):
+        stockage_sqlite.ecrire_livres_sqlite(modifications, fichier_bibliotheque)
+        return
+    if not modifications:
+        return
+
+    with open(chemin_journal(fichier_bibliotheque), "a", encoding="utf-8") as file:
+        for titre, livre in modifications.items():
+            entree = {"titre": titre, "livre": livre}
+            file.write(json.dumps(entree, default=vers_json, ensure_ascii=False) + "\n")
+    _taille_journaux[fichier_bibliotheque] = _taille_journaux.get(fichier_bibliotheque, 0) + len(modifications)
+
+
+def compaction_necessaire(fichier):
+    """
+    :param fichier: (str) Chemin vers un fichier de données (bibliotheque.json ou emprunt.csv)
+    :return: (bool) True si le journal de ce fichier est assez long pour être replié dans l'instantané
+    """
+    return _taille_journaux.get(fichier, 0) >= SEUIL_COMPACTION
 
 
-def lire_emprunts(fichier_emprunt):
+def lire_emprunts(fichier_emprunt, historique=True):
     """
     :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
-    :return: (list) Liste de dictionnaires contenant les informations concernant les emprunteurs
+    :param historique: (bool) False pour ne charger que les emprunts en cours (les emprunts clos restent
+                       dans le fichier jusqu'à un appel à charger_historique) ; une base SQLite est toujours lue en entier
+    :return: (RegistrePersonnes) Liste de dictionnaires contenant les informations concernant les emprunteurs
     """
+    if est_base_sqlite(fichier_emprunt):
+        return RegistrePersonnes(stockage_sqlite.lire_emprunts_sqlite(fichier_emprunt))
+
     # Créer le fichier s'il n'existe pas
     if not os.path.isfile(fichier_emprunt):
         with open(fichier_emprunt, "w", encoding="utf-8", newline="") as file:
@@ -54,47 +221,272 @@ def lire_emprunts(fichier_emprunt):
             writer.writeheader()
 
     personnes = []
-    current_person = None
+    non_charges = None if historique else {}
     try:
-        with open(fichier_emprunt, "r", encoding="utf-8", newline="") as file:
-            reader: csv.DictReader = csv.DictReader(file, delimiter=";")
-            for row in reader:
-                nom = row["nom"]
-                prenom = row["prenom"]
-                # Nouvelle personne si nom et prénom sont présents
-                if nom and prenom:
-                    current_person = {
-                        "nom": nom,
-                        "prenom": prenom,
-                        "nbr_livres_empruntes": int(row["nbr_livres_empruntes"]),
-                        "photo_id": row.get("photo_id", ""),
-                        "emprunts": {}
-                    }
-                    personnes.append(current_person)
-                # Ajouter l'emprunt à la personne actuelle
-                if current_person:
-                    emprunt_id = row["emprunt_id"]
-                    current_person["emprunts"][emprunt_id] = {
-                        "titre": row["titre"],
-                        "date_emprunt": row["date_emprunt"],
-                        "date_retour": row["date_retour"]
-                    }
+        personnes.extend(iterer_personnes(fichier_emprunt, non_charges))
     except csv.Error as e:
         print(f"Erreur lors de la lecture du fichier CSV : {e}")
 
-    return personnes
+    registre = RegistrePersonnes()
+    if non_charges:
+        # Noté avant de rejouer le journal, qui peut renommer des personnes (elles sont modifiées sur place)
+        for personne in personnes:
+            cle = (personne["nom"], personne["prenom"])
+            if cle in non_charges:
+                registre.emprunts_non_charges[id(personne)] = [cle, non_charges[cle]]
+
+    rejouer_journal(personnes, fichier_emprunt)
+    registre.extend(personnes)
+    return registre
+
+
+def lire_emprunteurs(fichier_emprunt, noms):
+    """
+    Lit seulement les personnes demandées, lorsque c'est possible : dans une base SQLite, chacune est cherchée
+    par l'index (nom, prénom) ; emprunt.csv, lui, est lu en entier (sans historique, voir lire_emprunts).
+
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :param noms: (iterable) tuples (nom, prénom) des personnes voulues
+    :return: (RegistrePersonnes) les personnes trouvées (toutes les personnes pour un fichier CSV)
+    """
+    if not est_base_sqlite(fichier_emprunt):
+        return lire_emprunts(fichier_emprunt, historique=False)
+    registre = RegistrePersonnes()
+    for nom, prenom in noms:
+        if registre.trouver(nom, prenom) is None:
+            personne = stockage_sqlite.trouver_emprunteur(fichier_emprunt, nom, prenom)
+            if personne is not None:
+                registre.append(personne)
+    return registre
+
+
+def iterer_personnes(fichier_emprunt, non_charges=None):
+    """
+    Lit emprunt.csv ligne par ligne et produit les personnes une à une, sans construire la liste complète.
+
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :param non_charges: (dict) si fourni, les emprunts clos ne sont pas chargés : pour chaque personne concernée,
+                        non_charges[(nom, prénom)] reçoit le plus grand numéro d'emprunt laissé dans le fichier
+    :return: (generator) les personnes (Emprunteur, avec leurs emprunts), dans l'ordre du fichier
+    """
+    current_person = None
+    # Plus grand numéro d'emprunt clos non chargé de la personne en cours
+    dernier_clos = 0
+    with open(fichier_emprunt, "r", encoding="utf-8", newline="") as file:
+        reader = csv.reader(file, delimiter=";")
+        # Lignes lues sous forme de listes (plus rapide que csv.DictReader) : position de chaque colonne
+        colonnes = {nom_colonne: i for i, nom_colonne in enumerate(next(reader, []))}
+        i_nom, i_prenom, i_nbr, i_id, i_titre, i_date_emprunt, i_date_retour = (
+            colonnes[c] for c in ("nom", "prenom", "nbr_livres_empruntes", "emprunt_id", "titre", "date_emprunt",
+                                  "date_retour"))
+        i_photo = colonnes.get("photo_id")
+        for row in reader:
+            # Nouvelle personne si nom et prénom sont présents
+            if row[i_nom] and row[i_prenom]:
+                if current_person:
+                    if dernier_clos:
+                        non_charges[(current_person["nom"], current_person["prenom"])] = dernier_clos
+                        dernier_clos = 0
+                    yield current_person
+                current_person = Emprunteur(row[i_nom], row[i_prenom], int(row[i_nbr]),
+                                            row[i_photo] if i_photo is not None else "")
+            if not current_person:
+                continue
+            if non_charges is not None and row[i_date_retour]:
+                dernier_clos = max(dernier_clos, int(row[i_id]))
+                continue
+            # Ajouter l'emprunt à la personne actuelle (dates converties une seule fois, ici)
+            current_person.emprunts[row[i_id]] = Emprunt.depuis_texte(row[i_titre], row[i_date_emprunt],
+                                                                     row[i_date_retour])
+    if current_person:
+        if dernier_clos:
+            non_charges[(current_person["nom"], current_person["prenom"])] = dernier_clos
+        yield current_person
+
+
+def _emprunts_clos_non_charges(personnes, fichier_emprunt, ids_personnes):
+    """
+    :param personnes: (RegistrePersonnes) le registre lu sans historique
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :param ids_personnes: (set) id() des personnes dont il faut relire les emprunts clos
+    :return: (dict) id(personne) -> {numéro: emprunt} des emprunts clos restés dans le fichier
+    """
+    cles = {personnes.emprunts_non_charges[i][0]: i for i in ids_personnes}
+    emprunts_clos = {}
+    for personne in iterer_personnes(fichier_emprunt):
+        id_personne = cles.pop((personne["nom"], personne["prenom"]), None)
+        if id_personne is not None:
+            emprunts_clos[id_personne] = {num: e for num, e in personne["emprunts"].items() if e["date_retour"]}
+            if not cles:
+                break
+    return emprunts_clos
+
+
+def _fusionner_emprunts(emprunts_clos, emprunts):
+    """
+    :param emprunts_clos: (dict) emprunts clos relus dans le fichier
+    :param emprunts: (dict) emprunts en mémoire (prioritaires)
+    :return: (dict) tous les emprunts, par numéro croissant
+    """
+    return dict(sorted({**emprunts_clos, **emprunts}.items(), key=lambda e: int(e[0])))
+
+
+def charger_historique(personnes, personne, fichier_emprunt):
+    """
+    Complète une personne lue sans historique avec ses emprunts clos restés dans emprunt.csv.
+
+    :param personnes: (RegistrePersonnes) Liste de dictionnaires contenant toutes les personnes
+    :param personne: (dict) la personne dont on veut tout l'historique
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :return: (dict) la personne, avec tous ses emprunts
+    """
+    if personnes.historique_charge(personne):
+        return personne
+    emprunts_clos = _emprunts_clos_non_charges(personnes, fichier_emprunt, {id(personne)})
+    personne["emprunts"] = _fusionner_emprunts(emprunts_clos.get(id(personne), {}), personne["emprunts"])
+    del personnes.emprunts_non_charges[id(personne)]
+    return personne
+
+
+def rejouer_journal(personnes, fichier_emprunt):
+    """
+    Applique, dans l'ordre, les entrées du journal à la liste des personnes lue depuis l'instantané.
+
+    :param personnes: (list) Liste de dictionnaires lue à partir du fichier emprunt.csv
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :return: (int) le nombre d'entrées rejouées
+    """
+    fichier_journal = chemin_journal(fichier_emprunt)
+    nbr_entrees = 0
+    if os.path.isfile(fichier_journal):
+        positions = {(p["nom"], p["prenom"]): i for i, p in enumerate(personnes)}
+        with open(fichier_journal, "r", encoding="utf-8") as file:
+            for ligne in file:
+                try:
+                    entree = json.loads(ligne)
+                except json.JSONDecodeError:
+                    # Ligne tronquée (arrêt brutal pendant l'écriture) : on l'ignore
+                    print("Entrée du journal illisible ignorée !")
+                    continue
+                personne = Emprunteur.depuis_dict(entree["personne"])
+                cle = tuple(entree["cle"])
+                position = positions.pop(cle, None)
+                if position is None:
+                    position = len(personnes)
+                    personnes.append(personne)
+                else:
+                    # Un emprunt n'est jamais supprimé et l'entrée peut venir d'une session lue sans historique :
+                    # les emprunts de l'entrée complètent ceux déjà lus (la personne est modifiée sur place)
+                    emprunts = {**personnes[position]["emprunts"], **personne["emprunts"]}
+                    personnes[position].update(personne, emprunts=emprunts)
+                positions[(personne["nom"], personne["prenom"])] = position
+                nbr_entrees += 1
+
+    _taille_journaux[fichier_emprunt] = nbr_entrees
+    return nbr_entrees
+
+
+def journaliser_personne(personnes, personne, fichier_emprunt, cle=None):
+    """
+    Ajoute l'état d'une personne (et de ses emprunts) à la fin du journal, sans réécrire emprunt.csv.
+    Lorsque le journal devient trop long, il est replié dans l'instantané (compaction).
+
+    :param personnes: (list) Liste de dictionnaires contenant toutes les personnes (pour la compaction)
+    :param personne: (dict) la personne qui vient d'emprunter, de rendre ou d'être modifiée
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :param cle: (tuple) (nom, prénom) de la personne avant modification, si elle a été renommée
+    :return: None
+    """
+    ecrire_journal_personne(personne, fichier_emprunt, cle)
+    if compaction_necessaire(fichier_emprunt):
+        sauvegarder_emprunts(personnes, fichier_emprunt)
+
+
+def journaliser_personnes(personnes, modifiees, fichier_emprunt):
+    """
+    Ajoute l'état de plusieurs personnes à la fin du journal en une seule écriture (traitement par lot).
+    Si le journal devait dépasser le seuil de compaction, emprunt.csv est directement réécrit une seule fois.
+
+    :param personnes: (list) Liste de dictionnaires contenant toutes les personnes (pour la compaction)
+    :param modifiees: (list) les personnes qui ont emprunté, rendu ou été ajoutées
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :return: None
+    """
+    if not modifiees:
+        return
+    if est_base_sqlite(fichier_emprunt):
+        stockage_sqlite.sauvegarder_personnes_sqlite(modifiees, fichier_emprunt)
+        return
+    if _taille_journaux.get(fichier_emprunt, 0) + len(modifiees) >= SEUIL_COMPACTION:
+        sauvegarder_emprunts(personnes, fichier_emprunt)
+        return
+
+    with open(chemin_journal(fichier_emprunt), "a", encoding="utf-8") as file:
+        for personne in modifiees:
+            file.write(json.dumps(_entree_journal_personne(personne), ensure_ascii=False) + "\n")
+    _taille_journaux[fichier_emprunt] = _taille_journaux.get(fichier_emprunt, 0) + len(modifiees)
+
+
+def _entree_journal_personne(personne, cle=None):
+    """
+    :param personne: (dict) une personne et ses emprunts
+    :param cle: (tuple) (nom, prénom) de la personne avant modification, si elle a été renommée
+    :return: (dict) l'entrée du journal correspondante
+    """
+    if cle is None:
+        cle = (personne["nom"], personne["prenom"])
+    return {
+        "cle": list(cle),
+        "personne": {
+            "nom": personne["nom"],
+            "prenom": personne["prenom"],
+            "nbr_livres_empruntes": personne["nbr_livres_empruntes"],
+            "photo_id": personne.get("photo_id", ""),
+            "emprunts": {num: dict(emprunt) for num, emprunt in personne["emprunts"].items()}
+        }
+    }
+
+
+def ecrire_journal_personne(personne, fichier_emprunt, cle=None):
+    """
+    Ajoute l'état d'une personne à la fin du journal (ou la met à jour dans la base SQLite), sans compaction.
+
+    :param personne: (dict) la personne qui vient d'emprunter, de rendre ou d'être modifiée
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :param cle: (tuple) (nom, prénom) de la personne avant modification, si elle a été renommée
+    :return: None
+    """
+    if est_base_sqlite(fichier_emprunt):
+        stockage_sqlite.sauvegarder_personne_sqlite(personne, fichier_emprunt, cle)
+        return
+
+    with open(chemin_journal(fichier_emprunt), "a", encoding="utf-8") as file:
+        file.write(json.dumps(_entree_journal_personne(personne, cle), ensure_ascii=False) + "\n")
+
+    _taille_journaux[fichier_emprunt] = _taille_journaux.get(fichier_emprunt, 0) + 1
 
 
 def sauvegarder_emprunts(emprunts, fichier_emprunt):
     """
     Écrit les emprunts dans le fichier emprunt.csv avec une ligne principale par personne
     et des lignes secondaires pour les emprunts.
+    L'instantané contenant alors tout l'historique, le journal est vidé (compaction).
+    Les emprunts clos non chargés (lecture sans historique) sont recopiés depuis l'ancien fichier.
 
     :param emprunts: (list) Liste de dictionnaires contenant les emprunts
     :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
     :return: None
     """
-    with open(fichier_emprunt, "w", encoding="utf-8", newline="") as file:
+    if est_base_sqlite(fichier_emprunt):
+        stockage_sqlite.sauvegarder_emprunts_sqlite(emprunts, fichier_emprunt)
+        return
+
+    non_charges = getattr(emprunts, "emprunts_non_charges", None)
+    emprunts_clos = {}
+    if non_charges:
+        emprunts_clos = _emprunts_clos_non_charges(emprunts, fichier_emprunt, set(non_charges))
+
+    with ecriture_atomique(fichier_emprunt, newline="") as file:
         fieldnames = ["nom", "prenom", "nbr_livres_empruntes", "photo_id", "emprunt_id", "titre", "date_emprunt",
                       "date_retour"]
         writer = csv.DictWriter(file, fieldnames=fieldnames, delimiter=";")
@@ -102,6 +494,8 @@ def sauvegarder_emprunts(emprunts, fichier_emprunt):
 
         for personne in emprunts:
             emprunts_dict = personne["emprunts"]
+            if id(personne) in emprunts_clos:
+                emprunts_dict = _fusionner_emprunts(emprunts_clos[id(personne)], emprunts_dict)
             # Calculer nbr_livres_empruntes (nombre d'emprunts sans date_retour)
             nbr_livres = sum(1 for emprunt in emprunts_dict.values() if not emprunt["date_retour"])
             for i, (num, emprunt) in enumerate(emprunts_dict.items(), 1):
@@ -128,3 +522,14 @@ def sauvegarder_emprunts(emprunts, fichier_emprunt):
                         "photo_id": ""
                     })
                 writer.writerow(row)
+
+    # Les emprunts non chargés sont désormais enregistrés sous le nom actuel des personnes
+    if non_charges:
+        for personne in emprunts:
+            if id(personne) in non_charges:
+                non_charges[id(personne)][0] = (personne["nom"], personne["prenom"])
+
+    # Le journal est désormais replié dans l'instantané
+    if os.path.isfile(chemin_journal(fichier_emprunt)):
+        os.remove(chemin_journal(fichier_emprunt))
+    _taille_journaux[fichier_emprunt] = 0
@@ -0,0 +1,140 @@
+"""
+    Module import du catalogue : ajout en masse de livres depuis un fichier CSV, JSON lines ou JSON
+
+    Les fichiers CSV (séparateur ;, en-tête Titre;Auteur;Année;Genre;Exemplaires, comme l'export) et
+    JSON lines (un objet {"Titre": ..., "Auteur": ...} par ligne) sont lus ligne par ligne : le fichier
+    n'est jamais chargé en entier en mémoire. Un fichier .json au format de bibliotheque.json est aussi accepté.
+
+    Chaque livre est validé avec les mêmes règles que ajouter_livre. Un livre déjà présent (même titre,
+    sans tenir compte des accents ni de la casse), dans le catalogue ou plus haut dans le fichier,
+    n'est pas dupliqué : ses exemplaires sont ajoutés à ceux du livre existant.
+    La bibliothèque n'est enregistrée qu'une seule fois, à la fin de l'import.
+
+    Fonctions :
+        • lire_livres_csv
+        • lire_livres_jsonl
+        • lire_livres_json
+        • importer_livres
+        • importer_catalogue
+"""
+import csv
+import json
+import os
+
+from utils.bibliotheque import valider_annee
+from utils.bibliotheque import valider_exemplaires
+from utils.gestion_fichiers import sauvegarder_bibliotheque
+
+
+def lire_livres_csv(fichier_livres, delimiteur=";"):
+    """
+    :param fichier_livres: (str) Chemin vers le fichier CSV à importer
+    :param delimiteur: (str) le séparateur des colonnes
+    :return: (generator) tuples (numéro de ligne, dictionnaire du livre avec la clé "Titre")
+    """
+    with open(fichier_livres, "r", encoding="utf-8-sig", newline="") as file:
+        reader = csv.DictReader(file, delimiter=delimiteur)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def lire_livres_jsonl(fichier_livres):
+    """
+    :param fichier_livres: (str) Chemin vers le fichier JSON lines à importer
+    :return: (generator) tuples (numéro de ligne, dictionnaire du livre avec la clé "Titre", None si illisible)
+    """
+    with open(fichier_livres, "r", encoding="utf-8") as file:
+        for numero, ligne in enumerate(file, 1):
+            if not ligne.strip():
+                continue
+            try:
+                livre = json.loads(ligne)
+            except json.JSONDecodeError:
+                livre = None
+            yield numero, livre if isinstance(livre, dict) else None
+
+
+def lire_livres_json(fichier_livres):
+    """
+    :param fichier_livres: (str) Chemin vers un fichier JSON au format de bibliotheque.json (titre -> livre)
+    :return: (generator) tuples (numéro du livre, dictionnaire du livre avec la clé "Titre")
+    """
+    # Un objet JSON ne peut pas être lu partiellement : ce format est chargé en entier
+    with open(fichier_livres, "r", encoding="utf-8") as file:
+        livres = json.load(file)
+    for numero, (titre, livre) in enumerate(livres.items(), 1):
+        yield numero, {"Titre": titre, **livre}
+
+
+LECTEURS = {
+    ".csv": lire_livres_csv,
+    ".jsonl": lire_livres_jsonl,
+    ".ndjson": lire_livres_jsonl,
+    ".json": lire_livres_json,
+}
+
+
+def importer_livres(livres, livres_a_importer):
+    """
+    Ajoute les livres au catalogue (en mémoire), en fusionnant les doublons.
+
+    :param livres: (Catalogue) un dictionnaire contenant tous les livres disponibles
+    :param livres_a_importer: (iterable) tuples (numéro de ligne, dictionnaire du livre avec la clé "Titre"
+                              ou None si la ligne est illisible)
+    :return: (dict) bilan de l'import :
+        - "ajoutes" : (int) nombre de nouveaux livres
+        - "fusionnes" : (int) nombre de livres dont les exemplaires ont été ajoutés à un livre existant
+        - "erreurs" : (list) tuples (numéro de ligne, message) des livres ignorés
+    """
+    bilan = {"ajoutes": 0, "fusionnes": 0, "erreurs": []}
+
+    for numero, livre in livres_a_importer:
+        if livre is None:
+            bilan["erreurs"].append((numero, "Ligne illisible !"))
+            continue
+        titre = str(livre.get("Titre") or "").strip()
+        if not titre:
+            bilan["erreurs"].append((numero, "Le titre est obligatoire !"))
+            continue
+        try:
+            annee = valider_annee(livre.get("Année"))
+            exemplaires = valider_exemplaires(livre.get("Exemplaires"))
+        except ValueError as e:
+            bilan["erreurs"].append((numero, f'"{titre}" : {e}'))
+            continue
+
+        # Même règle que modifier_livre et supprimer_livre : un livre ajouté plus haut dans le fichier
+        # est aussi retrouvé, le catalogue tenant ses index à jour
+        titre_existant = livres.trouver_titre(titre)
+        if titre_existant is not None:
+            livres[titre_existant]["Exemplaires"] += exemplaires
+            livres.marquer_modifie(titre_existant)
+            bilan["fusionnes"] += 1
+        else:
+            livres[titre] = {
+                "Auteur": str(livre.get("Auteur") or "").strip(),
+                "Année": annee,
+                "Genre": str(livre.get("Genre") or "").strip(),
+                "Exemplaires": exemplaires
+            }
+            bilan["ajoutes"] += 1
+
+    return bilan
+
+
+def importer_catalogue(fichier_livres, livres, fichier_bibliotheque):
+    """
+    Importe un fichier de livres puis enregistre la bibliothèque une seule fois.
+
+    :param fichier_livres: (str) Chemin vers le fichier à importer (.csv, .jsonl, .ndjson ou .json)
+    :param livres: (Catalogue) un dictionnaire contenant tous les livres disponibles
+    :param fichier_bibliotheque: (str) le chemin vers le fichier bibliotheque.json
+    :return: (dict) bilan de l'import (voir importer_livres)
+    :raise ValueError: si l'extension du fichier n'est pas reconnue
+    """
+    extension = os.path.splitext(fichier_livres)[1].lower()
+    if extension not in LECTEURS:
+        raise ValueError(f"Format non reconnu : {extension} (formats acceptés : {', '.join(LECTEURS)})")
+    bilan = importer_livres(livres, LECTEURS[extension](fichier_livres))
+    sauvegarder_bibliotheque(livres, fichier_bibliotheque)
+    return bilan
@@ -0,0 +1,170 @@
+"""
+    Liste virtuelle des livres (ttk.Treeview) pour l'interface
+
+    Le Treeview ne contient jamais plus de lignes que celles visibles à l'écran : lors du défilement,
+    ces lignes sont simplement réutilisées pour afficher les livres suivants. L'affichage d'un catalogue
+    de plusieurs centaines de milliers de livres reste donc immédiat. Un clic sur l'en-tête d'une colonne
+    trie la liste selon cette colonne (un second clic inverse l'ordre).
+"""
+import tkinter as tk
+from tkinter import ttk
+
+from utils.recherche import normaliser_texte
+
+COLONNES = ("Titre", "Auteur", "Année", "Genre", "Exemplaires")
+LARGEURS = {"Titre": 380, "Auteur": 240, "Année": 90, "Genre": 200, "Exemplaires": 120}
+
+
+def cle_tri(colonne):
+    """
+    :param colonne: Chaîne représentant la colonne selon laquelle trier (Titre, Auteur, Année, Genre, Exemplaires)
+    :return: Fonction (titre, livre) -> clé de tri ; les valeurs numériques sont triées comme des nombres
+    """
+    def cle(titre, livre):
+        """Clé de tri d'un livre pour la colonne choisie (nombres avant textes)."""
+        valeur = titre if colonne == "Titre" else livre.get(colonne, "")
+        if isinstance(valeur, int) or str(valeur).strip().isdigit():
+            return 0, int(valeur), ""
+        return 1, 0, normaliser_texte(valeur)
+    return cle
+
+
+class ListeLivres(ttk.Frame):
+    """Treeview à nombre de lignes fixe, dont les lignes sont réutilisées lors du défilement."""
+
+    def __init__(self, parent, livres, nbr_lignes=20, font=("Helvetica", 14)):
+        """
+        :param parent: Widget parent
+        :param livres: Dictionnaire contenant les données des livres
+        :param nbr_lignes: Nombre de lignes visibles
+        :param font: Tuple représentant la police et la taille des lignes
+        """
+        super().__init__(parent)
+        self.livres = livres
+        self.titres = []
+        self.debut = 0
+        self.nbr_lignes = nbr_lignes
+        self.colonne_tri = None
+        self.tri_inverse = False
+
+        style = ttk.Style(self)
+        style.configure("Custom.Treeview", font=font, rowheight=font[1] * 2)
+        style.configure("Custom.Treeview.Heading", font=(font[0], font[1], "bold"))
+
+        self.tree = ttk.Treeview(self, columns=COLONNES, show="headings", height=nbr_lignes,
+                                 selectmode="browse", style="Custom.Treeview")
+        for colonne in COLONNES:
+            self.tree.heading(colonne, text=colonne, command=lambda c=colonne: self.trier(c))
+            self.tree.column(colonne, width=LARGEURS[colonne], anchor="w", stretch=colonne == "Titre")
+        self.barre = ttk.Scrollbar(self, orient="vertical", command=self._defiler)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.barre.grid(row=0, column=1, sticky="ns")
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        # Les seules lignes du Treeview, créées une fois pour toutes
+        self._lignes = [self.tree.insert("", tk.END) for _ in range(nbr_lignes)]
+        self._nbr_attachees = nbr_lignes
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._molette)
+        self.tree.bind("<Up>", lambda event: self._deplacer_selection(-1))
+        self.tree.bind("<Down>", lambda event: self._deplacer_selection(1))
+        self.tree.bind("<Prior>", lambda event: self._defiler("scroll", -1, "pages"))
+        self.tree.bind("<Next>", lambda event: self._defiler("scroll", 1, "pages"))
+
+    def afficher(self, titres):
+        """
+        :param titres: Liste des titres à afficher (dans l'ordre voulu, sauf si une colonne de tri est choisie)
+        :return: Aucun
+        """
+        self.titres = list(titres)
+        self.debut = 0
+        if self.colonne_tri:
+            self._trier_titres()
+        self._rendre()
+
+    def trier(self, colonne):
+        """
+        :param colonne: Chaîne représentant la colonne dont l'en-tête a été cliqué
+        :return: Aucun, trie la liste (ordre inversé si la colonne était déjà la colonne de tri)
+        """
+        self.tri_inverse = not self.tri_inverse if colonne == self.colonne_tri else False
+        self.colonne_tri = colonne
+        for c in COLONNES:
+            fleche = (" ▼" if self.tri_inverse else " ▲") if c == colonne else ""
+            self.tree.heading(c, text=c + fleche)
+        self._trier_titres()
+        self.debut = 0
+        self._rendre()
+
+    def titre_selectionne(self):
+        """
+        :return: Chaîne représentant le titre du livre sélectionné, None si aucun livre n'est sélectionné
+        """
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        position = self.debut + self._lignes.index(selection[0])
+        return self.titres[position] if position < len(self.titres) else None
+
+    def _trier_titres(self):
+        cle = cle_tri(self.colonne_tri)
+        livres = self.livres
+        self.titres.sort(key=lambda titre: cle(titre, livres[titre]), reverse=self.tri_inverse)
+
+    def _rendre(self):
+        """Met dans les lignes du Treeview les livres visibles à partir de la position self.debut."""
+        total = len(self.titres)
+        self.debut = max(0, min(self.debut, total - self.nbr_lignes))
+        visibles = self.titres[self.debut:self.debut + self.nbr_lignes]
+
+        # Les lignes inutiles (liste plus courte que la fenêtre) sont détachées du Treeview
+        for position in range(self._nbr_attachees, len(visibles)):
+            self.tree.move(self._lignes[position], "", position)
+        if len(visibles) < self._nbr_attachees:
+            self.tree.detach(*self._lignes[len(visibles):self._nbr_attachees])
+        self._nbr_attachees = len(visibles)
+
+        for ligne, titre in zip(self._lignes, visibles):
+            info = self.livres[titre]
+            self.tree.item(ligne, values=(titre, info['Auteur'], info['Année'], info['Genre'], info['Exemplaires']))
+
+        if total:
+            self.barre.set(self.debut / total, (self.debut + len(visibles)) / total)
+        else:
+            self.barre.set(0, 1)
+
+    def _defiler(self, action, quantite, unite=None):
+        """
+        :param action: "moveto" (quantite = fraction de la liste) ou "scroll" (quantite = nombre d'unités)
+        :param quantite: Fraction ou nombre d'unités (lignes ou pages)
+        :param unite: "units" ou "pages" pour l'action "scroll"
+        :return: "break" pour empêcher le traitement par défaut de l'événement
+        """
+        if action == "moveto":
+            self.debut = int(float(quantite) * len(self.titres))
+        else:
+            self.debut += int(quantite) * (self.nbr_lignes if unite == "pages" else 1)
+        self._rendre()
+        return "break"
+
+    def _molette(self, event):
+        """Défile de trois lignes par cran de molette (Windows et macOS : event.delta, Linux : boutons 4 et 5)."""
+        if event.num == 4 or event.delta > 0:
+            return self._defiler("scroll", -3, "units")
+        return self._defiler("scroll", 3, "units")
+
+    def _deplacer_selection(self, sens):
+        """
+        :param sens: -1 pour monter, 1 pour descendre
+        :return: "break" si la liste a défilé pour garder la sélection visible, None sinon
+        """
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        position = self._lignes.index(selection[0])
+        if 0 <= position + sens < self._nbr_attachees:
+            return None
+        self._defiler("scroll", sens, "units")
+        return "break"
@@ -0,0 +1,287 @@
+"""
+    Module modèles : enregistrements compacts des données en mémoire
+
+    Les livres (Livre), les emprunteurs (Emprunteur) et leurs emprunts (Emprunt) sont des objets avec __slots__,
+    sans dictionnaire par objet : pour un catalogue d'un million de titres, c'est le dictionnaire de chaque livre
+    qui occupait l'essentiel de la mémoire. L'auteur et le genre, très souvent répétés, sont partagés
+    (sys.intern) entre les livres.
+
+    Les dates d'un emprunt sont des nombres de jours depuis l'an 1 (date.toordinal) : elles sont converties une
+    seule fois à la lecture des fichiers et remises au format AAAA-MM-JJ seulement à l'écriture. Le calcul des
+    retards et des pénalités se fait donc sur des entiers.
+
+    Chaque enregistrement se lit et se modifie aussi comme le dictionnaire qu'il remplace (livre["Exemplaires"] -= 1,
+    personne["emprunts"], emprunt["date_retour"] = "2025-05-01", livre.items(), dict(emprunt)) : le code existant
+    continue de fonctionner. Seules les clés du dictionnaire d'origine existent (une autre clé lève KeyError).
+    vers_json permet d'écrire ces objets avec json.dump.
+
+    Fonctions :
+        • jour_depuis_texte
+        • texte_depuis_jour
+        • vers_json
+        • Enregistrement (accès de type dictionnaire commun aux enregistrements)
+        • Livre (un livre)
+        • Emprunt (un emprunt)
+        • Emprunteur (une personne et ses emprunts)
+"""
+import copy
+import sys
+from datetime import date
+from functools import lru_cache
+
+from utils.retards import DUREE_EMPRUNT
+from utils.retards import PENALITE_PAR_JOUR
+
+
+@lru_cache(maxsize=None)
+def jour_depuis_texte(texte):
+    """
+    :param texte: (str) une date au format AAAA-MM-JJ, ou une chaîne vide
+    :return: (int) la date en nombre de jours depuis l'an 1, 0 pour une chaîne vide
+    """
+    return date.fromisoformat(texte).toordinal() if texte else 0
+
+
+@lru_cache(maxsize=None)
+def texte_depuis_jour(jour):
+    """
+    :param jour: (int) une date en nombre de jours depuis l'an 1, 0 pour aucune date
+    :return: (str) la date au format AAAA-MM-JJ, une chaîne vide pour 0
+    """
+    return date.fromordinal(jour).isoformat() if jour else ""
+
+
+def vers_json(objet):
+    """
+    À passer en paramètre default de json.dump / json.dumps.
+
+    :param objet: un objet que le module json ne sait pas écrire
+    :return: (dict) le dictionnaire équivalent pour un enregistrement, sinon (str) le texte de l'objet
+    """
+    if isinstance(objet, Enregistrement):
+        return objet.vers_dict()
+    return str(objet)
+
+
+class Enregistrement:
+    """Accès de type dictionnaire (clé -> attribut) commun aux enregistrements."""
+
+    __slots__ = ()
+
+    # Clé du dictionnaire équivalent -> nom de l'attribut
+    CHAMPS = {}
+
+    def vers_dict(self):
+        """
+        :return: (dict) le dictionnaire équivalent (même résultat que dict(enregistrement), en plus rapide)
+        """
+        return {cle: getattr(self, attribut) for cle, attribut in self.CHAMPS.items()}
+
+    def __getitem__(self, cle):
+        return getattr(self, self.CHAMPS[cle])
+
+    def __setitem__(self, cle, valeur):
+        setattr(self, self.CHAMPS[cle], valeur)
+
+    def get(self, cle, defaut=None):
+        return self[cle] if cle in self.CHAMPS else defaut
+
+    def keys(self):
+        return self.CHAMPS.keys()
+
+    def values(self):
+        return [self[cle] for cle in self.CHAMPS]
+
+    def items(self):
+        return [(cle, self[cle]) for cle in self.CHAMPS]
+
+    def update(self, autre=(), **champs):
+        for cle, valeur in dict(autre, **champs).items():
+            self[cle] = valeur
+
+    def __iter__(self):
+        return iter(self.CHAMPS)
+
+    def __len__(self):
+        return len(self.CHAMPS)
+
+    def __contains__(self, cle):
+        return cle in self.CHAMPS
+
+    def __eq__(self, autre):
+        if isinstance(autre, Enregistrement):
+            return type(self) is type(autre) and all(getattr(self, attribut) == getattr(autre, attribut)
+                                                     for attribut in self.__slots__)
+        if isinstance(autre, dict):
+            return self.vers_dict() == autre
+        return NotImplemented
+
+    __hash__ = None
+
+    def __deepcopy__(self, memo):
+        copie = type(self).__new__(type(self))
+        for attribut in self.__slots__:
+            setattr(copie, attribut, copy.deepcopy(getattr(self, attribut), memo))
+        return copie
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.vers_dict()!r})"
+
+
+class Livre(Enregistrement):
+    """Les informations d'un livre du catalogue (le titre est la clé du catalogue)."""
+
+    __slots__ = ("auteur", "annee", "genre", "exemplaires")
+
+    CHAMPS = {"Auteur": "auteur", "Année": "annee", "Genre": "genre", "Exemplaires": "exemplaires"}
+
+    def __init__(self, auteur, annee, genre, exemplaires):
+        """
+        :param auteur: (str) l'auteur du livre
+        :param annee: (int) l'année de parution
+        :param genre: (str) le genre du livre
+        :param exemplaires: (int) le nombre d'exemplaires disponibles
+        """
+        # Valeurs très souvent répétées : une seule chaîne partagée par tous les livres
+        self.auteur = sys.intern(auteur) if type(auteur) is str else auteur
+        self.annee = annee
+        self.genre = sys.intern(genre) if type(genre) is str else genre
+        self.exemplaires = exemplaires
+
+    @classmethod
+    def depuis_dict(cls, livre):
+        """
+        :param livre: (dict) un livre au format de bibliotheque.json (Auteur, Année, Genre, Exemplaires) ou un Livre
+        :return: (Livre) le livre
+        """
+        if isinstance(livre, cls):
+            return livre
+        return cls(livre.get("Auteur", ""), livre.get("Année", ""), livre.get("Genre", ""),
+                   livre.get("Exemplaires", 0))
+
+    def vers_dict(self):
+        return {"Auteur": self.auteur, "Année": self.annee, "Genre": self.genre, "Exemplaires": self.exemplaires}
+
+    def __deepcopy__(self, memo):
+        # Tous les champs sont immuables : une copie superficielle suffit
+        return Livre(self.auteur, self.annee, self.genre, self.exemplaires)
+
+
+class Emprunt(Enregistrement):
+    """Un emprunt : titre du livre, jour d'emprunt et jour de retour (0 tant que le livre n'est pas rendu)."""
+
+    __slots__ = ("titre", "jour_emprunt", "jour_retour")
+
+    # Les dates sont lues et modifiées au format AAAA-MM-JJ (propriétés date_emprunt et date_retour)
+    CHAMPS = {"titre": "titre", "date_emprunt": "date_emprunt", "date_retour": "date_retour"}
+
+    def __init__(self, titre, jour_emprunt, jour_retour=0):
+        """
+        :param titre: (str) le titre du livre emprunté
+        :param jour_emprunt: (int) la date d'emprunt (date.toordinal)
+        :param jour_retour: (int) la date de retour (date.toordinal), 0 si le livre n'est pas rendu
+        """
+        self.titre = titre
+        self.jour_emprunt = jour_emprunt
+        self.jour_retour = jour_retour
+
+    @classmethod
+    def depuis_texte(cls, titre, date_emprunt, date_retour=""):
+        """
+        :param titre: (str) le titre du livre emprunté
+        :param date_emprunt: (str) la date d'emprunt (AAAA-MM-JJ)
+        :param date_retour: (str) la date de retour (AAAA-MM-JJ), vide si le livre n'est pas rendu
+        :return: (Emprunt) l'emprunt
+        """
+        return cls(titre, jour_depuis_texte(date_emprunt), jour_depuis_texte(date_retour))
+
+    @classmethod
+    def depuis_dict(cls, emprunt):
+        """
+        :param emprunt: (dict) un emprunt au format des fichiers (titre, date_emprunt, date_retour) ou un Emprunt
+        :return: (Emprunt) l'emprunt
+        """
+        if isinstance(emprunt, cls):
+            return emprunt
+        return cls.depuis_texte(emprunt["titre"], emprunt["date_emprunt"], emprunt["date_retour"])
+
+    @property
+    def date_emprunt(self):
+        """(str) la date d'emprunt au format AAAA-MM-JJ"""
+        return texte_depuis_jour(self.jour_emprunt)
+
+    @date_emprunt.setter
+    def date_emprunt(self, texte):
+        self.jour_emprunt = jour_depuis_texte(texte)
+
+    @property
+    def date_retour(self):
+        """(str) la date de retour au format AAAA-MM-JJ, vide si le livre n'est pas rendu"""
+        return texte_depuis_jour(self.jour_retour)
+
+    @date_retour.setter
+    def date_retour(self, texte):
+        self.jour_retour = jour_depuis_texte(texte)
+
+    @property
+    def echeance(self):
+        """(int) la date de retour prévue (date.toordinal)"""
+        return self.jour_emprunt + DUREE_EMPRUNT
+
+    def jours_de_retard(self, jour=None):
+        """
+        :param jour: (int) date de référence (date.toordinal), par défaut la date de retour ou aujourd'hui
+        :return: (int) le nombre de jours de retard à cette date
+        """
+        if jour is None:
+            jour = self.jour_retour or date.today().toordinal()
+        return max(0, jour - self.echeance)
+
+    def penalite(self, jour=None):
+        """
+        :param jour: (int) date de référence (date.toordinal), par défaut la date de retour ou aujourd'hui
+        :return: (float) la pénalité de retard à cette date
+        """
+        return PENALITE_PAR_JOUR * self.jours_de_retard(jour)
+
+    def __deepcopy__(self, memo):
+        # Tous les champs sont immuables : une copie superficielle suffit
+        return Emprunt(self.titre, self.jour_emprunt, self.jour_retour)
+
+    def __repr__(self):
+        return f"Emprunt({self.titre!r}, {self.date_emprunt!r}, {self.date_retour!r})"
+
+
+class Emprunteur(Enregistrement):
+    """Une personne : nom, prénom, nombre de livres en cours d'emprunt, photo et emprunts (numéro -> Emprunt)."""
+
+    __slots__ = ("nom", "prenom", "nbr_livres_empruntes", "photo_id", "emprunts")
+
+    CHAMPS = {cle: cle for cle in __slots__}
+
+    def __init__(self, nom, prenom, nbr_livres_empruntes=0, photo_id="", emprunts=None):
+        """
+        :param nom: (str) le nom de la personne
+        :param prenom: (str) le prénom de la personne
+        :param nbr_livres_empruntes: (int) le nombre de livres en cours d'emprunt
+        :param photo_id: (str) l'identifiant de la photo, vide si la personne n'a pas de photo
+        :param emprunts: (dict) numéro d'emprunt (str) -> Emprunt
+        """
+        self.nom = nom
+        self.prenom = prenom
+        self.nbr_livres_empruntes = nbr_livres_empruntes
+        self.photo_id = photo_id
+        self.emprunts = {} if emprunts is None else emprunts
+
+    @classmethod
+    def depuis_dict(cls, personne):
+        """
+        :param personne: (dict) une personne au format du journal (emprunts sous forme de dictionnaires)
+                         ou un Emprunteur
+        :return: (Emprunteur) la personne, avec des emprunts de type Emprunt
+        """
+        if isinstance(personne, cls):
+            return personne
+        emprunts = {num: Emprunt.depuis_dict(e) for num, e in personne["emprunts"].items()}
+        return cls(personne["nom"], personne["prenom"], personne["nbr_livres_empruntes"],
+                   personne.get("photo_id", ""), emprunts)
@@ -0,0 +1,298 @@
+"""
+    Module persistance : sauvegarde différée (write-behind) des livres et des emprunteurs pour l'interface
+
+    Dans l'interface, chaque transaction (emprunt, retour, ajout ou modification d'un livre...) ne fait que
+    mettre les données modifiées en file d'attente : l'écriture sur le disque a lieu dans un thread dédié,
+    sans bloquer la boucle Tk. Les transactions rapprochées sont regroupées en une seule écriture
+    (une personne ou un livre modifié plusieurs fois n'est écrit qu'une fois).
+    La compaction (qui parcourt tout le catalogue ou toute la liste des personnes) reste faite dans le
+    thread Tk, après avoir attendu la fin des écritures en cours (avec une base SQLite, elle se limite à
+    replier le journal WAL : aucune ligne n'est réécrite) ; la file est vidée avant la fermeture,
+    y compris si le programme se termine autrement que par le bouton Quitter (atexit).
+    Une écriture qui échoue (fichier inaccessible, base SQLite verrouillée...) est signalée et ses transactions
+    sont remises en file d'attente : elles sont retentées, sans arrêter le thread de sauvegarde.
+
+    Sans sauvegarde différée active (ex : programme en ligne de commande), les fonctions sauvegarder_livres
+    et sauvegarder_personne écrivent immédiatement, comme sauvegarder_bibliotheque et journaliser_personne.
+
+    Fonctions :
+        • demarrer_persistance
+        • persistance_active
+        • sauvegarder_livres
+        • sauvegarder_personne
+        • arreter_persistances
+"""
+import atexit
+import copy
+import threading
+
+from utils.gestion_fichiers import compaction_necessaire
+from utils.gestion_fichiers import ecrire_journal_livres
+from utils.gestion_fichiers import ecrire_journal_personne
+from utils.gestion_fichiers import est_base_sqlite
+from utils.gestion_fichiers import journaliser_personne
+from utils.gestion_fichiers import sauvegarder_bibliotheque
+from utils.gestion_fichiers import sauvegarder_emprunts
+from utils.stockage_sqlite import replier_wal_sqlite
+
+# Nombre de secondes pendant lesquelles les transactions suivantes sont attendues avant d'écrire
+DELAI_REGROUPEMENT = 0.2
+
+# Nombre de secondes avant une nouvelle tentative, après une écriture qui a échoué (ex : base verrouillée)
+DELAI_REPRISE = 1.0
+
+# Sauvegardes différées actives (clé : chemin du fichier de données)
+_persistances = {}
+
+
+class PersistanceDifferee:
+    """File des livres et des personnes modifiés, écrits sur le disque par un thread dédié."""
+
+    def __init__(self, livres, fichier_bibliotheque, personnes, fichier_emprunt, delai=DELAI_REGROUPEMENT):
+        self.livres = livres
+        self.fichier_bibliotheque = fichier_bibliotheque
+        self.personnes = personnes
+        self.fichier_emprunt = fichier_emprunt
+        self.delai = delai
+        self._condition = threading.Condition()
+        # Titre -> copie des informations du livre (None si le livre a été supprimé)
+        self._livres_en_attente = {}
+        # id(personne) -> ((nom, prénom) lors de la dernière écriture, copie de la personne)
+        self._personnes_en_attente = {}
+        self._ecriture_en_cours = False
+        # Nombre d'écritures qui ont échoué (les transactions concernées sont remises en file d'attente)
+        self._echecs = 0
+        self._presse = False
+        self._arret = False
+        self._thread = threading.Thread(target=self._boucle, name="persistance", daemon=True)
+        self._thread.start()
+
+    def enregistrer_livres(self):
+        """
+        Met en file d'attente les livres modifiés depuis la dernière sauvegarde (à appeler dans le thread Tk).
+
+        :return: None
+        """
+        titres_modifies = getattr(self.livres, "titres_modifies", None)
+        if titres_modifies is None:
+            # Simple dictionnaire : pas de suivi des modifications, tout le fichier est réécrit
+            self.attendre()
+            sauvegarder_bibliotheque(self.livres, self.fichier_bibliotheque)
+            return
+        modifications = {titre: copy.deepcopy(self.livres.get(titre)) for titre in titres_modifies}
+        titres_modifies.clear()
+        with self._condition:
+            self._livres_en_attente.update(modifications)
+            self._condition.notify_all()
+
+    def enregistrer_personne(self, personne, cle=None):
+        """
+        Met en file d'attente l'état actuel d'une personne (à appeler dans le thread Tk).
+
+        :param personne: (dict) la personne qui vient d'emprunter, de rendre ou d'être modifiée
+        :param cle: (tuple) (nom, prénom) de la personne avant modification, si elle a été renommée
+        :return: None
+        """
+        instantane = copy.deepcopy(personne)
+        with self._condition:
+            if id(personne) in self._personnes_en_attente:
+                # Pas encore écrite : c'est toujours sous sa clé d'origine qu'elle est enregistrée sur le disque
+                cle = self._personnes_en_attente[id(personne)][0]
+            self._personnes_en_attente[id(personne)] = (cle, instantane)
+            self._condition.notify_all()
+
+    def attendre(self):
+        """
+        Écrit immédiatement les transactions en attente et attend la fin de leur écriture
+        (ou l'échec d'une tentative : les transactions restent alors en file d'attente).
+
+        :return: None
+        """
+        with self._condition:
+            echecs = self._echecs
+            self._presse = True
+            self._condition.notify_all()
+            self._condition.wait_for(lambda: not self._ecriture_en_cours and not self._a_ecrire()
+                                     or self._echecs > echecs or not self._thread.is_alive())
+            self._presse = False
+
+    def compacter(self, compacter_tout=False):
+        """
+        Replie les journaux trop longs dans les instantanés (à appeler dans le thread Tk).
+
+        :param compacter_tout: (bool) True pour replier les deux journaux quelle que soit leur longueur
+        :return: None
+        """
+        if compacter_tout or compaction_necessaire(self.fichier_bibliotheque):
+            self.attendre()
+            sauvegarder_bibliotheque(self.livres, self.fichier_bibliotheque, compacter=True)
+            if not est_base_sqlite(self.fichier_bibliotheque):
+                # L'instantané contient tous les livres en mémoire : les livres restés en attente
+                # (après une écriture qui a échoué) n'ont plus à être ajoutés au journal
+                with self._condition:
+                    self._livres_en_attente.clear()
+        if compacter_tout or compaction_necessaire(self.fichier_emprunt):
+            self.attendre()
+            if est_base_sqlite(self.fichier_emprunt):
+                # Chaque transaction a déjà mis à jour ses lignes : seul le journal WAL est replié
+                replier_wal_sqlite(self.fichier_emprunt)
+            else:
+                sauvegarder_emprunts(self.personnes, self.fichier_emprunt)
+                with self._condition:
+                    self._personnes_en_attente.clear()
+
+    def arreter(self):
+        """
+        Écrit les transactions en attente puis arrête le thread de sauvegarde.
+
+        :return: None
+        """
+        with self._condition:
+            self._arret = True
+            self._condition.notify_all()
+        self._thread.join()
+        for fichier in (self.fichier_bibliotheque, self.fichier_emprunt):
+            if _persistances.get(fichier) is self:
+                del _persistances[fichier]
+
+    def _a_ecrire(self):
+        return bool(self._livres_en_attente or self._personnes_en_attente)
+
+    def _boucle(self):
+        """Attend des transactions, laisse le temps aux suivantes d'arriver puis les écrit ensemble."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._a_ecrire() or self._arret)
+                if not self._a_ecrire():
+                    return
+                self._condition.wait_for(lambda: self._presse or self._arret, timeout=self.delai)
+                livres, self._livres_en_attente = self._livres_en_attente, {}
+                personnes, self._personnes_en_attente = self._personnes_en_attente, {}
+                self._ecriture_en_cours = True
+            reussi = False
+            try:
+                reussi = self._ecrire(livres, personnes)
+            finally:
+                with self._condition:
+                    self._ecriture_en_cours = False
+                    if not reussi:
+                        self._echecs += 1
+                    self._condition.notify_all()
+            if not reussi:
+                with self._condition:
+                    if self._arret:
+                        print(f"Sauvegarde interrompue : {len(self._livres_en_attente)} livre(s) et "
+                              f"{len(self._personnes_en_attente)} personne(s) non écrits !")
+                        return
+                    self._condition.wait_for(lambda: self._presse or self._arret, timeout=DELAI_REPRISE)
+
+    def _ecrire(self, livres, personnes):
+        """
+        En cas d'erreur, les transactions non écrites sont remises en file d'attente (le thread continue).
+
+        :param livres: (dict) titre -> informations du livre (None si le livre a été supprimé)
+        :param personnes: (dict) id(personne) -> (clé d'origine, copie de la personne)
+        :return: (bool) True si tout a été écrit
+        """
+        try:
+            ecrire_journal_livres(livres, self.fichier_bibliotheque)
+            livres = {}
+            # Les personnes écrites sont retirées du lot une à une : une personne renommée ne doit pas
+            # être écrite deux fois sous son ancienne clé
+            for ident in list(personnes):
+                cle, personne = personnes[ident]
+                ecrire_journal_personne(personne, self.fichier_emprunt, cle)
+                del personnes[ident]
+        except Exception as e:  # OSError, sqlite3.Error (base verrouillée)... : le thread ne doit pas s'arrêter
+            print(f"Erreur lors de la sauvegarde en arrière-plan : {e}")
+            self._remettre_en_attente(livres, personnes)
+            return False
+        return True
+
+    def _remettre_en_attente(self, livres, personnes):
+        """
+        Remet en file d'attente des transactions non écrites, sans écraser les transactions plus récentes.
+
+        :param livres: (dict) titre -> informations du livre (None si le livre a été supprimé)
+        :param personnes: (dict) id(personne) -> (clé d'origine, copie de la personne)
+        :return: None
+        """
+        with self._condition:
+            self._livres_en_attente = {**livres, **self._livres_en_attente}
+            for ident, (cle, personne) in personnes.items():
+                if ident in self._personnes_en_attente:
+                    # Transaction plus récente : c'est toujours sous la clé du lot qu'elle est sur le disque
+                    personne = self._personnes_en_attente[ident][1]
+                self._personnes_en_attente[ident] = (cle, personne)
+
+
+def demarrer_persistance(livres, fichier_bibliotheque, personnes, fichier_emprunt, delai=DELAI_REGROUPEMENT):
+    """
+    :param livres: (dict) le catalogue des livres
+    :param fichier_bibliotheque: (str) le chemin vers le fichier bibliotheque.json
+    :param personnes: (list) Liste de dictionnaires contenant toutes les personnes
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :param delai: (float) Nombre de secondes pendant lesquelles les transactions sont regroupées
+    :return: (PersistanceDifferee) la sauvegarde différée utilisée désormais pour ces deux fichiers
+    """
+    persistance = PersistanceDifferee(livres, fichier_bibliotheque, personnes, fichier_emprunt, delai)
+    _persistances[fichier_bibliotheque] = persistance
+    _persistances[fichier_emprunt] = persistance
+    return persistance
+
+
+def persistance_active(fichier):
+    """
+    :param fichier: (str) Chemin vers un fichier de données
+    :return: (PersistanceDifferee) la sauvegarde différée de ce fichier, None s'il n'y en a pas
+    """
+    return _persistances.get(fichier)
+
+
+def sauvegarder_livres(livres, fichier_bibliotheque):
+    """
+    Sauvegarde les livres modifiés : en arrière-plan si une sauvegarde différée est active, sinon immédiatement.
+
+    :param livres: (dict) le catalogue des livres
+    :param fichier_bibliotheque: (str) le chemin vers le fichier bibliotheque.json
+    :return: None
+    """
+    persistance = persistance_active(fichier_bibliotheque)
+    if persistance is None:
+        sauvegarder_bibliotheque(livres, fichier_bibliotheque)
+        return
+    persistance.enregistrer_livres()
+    persistance.compacter()
+
+
+def sauvegarder_personne(personnes, personne, fichier_emprunt, cle=None):
+    """
+    Sauvegarde une personne : en arrière-plan si une sauvegarde différée est active, sinon immédiatement.
+
+    :param personnes: (list) Liste de dictionnaires contenant toutes les personnes
+    :param personne: (dict) la personne qui vient d'emprunter, de rendre ou d'être modifiée
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :param cle: (tuple) (nom, prénom) de la personne avant modification, si elle a été renommée
+    :return: None
+    """
+    persistance = persistance_active(fichier_emprunt)
+    if persistance is None:
+        journaliser_personne(personnes, personne, fichier_emprunt, cle)
+        return
+    persistance.enregistrer_personne(personne, cle)
+    persistance.compacter()
+
+
+def arreter_persistances():
+    """
+    Écrit toutes les transactions en attente et arrête les threads de sauvegarde (à appeler avant de quitter).
+
+    :return: None
+    """
+    for persistance in set(_persistances.values()):
+        persistance.arreter()
+
+
+# Le thread de sauvegarde est un thread "daemon" : les transactions en attente sont écrites avant
+# la fin de l'interpréteur, quelle que soit la façon dont le programme se termine
+atexit.register(arreter_persistances)
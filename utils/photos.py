@@ -0,0 +1,313 @@
+"""
+    Module photos : import et miniatures des photos des emprunteurs
+
+    À l'import, les photos sont normalisées (JPEG de taille bornée, orientation appliquée, sans métadonnées),
+    hors du thread Tk ; une image illisible est signalée au lieu d'interrompre l'interface.
+    Les photos enregistrées (data/photos) ne sont ensuite décodées qu'une seule fois, pour générer des
+    miniatures (data/photos/.miniatures) dont le nom contient la date de modification de l'original et la
+    taille voulue. Les images Tk issues des miniatures sont gardées en mémoire (LRU).
+    Les décodages JPEG utilisent le mode "draft" de PIL, qui décode directement à une résolution réduite.
+    Les décodages réalisés pour l'affichage ont lieu dans un pool de threads : l'interface reste réactive
+    et affiche un texte d'attente jusqu'à ce que l'image soit prête.
+
+    Fonctions :
+        • ouvrir_reduite
+        • importer_photo
+        • importer_photo_en_arriere_plan
+        • chemin_miniature
+        • creer_miniature
+        • generer_miniatures
+        • supprimer_miniatures
+        • executer_en_arriere_plan
+        • charger_photo
+        • apercu_photo
+        • afficher_photo_dans
+        • afficher_apercu_dans
+"""
+import glob
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps, ImageTk, UnidentifiedImageError
+
+DOSSIER_PHOTOS = "data/photos"
+DOSSIER_MINIATURES = os.path.join(DOSSIER_PHOTOS, ".miniatures")
+
+# Tailles affichées par l'interface (fiche emprunteur, formulaires)
+TAILLE_FICHE = (180, 180)
+TAILLE_FORMULAIRE = (150, 150)
+TAILLES_MINIATURES = (TAILLE_FICHE, TAILLE_FORMULAIRE)
+
+# Taille maximale des photos enregistrées et qualité JPEG utilisée
+TAILLE_MAX_PHOTO = (800, 800)
+QUALITE_JPEG = 85
+
+# Nombre d'images Tk gardées en mémoire
+TAILLE_CACHE_IMAGES = 64
+
+# Chemin de miniature -> ImageTk.PhotoImage, de la moins récemment utilisée à la plus récente
+# (uniquement manipulé depuis le thread Tk)
+_images_tk = OrderedDict()
+
+# Threads chargés de décoder et redimensionner les images hors du thread Tk
+_executeur = ThreadPoolExecutor(max_workers=2, thread_name_prefix="photos")
+
+
+def ouvrir_reduite(chemin, taille):
+    """
+    Ouvre une image en ne décodant (pour un JPEG) que la résolution nécessaire pour obtenir "taille".
+
+    :param chemin: Chaîne représentant le chemin du fichier image
+    :param taille: Tuple (largeur, hauteur) minimale voulue
+    :return: Image PIL chargée, orientée selon ses données EXIF et convertie en RGB
+    """
+    with Image.open(chemin) as img:
+        img.draft("RGB", taille)
+        return ImageOps.exif_transpose(img).convert("RGB")
+
+
+def importer_photo(chemin_source, chemin_destination):
+    """
+    Enregistre une photo choisie par l'utilisateur sous forme de JPEG de taille bornée, sans métadonnées.
+
+    :param chemin_source: Chaîne représentant le chemin du fichier image choisi
+    :param chemin_destination: Chaîne représentant le chemin du fichier JPEG à créer
+    :return: Aucun
+    """
+    img = ouvrir_reduite(chemin_source, TAILLE_MAX_PHOTO)
+    img.thumbnail(TAILLE_MAX_PHOTO, Image.Resampling.LANCZOS, reducing_gap=3.0)
+    # Aucune donnée EXIF/ICC n'est transmise : les métadonnées de l'original ne sont pas conservées.
+    # Écrite à côté puis renommée : une erreur d'écriture ne laisse pas de photo tronquée
+    chemin_temporaire = f"{chemin_destination}.{threading.get_ident()}.tmp"
+    try:
+        img.save(chemin_temporaire, "JPEG", quality=QUALITE_JPEG, optimize=True)
+        os.replace(chemin_temporaire, chemin_destination)
+    except OSError:
+        if os.path.exists(chemin_temporaire):
+            os.remove(chemin_temporaire)
+        raise
+
+
+def chemin_miniature(photo_id, taille):
+    """
+    :param photo_id: Chaîne représentant le nom du fichier photo
+    :param taille: Tuple (largeur, hauteur) de la miniature
+    :return: Chaîne représentant le chemin de la miniature, None si la photo originale n'existe pas
+    """
+    chemin_photo = os.path.join(DOSSIER_PHOTOS, photo_id)
+    try:
+        mtime = os.stat(chemin_photo).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    nom = os.path.splitext(photo_id)[0]
+    return os.path.join(DOSSIER_MINIATURES, f"{nom}_{mtime}_{taille[0]}x{taille[1]}.jpg")
+
+
+def creer_miniature(photo_id, taille):
+    """
+    Génère la miniature si elle n'existe pas encore (seul moment où la photo originale est décodée).
+
+    :param photo_id: Chaîne représentant le nom du fichier photo
+    :param taille: Tuple (largeur, hauteur) de la miniature
+    :return: Chaîne représentant le chemin de la miniature, None si la photo originale n'existe pas
+    """
+    chemin = chemin_miniature(photo_id, taille)
+    if chemin and not os.path.exists(chemin):
+        os.makedirs(DOSSIER_MINIATURES, exist_ok=True)
+        img = ouvrir_reduite(os.path.join(DOSSIER_PHOTOS, photo_id), taille)
+        miniature = img.resize(taille, Image.Resampling.LANCZOS, reducing_gap=3.0)
+        chemin_temporaire = f"{chemin}.{threading.get_ident()}.tmp"
+        miniature.save(chemin_temporaire, "JPEG", quality=90)
+        os.replace(chemin_temporaire, chemin)
+    return chemin
+
+
+def generer_miniatures(photo_id):
+    """
+    :param photo_id: Chaîne représentant le nom du fichier photo qui vient d'être importé
+    :return: Aucun, génère les miniatures de toutes les tailles utilisées par l'interface
+    """
+    for taille in TAILLES_MINIATURES:
+        creer_miniature(photo_id, taille)
+
+
+def supprimer_miniatures(photo_id):
+    """
+    :param photo_id: Chaîne représentant le nom d'un fichier photo supprimé ou renommé
+    :return: Aucun, supprime toutes les miniatures de cette photo
+    """
+    nom = os.path.splitext(photo_id)[0]
+    for chemin in glob.glob(os.path.join(glob.escape(DOSSIER_MINIATURES), f"{glob.escape(nom)}_*")):
+        os.remove(chemin)
+
+
+def _memoriser(chemin, photo_image):
+    """
+    :param chemin: Chaîne représentant le chemin d'une miniature (qui identifie photo, version et taille)
+    :param photo_image: ImageTk.PhotoImage de cette miniature
+    :return: ImageTk.PhotoImage mémorisée (les moins récemment utilisées sont oubliées)
+    """
+    _images_tk[chemin] = photo_image
+    _images_tk.move_to_end(chemin)
+    while len(_images_tk) > TAILLE_CACHE_IMAGES:
+        _images_tk.popitem(last=False)
+    return photo_image
+
+
+def executer_en_arriere_plan(widget, travail, rappel, intervalle=30):
+    """
+    Exécute "travail" dans le pool de threads puis appelle "rappel" avec son résultat dans la boucle Tk
+    (le widget vérifie périodiquement, via after, si le travail est terminé).
+
+    :param widget: Widget Tk qui attend le résultat (rien n'est fait s'il est détruit entre-temps)
+    :param travail: Fonction sans paramètre exécutée hors du thread Tk (ne doit pas toucher aux widgets)
+    :param rappel: Fonction appelée dans le thread Tk avec le résultat (None si le travail a échoué)
+    :param intervalle: Nombre de millisecondes entre deux vérifications
+    :return: Aucun
+    """
+    future = _executeur.submit(travail)
+
+    def verifier():
+        """Transmet le résultat au rappel dès que le travail est terminé."""
+        if not widget.winfo_exists():
+            return
+        if not future.done():
+            widget.after(intervalle, verifier)
+            return
+        try:
+            resultat = future.result()
+        except Exception:
+            # OSError, mais aussi ValueError, SyntaxError, DecompressionBombError... levées par les décodeurs de
+            # PIL : le rappel est toujours appelé, sinon le texte d'attente resterait affiché
+            resultat = None
+        rappel(resultat)
+
+    widget.after(intervalle, verifier)
+
+
+def importer_photo_en_arriere_plan(widget, chemin_source, photo_id, rappel):
+    """
+    Enregistre une photo choisie par l'utilisateur (voir importer_photo) puis génère ses miniatures,
+    sans bloquer l'interface.
+
+    :param widget: Widget Tk qui attend la fin de l'import
+    :param chemin_source: Chaîne représentant le chemin du fichier image choisi
+    :param photo_id: Chaîne représentant le nom du fichier photo à créer dans DOSSIER_PHOTOS
+    :param rappel: Fonction appelée dans le thread Tk avec le message d'erreur (chaîne vide si la photo
+                   a été enregistrée)
+    :return: Aucun
+    """
+    def travail():
+        """Normalise la photo puis génère ses miniatures (hors du thread Tk)."""
+        try:
+            os.makedirs(DOSSIER_PHOTOS, exist_ok=True)
+            importer_photo(chemin_source, os.path.join(DOSSIER_PHOTOS, photo_id))
+        except UnidentifiedImageError:
+            return f"Le fichier {os.path.basename(chemin_source)} n'est pas une image reconnue !"
+        except OSError as e:
+            return f"Impossible d'importer la photo {os.path.basename(chemin_source)} : {e.strerror or e}"
+        try:
+            # Décoder la photo une seule fois, à l'import, pour toutes les tailles affichées par l'interface
+            generer_miniatures(photo_id)
+        except OSError:
+            pass  # Les miniatures manquantes sont générées lors du premier affichage
+        return ""
+
+    def terminer(erreur):
+        """Transmet le message d'erreur (None : autre erreur du décodeur, ex : image trop grande)."""
+        if erreur is None:
+            erreur = f"Impossible d'importer la photo {os.path.basename(chemin_source)} !"
+        rappel(erreur)
+
+    executer_en_arriere_plan(widget, travail, terminer)
+
+
+def charger_photo(widget, photo_id, taille, rappel):
+    """
+    Charge la miniature d'une photo enregistrée sans bloquer l'interface.
+
+    :param widget: Widget Tk qui affichera la photo
+    :param photo_id: Chaîne représentant le nom du fichier photo
+    :param taille: Tuple (largeur, hauteur) de l'image voulue
+    :param rappel: Fonction appelée avec l'ImageTk.PhotoImage (None si la photo n'existe pas)
+    :return: Aucun
+    """
+    chemin = chemin_miniature(photo_id, taille)
+    if chemin is None:
+        rappel(None)
+        return
+    if chemin in _images_tk:
+        _images_tk.move_to_end(chemin)
+        rappel(_images_tk[chemin])
+        return
+
+    def travail():
+        """Génère si besoin la miniature puis la décode (hors du thread Tk)."""
+        creer_miniature(photo_id, taille)
+        with Image.open(chemin) as img:
+            img.load()
+            return img.copy()
+
+    def terminer(img):
+        """Crée l'image Tk (dans le thread Tk) et la transmet au rappel."""
+        rappel(_memoriser(chemin, ImageTk.PhotoImage(img)) if img else None)
+
+    executer_en_arriere_plan(widget, travail, terminer)
+
+
+def apercu_photo(widget, chemin, taille, rappel):
+    """
+    Prépare l'aperçu d'une image choisie par l'utilisateur sans bloquer l'interface.
+
+    :param widget: Widget Tk qui affichera l'aperçu
+    :param chemin: Chaîne représentant le chemin du fichier image choisi
+    :param taille: Tuple (largeur, hauteur) de l'aperçu
+    :param rappel: Fonction appelée avec l'ImageTk.PhotoImage (None si l'image est illisible)
+    :return: Aucun
+    """
+    def travail():
+        """Décode l'image à résolution réduite puis la redimensionne (hors du thread Tk)."""
+        return ouvrir_reduite(chemin, taille).resize(taille, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+    executer_en_arriere_plan(widget, travail, lambda img: rappel(ImageTk.PhotoImage(img) if img else None))
+
+
+def _rappel_label(label, message_erreur):
+    """
+    :param label: Label Tk qui doit afficher une image
+    :param message_erreur: Chaîne affichée si l'image n'a pas pu être chargée
+    :return: Fonction qui affiche dans le label l'image qu'on lui transmet
+    """
+    def afficher(photo_image):
+        """Affiche l'image (en gardant une référence pour le garbage collector) ou le message d'erreur."""
+        if photo_image:
+            label.config(image=photo_image, text="")
+            label.image = photo_image  # Garder la référence
+        else:
+            label.config(text=message_erreur)
+    return afficher
+
+
+def afficher_photo_dans(label, photo_id, taille):
+    """
+    :param label: Label Tk qui doit afficher la photo d'un emprunteur
+    :param photo_id: Chaîne représentant le nom du fichier photo
+    :param taille: Tuple (largeur, hauteur) de l'image voulue
+    :return: Aucun, affiche un texte d'attente puis la photo dès qu'elle est prête
+    """
+    label.config(text="Chargement de la photo...")
+    charger_photo(label, photo_id, taille, _rappel_label(label, "Photo non trouvée"))
+
+
+def afficher_apercu_dans(label, chemin, taille):
+    """
+    :param label: Label Tk qui doit afficher l'aperçu d'une image choisie par l'utilisateur
+    :param chemin: Chaîne représentant le chemin du fichier image choisi
+    :param taille: Tuple (largeur, hauteur) de l'aperçu
+    :return: Aucun, affiche un texte d'attente puis l'aperçu dès qu'il est prêt
+    """
+    label.config(image="", text="Chargement de l'aperçu...")
+    apercu_photo(label, chemin, taille, _rappel_label(label, "Image illisible"))
+
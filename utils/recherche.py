@@ -0,0 +1,358 @@
+"""
+    Module recherche : index pour la recherche de livres (par titre, auteur ou genre)
+
+    • IndexInverse : chaque champ est découpé en mots normalisés (sans accents ni distinction de casse,
+      de sorte que "Tolstoi" trouve "Tolstoï") ; l'index associe chaque mot aux titres qui le contiennent.
+    • IndexTrigrammes : l'index associe chaque suite de trois caractères aux titres qui la contiennent,
+      pour retrouver une sous-chaîne quelconque ou un titre mal orthographié.
+    • IndexPrefixes : liste triée des titres normalisés, pour compléter un début de titre (autocomplétion).
+
+    Les index sont mis à jour livre par livre : le coût d'une recherche ne dépend pas de la taille du catalogue.
+"""
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+from bisect import insort
+
+CHAMPS_RECHERCHE = ("Titre", "Auteur", "Genre")
+
+MOT = re.compile(r"\w+")
+
+# Poids d'un mot trouvé dans chaque champ pour le classement des résultats
+POIDS_CHAMPS = {"Titre": 3, "Auteur": 2, "Genre": 1}
+
+
+def normaliser_texte(texte):
+    """
+    :param texte: (str) un texte quelconque
+    :return: (str) le texte sans accents et sans distinction de casse
+    """
+    texte = str(texte)
+    if texte.isascii():
+        return texte.casefold()
+    decompose = unicodedata.normalize("NFKD", texte)
+    return "".join(c for c in decompose if not unicodedata.combining(c)).casefold()
+
+
+def tokeniser(texte):
+    """
+    :param texte: (str) un texte quelconque
+    :return: (list) les mots normalisés du texte
+    """
+    return MOT.findall(normaliser_texte(texte))
+
+
+def valeur_champ(titre, livre, champ):
+    """
+    :param titre: (str) le titre du livre
+    :param livre: (dict) les informations du livre
+    :param champ: (str) Titre, Auteur ou Genre
+    :return: (str) la valeur du champ pour ce livre
+    """
+    return titre if champ == "Titre" else str(livre.get(champ, ""))
+
+
+class IndexInverse:
+    """Index mot -> titres, par champ, mis à jour incrémentalement à chaque ajout, modification ou suppression."""
+
+    def __init__(self, livres=None):
+        # Champ -> mot -> ensemble des titres contenant ce mot dans ce champ
+        self._postings = {champ: {} for champ in CHAMPS_RECHERCHE}
+        # Titre -> champ -> mots indexés (pour pouvoir retirer un livre)
+        self._mots_livres = {}
+        # Liste triée de tous les mots (recherche par préfixe), recalculée à la demande
+        self._vocabulaire = None
+        for titre, livre in (livres or {}).items():
+            self.ajouter(titre, livre)
+
+    def ajouter(self, titre, livre):
+        """
+        Indexe (ou réindexe) un livre.
+
+        :param titre: (str) le titre du livre
+        :param livre: (dict) les informations du livre
+        :return: None
+        """
+        mots_livre = {champ: set(tokeniser(valeur_champ(titre, livre, champ))) for champ in CHAMPS_RECHERCHE}
+        if self._mots_livres.get(titre) == mots_livre:
+            # Ex : seul le nombre d'exemplaires a changé
+            return
+        self.retirer(titre)
+        for champ, mots in mots_livre.items():
+            postings = self._postings[champ]
+            for mot in mots:
+                titres = postings.get(mot)
+                if titres is None:
+                    titres = postings[mot] = set()
+                    self._vocabulaire = None
+                titres.add(titre)
+        self._mots_livres[titre] = mots_livre
+
+    def retirer(self, titre):
+        """
+        :param titre: (str) le titre du livre à retirer de l'index
+        :return: None
+        """
+        mots_livre = self._mots_livres.pop(titre, None)
+        if mots_livre is None:
+            return
+        for champ, mots in mots_livre.items():
+            for mot in mots:
+                titres = self._postings[champ][mot]
+                titres.discard(titre)
+                if not titres:
+                    del self._postings[champ][mot]
+                    self._vocabulaire = None
+
+    def _mots_commencant_par(self, prefixe):
+        """
+        :param prefixe: (str) un début de mot normalisé
+        :return: (list) les mots de l'index qui commencent par ce préfixe
+        """
+        if self._vocabulaire is None:
+            self._vocabulaire = sorted(set().union(*self._postings.values()))
+        mots = []
+        position = bisect_left(self._vocabulaire, prefixe)
+        while position < len(self._vocabulaire) and self._vocabulaire[position].startswith(prefixe):
+            mots.append(self._vocabulaire[position])
+            position += 1
+        return mots
+
+    def rechercher(self, requete, champ=None, parmi=None):
+        """
+        Tous les mots de la requête doivent être trouvés (le dernier peut n'être qu'un début de mot).
+        Les livres sont classés selon les champs dans lesquels les mots ont été trouvés (titre > auteur > genre)
+        et selon que les mots sont complets ou non.
+
+        :param requete: (str) les mots recherchés
+        :param champ: (str) Titre, Auteur ou Genre pour restreindre la recherche, None pour tous les champs
+        :param parmi: (iterable) titres auxquels restreindre la recherche (ex : résultats d'une requête plus courte),
+                      None pour tout le catalogue
+        :return: (list) les titres trouvés, du plus pertinent au moins pertinent
+        """
+        mots = tokeniser(requete)
+        if not mots:
+            return list(self._mots_livres if parmi is None else parmi)
+        champs = (champ,) if champ else CHAMPS_RECHERCHE
+        if parmi is not None:
+            parmi = set(parmi)
+
+        scores = None
+        for i, mot in enumerate(mots):
+            variantes = self._mots_commencant_par(mot) if i == len(mots) - 1 else [mot]
+            scores_mot = {}
+            for c in champs:
+                for variante in variantes:
+                    score = POIDS_CHAMPS[c] * (2 if variante == mot else 1)
+                    titres = self._postings[c].get(variante, set())
+                    if parmi is not None:
+                        # Intersection calculée en C : seuls les titres restants sont parcourus ensuite
+                        titres = titres & parmi
+                    for titre in titres:
+                        if score > scores_mot.get(titre, 0):
+                            scores_mot[titre] = score
+            if scores is None:
+                scores = scores_mot
+            else:
+                scores = {titre: score + scores_mot[titre] for titre, score in scores.items() if titre in scores_mot}
+            if not scores:
+                return []
+
+        return sorted(scores, key=lambda titre: (-scores[titre], titre))
+
+
+def trigrammes(texte):
+    """
+    :param texte: (str) un texte normalisé
+    :return: (set) les suites de trois caractères consécutifs du texte
+    """
+    return {texte[i:i + 3] for i in range(len(texte) - 2)}
+
+
+def distance_edition(a, b):
+    """
+    :param a: (str) un premier texte
+    :param b: (str) un second texte
+    :return: (int) le nombre minimal d'insertions, suppressions ou substitutions pour passer de a à b
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    precedente = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        courante = [i]
+        for j, cb in enumerate(b, 1):
+            courante.append(min(precedente[j] + 1, courante[j - 1] + 1, precedente[j - 1] + (ca != cb)))
+        precedente = courante
+    return precedente[-1]
+
+
+def distance_meilleure_portion(terme, texte):
+    """
+    :param terme: (str) le texte saisi, normalisé (ex : "melvile")
+    :param texte: (str) le texte d'un champ, normalisé (ex : "herman melville")
+    :return: (int) la distance d'édition entre le terme et le texte entier ou la suite de mots du texte
+             (de même longueur que le terme) qui lui ressemble le plus
+    """
+    mots_texte = texte.split()
+    nbr_mots = len(terme.split())
+    portions = [" ".join(mots_texte[i:i + nbr_mots]) for i in range(len(mots_texte) - nbr_mots + 1)]
+    return min(distance_edition(terme, portion) for portion in [texte] + portions)
+
+
+class IndexTrigrammes:
+    """
+    Index trigramme -> titres, par champ, pour la recherche de sous-chaînes ("term in champ")
+    et la recherche approchée de titres mal orthographiés.
+    """
+
+    def __init__(self, livres=None):
+        # Champ -> trigramme -> ensemble des titres dont le champ contient ce trigramme
+        self._postings = {champ: {} for champ in CHAMPS_RECHERCHE}
+        # Titre -> champ -> texte normalisé (pour vérifier les candidats et pouvoir retirer un livre)
+        self._textes = {}
+        for titre, livre in (livres or {}).items():
+            self.ajouter(titre, livre)
+
+    def ajouter(self, titre, livre):
+        """
+        Indexe (ou réindexe) un livre.
+
+        :param titre: (str) le titre du livre
+        :param livre: (dict) les informations du livre
+        :return: None
+        """
+        textes = {champ: normaliser_texte(valeur_champ(titre, livre, champ)) for champ in CHAMPS_RECHERCHE}
+        if self._textes.get(titre) == textes:
+            return
+        self.retirer(titre)
+        for champ, texte in textes.items():
+            postings = self._postings[champ]
+            # Espaces autour du texte : les débuts et fins de texte comptent pour la recherche approchée
+            for trigramme in trigrammes(f"  {texte} "):
+                titres = postings.get(trigramme)
+                if titres is None:
+                    titres = postings[trigramme] = set()
+                titres.add(titre)
+        self._textes[titre] = textes
+
+    def retirer(self, titre):
+        """
+        :param titre: (str) le titre du livre à retirer de l'index
+        :return: None
+        """
+        textes = self._textes.pop(titre, None)
+        if textes is None:
+            return
+        for champ, texte in textes.items():
+            postings = self._postings[champ]
+            for trigramme in trigrammes(f"  {texte} "):
+                titres = postings[trigramme]
+                titres.discard(titre)
+                if not titres:
+                    del postings[trigramme]
+
+    def rechercher_sous_chaine(self, terme, champ=None, parmi=None):
+        """
+        :param terme: (str) le texte recherché (sans tenir compte des accents ni de la casse)
+        :param champ: (str) Titre, Auteur ou Genre pour restreindre la recherche, None pour tous les champs
+        :param parmi: (iterable) titres auxquels restreindre la recherche, None pour tout le catalogue
+        :return: (list) les titres dont un des champs contient le texte recherché (ordre alphabétique)
+        """
+        terme = normaliser_texte(terme.strip())
+        champs = (champ,) if champ else CHAMPS_RECHERCHE
+        if parmi is not None:
+            parmi = [titre for titre in parmi if titre in self._textes]
+        trouves = set()
+        for c in champs:
+            postings = self._postings[c]
+            if len(terme) < 3:
+                # Terme trop court pour avoir des trigrammes : on parcourt les textes déjà normalisés
+                candidats = self._textes if parmi is None else parmi
+            else:
+                listes = [postings.get(t, set()) for t in trigrammes(terme)]
+                if parmi is not None:
+                    listes.append(set(parmi))
+                candidats = set.intersection(*sorted(listes, key=len))
+            trouves.update(titre for titre in candidats if terme in self._textes[titre][c])
+        return sorted(trouves)
+
+    def rechercher_approchant(self, terme, champ="Titre", limite=5, nbr_candidats=50):
+        """
+        Recherche tolérante aux fautes de frappe : les livres ayant le plus de trigrammes en commun avec le terme
+        sont départagés par distance d'édition.
+
+        :param terme: (str) le texte saisi (éventuellement mal orthographié)
+        :param champ: (str) Titre, Auteur ou Genre
+        :param limite: (int) le nombre maximal de titres retournés
+        :param nbr_candidats: (int) le nombre de candidats dont la distance d'édition est calculée
+        :return: (list) les titres les plus proches, du plus proche au moins proche
+        """
+        terme = normaliser_texte(terme.strip())
+        if not terme:
+            return []
+        postings = self._postings[champ]
+        communs = {}
+        for trigramme in trigrammes(f"  {terme} "):
+            for titre in postings.get(trigramme, ()):
+                communs[titre] = communs.get(titre, 0) + 1
+        candidats = heapq.nlargest(nbr_candidats, communs, key=communs.get)
+        distance_max = max(2, len(terme) // 3)
+        distances = {titre: distance_meilleure_portion(terme, self._textes[titre][champ]) for titre in candidats}
+        proches = [titre for titre in candidats if distances[titre] <= distance_max]
+        return sorted(proches, key=lambda titre: (distances[titre], titre))[:limite]
+
+
+class IndexPrefixes:
+    """Liste triée de couples (titre normalisé, titre) : un début de titre se complète par dichotomie."""
+
+    def __init__(self, livres=None):
+        self._titres = sorted((normaliser_texte(titre).strip(), titre) for titre in (livres or {}))
+        # Titre -> titre normalisé (pour pouvoir retirer un livre)
+        self._cles = {titre: cle for cle, titre in self._titres}
+
+    def ajouter(self, titre, livre):
+        """
+        :param titre: (str) le titre du livre
+        :param livre: (dict) les informations du livre (seul le titre est indexé)
+        :return: None
+        """
+        if titre not in self._cles:
+            cle = normaliser_texte(titre).strip()
+            insort(self._titres, (cle, titre))
+            self._cles[titre] = cle
+
+    def retirer(self, titre):
+        """
+        :param titre: (str) le titre du livre à retirer de l'index
+        :return: None
+        """
+        cle = self._cles.pop(titre, None)
+        if cle is not None:
+            del self._titres[bisect_left(self._titres, (cle, titre))]
+
+    def completer(self, debut, limite=10):
+        """
+        :param debut: (str) le début de titre saisi (sans tenir compte des accents ni de la casse)
+        :param limite: (int) le nombre maximal de titres retournés
+        :return: (list) les titres commençant par ce texte, dans l'ordre alphabétique
+        """
+        prefixe = normaliser_texte(debut).lstrip()
+        titres = []
+        position = bisect_left(self._titres, (prefixe,))
+        while (len(titres) < limite and position < len(self._titres)
+               and self._titres[position][0].startswith(prefixe)):
+            titres.append(self._titres[position][1])
+            position += 1
+        return titres
+
+    def trouver(self, titre):
+        """
+        :param titre: (str) un titre complet (sans tenir compte des accents ni de la casse)
+        :return: (str) le titre exact tel qu'enregistré, None s'il n'existe pas
+        """
+        cle = normaliser_texte(titre).strip()
+        position = bisect_left(self._titres, (cle,))
+        if position < len(self._titres) and self._titres[position][0] == cle:
+            return self._titres[position][1]
+        return None
@@ -0,0 +1,189 @@
+"""
+    Module registre : liste des emprunteurs indexée par (nom, prénom)
+
+    Le registre se comporte comme la liste "personnes" habituelle, mais maintient un index
+    (nom, prénom) normalisés -> personne pour retrouver un emprunteur sans parcourir toute la liste.
+    Toutes les méthodes de liste qui ajoutent, remplacent ou retirent des personnes tiennent cet index à jour.
+
+    Lorsque emprunt.csv est lu sans historique (voir gestion_fichiers.lire_emprunts), les emprunts clos
+    restent dans le fichier : le registre retient seulement, pour chaque personne concernée, sous quel nom
+    elle y est enregistrée et le plus grand numéro d'emprunt non chargé (pour ne pas réutiliser un numéro).
+
+    L'index des retards (emprunts en cours par date de retour prévue) est construit au premier appel à retards().
+    Les statistiques des emprunts (voir statistiques.statistiques_emprunts) sont attachées au registre lors de
+    leur premier calcul ; comme l'index des retards, elles sont ensuite tenues à jour par noter_emprunt,
+    noter_retour et renommer.
+"""
+from utils.retards import IndexRetards
+
+
+def cle_personne(nom, prenom):
+    """
+    :param nom: (str) le nom de la personne
+    :param prenom: (str) le prénom de la personne
+    :return: (tuple) la clé normalisée (sans espaces superflus ni distinction de casse)
+    """
+    return nom.strip().casefold(), prenom.strip().casefold()
+
+
+class RegistrePersonnes(list):
+    """Liste de personnes (dictionnaires) accompagnée d'un index par (nom, prénom) normalisés."""
+
+    def __init__(self, personnes=()):
+        super().__init__(personnes)
+        # id(personne) -> [(nom, prénom) dans emprunt.csv, plus grand numéro d'emprunt non chargé]
+        self.emprunts_non_charges = {}
+        self._retards = None
+        # StatistiquesEmprunts, attachées par statistiques_emprunts lors de leur premier calcul
+        self.statistiques = None
+        self._index = {}
+        for personne in self:
+            self._indexer(personne)
+
+    def _indexer(self, personne):
+        self._index.setdefault(cle_personne(personne["nom"], personne["prenom"]), personne)
+
+    def _desindexer(self, personne):
+        cle = cle_personne(personne["nom"], personne["prenom"])
+        if self._index.get(cle) is personne:
+            del self._index[cle]
+
+    def _oublier(self, personne):
+        """
+        Retire de l'index, des emprunts non chargés et de l'index des retards une personne sortie du registre.
+
+        :param personne: (dict) la personne retirée
+        :return: None
+        """
+        self._desindexer(personne)
+        # id(personne) pourrait être réutilisé par une nouvelle personne
+        self.emprunts_non_charges.pop(id(personne), None)
+        # Reconstruit au prochain appel à retards(), sans les emprunts de la personne retirée
+        self._retards = None
+
+    def append(self, personne):
+        super().append(personne)
+        self._indexer(personne)
+
+    def extend(self, personnes):
+        for personne in personnes:
+            self.append(personne)
+
+    def __iadd__(self, personnes):
+        self.extend(personnes)
+        return self
+
+    def insert(self, position, personne):
+        super().insert(position, personne)
+        self._indexer(personne)
+
+    def __setitem__(self, position, personne):
+        if isinstance(position, slice):
+            personnes = list(personne)
+            for ancienne in self[position]:
+                self._oublier(ancienne)
+            super().__setitem__(position, personnes)
+            for nouvelle in personnes:
+                self._indexer(nouvelle)
+            return
+        self._oublier(self[position])
+        super().__setitem__(position, personne)
+        self._indexer(personne)
+
+    def __delitem__(self, position):
+        for personne in (self[position] if isinstance(position, slice) else [self[position]]):
+            self._oublier(personne)
+        super().__delitem__(position)
+
+    def pop(self, position=-1):
+        personne = super().pop(position)
+        self._oublier(personne)
+        return personne
+
+    def remove(self, personne):
+        # list.remove compare les personnes par leur contenu : c'est la personne enregistrée qui est oubliée
+        del self[self.index(personne)]
+
+    def clear(self):
+        super().clear()
+        self._index.clear()
+        self.emprunts_non_charges.clear()
+        self._retards = None
+
+    def trouver(self, nom, prenom):
+        """
+        :param nom: (str) le nom de la personne
+        :param prenom: (str) le prénom de la personne
+        :return: (dict) la personne enregistrée, None si elle n'existe pas
+        """
+        return self._index.get(cle_personne(nom, prenom))
+
+    def renommer(self, personne, nom, prenom):
+        """
+        Change le nom et le prénom d'une personne du registre en gardant l'index à jour.
+
+        :param personne: (dict) la personne à renommer
+        :param nom: (str) le nouveau nom
+        :param prenom: (str) le nouveau prénom
+        :return: None
+        :raise ValueError: si une autre personne du registre porte déjà ce nom et ce prénom
+        """
+        autre = self.trouver(nom, prenom)
+        if autre is not None and autre is not personne:
+            raise ValueError(f"Une personne du nom de {prenom} {nom} existe déjà !")
+        self._desindexer(personne)
+        if self.statistiques is not None:
+            self.statistiques.renommer((personne["nom"], personne["prenom"]), (nom, prenom))
+        personne["nom"] = nom
+        personne["prenom"] = prenom
+        self._indexer(personne)
+
+    def retards(self):
+        """
+        :return: (IndexRetards) l'index des emprunts en cours par date de retour prévue
+        """
+        if self._retards is None:
+            self._retards = IndexRetards(self)
+        return self._retards
+
+    def noter_emprunt(self, personne, emprunt_id):
+        """
+        À appeler après chaque nouvel emprunt, pour tenir l'index des retards et les statistiques à jour.
+
+        :param personne: (dict) la personne qui vient d'emprunter
+        :param emprunt_id: (str) le numéro du nouvel emprunt
+        :return: None
+        """
+        if self._retards is not None:
+            self._retards.ajouter(personne, emprunt_id)
+        if self.statistiques is not None:
+            self.statistiques.noter_emprunt(personne, personne["emprunts"][emprunt_id])
+
+    def noter_retour(self, personne, emprunt_id):
+        """
+        À appeler après chaque retour, pour tenir les statistiques à jour (l'index des retards ignore de lui-même
+        les emprunts rendus).
+
+        :param personne: (dict) la personne qui vient de rendre un livre
+        :param emprunt_id: (str) le numéro de l'emprunt rendu
+        :return: None
+        """
+        if self.statistiques is not None:
+            self.statistiques.noter_retour(personne["emprunts"][emprunt_id])
+
+    def historique_charge(self, personne):
+        """
+        :param personne: (dict) une personne du registre
+        :return: (bool) True si tous les emprunts de la personne sont en mémoire
+        """
+        return id(personne) not in self.emprunts_non_charges
+
+    def prochain_emprunt_id(self, personne):
+        """
+        :param personne: (dict) une personne du registre
+        :return: (str) le numéro à donner au prochain emprunt de la personne
+        """
+        numeros = [int(k) for k in personne["emprunts"]]
+        if not self.historique_charge(personne):
+            numeros.append(self.emprunts_non_charges[id(personne)][1])
+        return str(max(numeros + [0]) + 1)
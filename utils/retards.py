@@ -0,0 +1,116 @@
+"""
+    Module retards : index des emprunts en cours par date de retour prévue
+
+    Les emprunts en cours sont gardés dans une liste triée par date de retour prévue (Emprunt.echeance : date
+    d'emprunt + 14 jours, en nombre de jours depuis l'an 1). Les emprunts en retard à une date donnée forment donc
+    le début de la liste : le rapport des retards ne parcourt ni toutes les personnes ni les emprunts à l'heure.
+
+    Un nouvel emprunt est ajouté à l'index (RegistrePersonnes.noter_emprunt) ; un emprunt rendu n'est pas
+    retiré tout de suite mais ignoré, puis supprimé de l'index, lors de la lecture suivante.
+
+    Fonctions :
+        • IndexRetards (index des emprunts en cours)
+        • total_par_personne
+"""
+import bisect
+import itertools
+from datetime import date
+
+# Durée d'un emprunt gratuit, en jours
+DUREE_EMPRUNT = 14
+
+# Pénalité par jour de retard, en euros
+PENALITE_PAR_JOUR = 0.10
+
+
+class IndexRetards:
+    """Emprunts en cours triés par date de retour prévue."""
+
+    def __init__(self, personnes):
+        """
+        :param personnes: (list) Liste de dictionnaires contenant toutes les personnes et leurs emprunts
+        """
+        # Numéro d'ordre : départage deux emprunts de même échéance sans comparer les personnes
+        self._compteur = itertools.count()
+        # Tuples (échéance, numéro d'ordre, personne, numéro d'emprunt), par échéance croissante
+        self._entrees = sorted(
+            self._entree(personne, emprunt_id)
+            for personne in personnes
+            for emprunt_id, emprunt in personne["emprunts"].items()
+            if not emprunt.jour_retour
+        )
+
+    def _entree(self, personne, emprunt_id):
+        return personne["emprunts"][emprunt_id].echeance, next(self._compteur), personne, emprunt_id
+
+    def ajouter(self, personne, emprunt_id):
+        """
+        :param personne: (dict) la personne qui vient d'emprunter
+        :param emprunt_id: (str) le numéro du nouvel emprunt
+        :return: None
+        """
+        bisect.insort(self._entrees, self._entree(personne, emprunt_id))
+
+    def _lignes(self, fin, jour):
+        """
+        Produit les emprunts encore en cours parmi les "fin" premières entrées et retire les autres de l'index.
+
+        :param fin: (int) nombre d'entrées à parcourir depuis le début de la liste
+        :param jour: (int) la date de référence, en nombre de jours depuis l'an 1
+        :return: (list) les lignes du rapport (voir previsions)
+        """
+        lignes = []
+        en_cours = []
+        for entree in self._entrees[:fin]:
+            echeance, _, personne, emprunt_id = entree
+            emprunt = personne["emprunts"].get(emprunt_id)
+            if emprunt is None or emprunt.jour_retour:
+                continue
+            en_cours.append(entree)
+            jours = max(0, jour - echeance)
+            lignes.append({
+                "personne": personne,
+                "emprunt_id": emprunt_id,
+                "emprunt": emprunt,
+                "echeance": date.fromordinal(echeance),
+                "jours": jours,
+                "montant": PENALITE_PAR_JOUR * jours
+            })
+        if len(en_cours) < fin:
+            self._entrees[:fin] = en_cours
+        return lignes
+
+    def en_retard(self, date_reference=None):
+        """
+        :param date_reference: (date) la date à laquelle les retards sont calculés (aujourd'hui par défaut)
+        :return: (list) les emprunts en retard, du plus ancien au plus récent (voir previsions)
+        """
+        jour = (date_reference or date.today()).toordinal()
+        return self._lignes(bisect.bisect_left(self._entrees, (jour,)), jour)
+
+    def previsions(self, date_reference=None):
+        """
+        :param date_reference: (date) la date à laquelle les pénalités sont calculées (aujourd'hui par défaut)
+        :return: (list) tous les emprunts en cours, par date de retour prévue, sous forme de dictionnaires :
+            - "personne" : (dict) l'emprunteur
+            - "emprunt_id" : (str) le numéro de l'emprunt
+            - "emprunt" : (Emprunt) l'emprunt
+            - "echeance" : (date) la date de retour prévue
+            - "jours" : (int) le nombre de jours de retard à la date de référence
+            - "montant" : (float) la pénalité si le livre est rendu à la date de référence
+        """
+        jour = (date_reference or date.today()).toordinal()
+        return self._lignes(len(self._entrees), jour)
+
+
+def total_par_personne(lignes):
+    """
+    :param lignes: (list) lignes renvoyées par IndexRetards.en_retard ou IndexRetards.previsions
+    :return: (list) tuples (personne, nombre d'emprunts, montant total), du montant le plus élevé au plus faible
+    """
+    totaux = {}
+    for ligne in lignes:
+        personne = ligne["personne"]
+        _, nbr_emprunts, montant = totaux.get(id(personne), (personne, 0, 0.0))
+        totaux[id(personne)] = (personne, nbr_emprunts + 1, montant + ligne["montant"])
+    return sorted(totaux.values(), key=lambda total: -total[2])
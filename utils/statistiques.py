@@ -0,0 +1,150 @@
+"""
+    Module statistiques : totaux des emprunts tenus à jour au fil des emprunts et des retours
+
+    Les compteurs (emprunts par titre et par personne, exemplaires en prêt) sont calculés une seule fois,
+    à la première demande, à partir des emprunts en mémoire, des emprunts clos restés dans emprunt.csv et
+    des archives. Ils sont ensuite mis à jour à chaque emprunt et à chaque retour (RegistrePersonnes.noter_emprunt
+    et noter_retour) : l'affichage des statistiques ne relit jamais l'historique.
+
+    Les exemplaires disponibles par genre viennent de l'index en colonnes du catalogue (Catalogue.colonnes).
+
+    Fonctions :
+        • StatistiquesEmprunts (compteurs des emprunts)
+        • statistiques_emprunts
+"""
+from collections import Counter
+
+from utils.archives import lire_archives
+from utils.gestion_fichiers import iterer_personnes
+from utils.registre import cle_personne
+
+# Nombre de livres et d'emprunteurs affichés dans les classements
+TAILLE_CLASSEMENT = 10
+
+
+class StatistiquesEmprunts:
+    """Compteurs des emprunts : par titre, par personne et exemplaires actuellement en prêt."""
+
+    def __init__(self):
+        # Titre -> nombre d'emprunts (historique compris)
+        self.emprunts_par_titre = Counter()
+        # (nom, prénom) normalisés -> nombre d'emprunts (historique compris)
+        self.emprunts_par_personne = Counter()
+        # Titre -> nombre d'exemplaires actuellement empruntés
+        self.en_pret_par_titre = Counter()
+        self.exemplaires_en_pret = 0
+
+    def compter(self, cle, emprunt):
+        """
+        :param cle: (tuple) (nom, prénom) normalisés de l'emprunteur (voir cle_personne)
+        :param emprunt: (Emprunt) un emprunt, en cours ou rendu
+        :return: None
+        """
+        self.emprunts_par_titre[emprunt.titre] += 1
+        self.emprunts_par_personne[cle] += 1
+        if not emprunt.jour_retour:
+            self.en_pret_par_titre[emprunt.titre] += 1
+            self.exemplaires_en_pret += 1
+
+    def noter_emprunt(self, personne, emprunt):
+        """
+        :param personne: (dict) la personne qui vient d'emprunter
+        :param emprunt: (Emprunt) le nouvel emprunt
+        :return: None
+        """
+        self.compter(cle_personne(personne["nom"], personne["prenom"]), emprunt)
+
+    def noter_retour(self, emprunt):
+        """
+        :param emprunt: (Emprunt) l'emprunt qui vient d'être rendu
+        :return: None
+        """
+        self.en_pret_par_titre[emprunt.titre] -= 1
+        if self.en_pret_par_titre[emprunt.titre] <= 0:
+            del self.en_pret_par_titre[emprunt.titre]
+        self.exemplaires_en_pret -= 1
+
+    def renommer(self, ancien, nouveau):
+        """
+        :param ancien: (tuple) (nom, prénom) avant modification
+        :param nouveau: (tuple) (nom, prénom) après modification
+        :return: None
+        """
+        nbr_emprunts = self.emprunts_par_personne.pop(cle_personne(*ancien), 0)
+        if nbr_emprunts:
+            self.emprunts_par_personne[cle_personne(*nouveau)] += nbr_emprunts
+
+    def plus_empruntes(self, nombre=TAILLE_CLASSEMENT):
+        """
+        :param nombre: (int) le nombre de titres voulus
+        :return: (list) tuples (titre, nombre d'emprunts), du plus emprunté au moins emprunté
+        """
+        return self.emprunts_par_titre.most_common(nombre)
+
+    def plus_actifs(self, nombre=TAILLE_CLASSEMENT):
+        """
+        :param nombre: (int) le nombre d'emprunteurs voulus
+        :return: (list) tuples ((nom, prénom) normalisés, nombre d'emprunts), du plus grand emprunteur au plus petit
+        """
+        return self.emprunts_par_personne.most_common(nombre)
+
+    def en_pret_par_genre(self, livres):
+        """
+        :param livres: (dict) un dictionnaire contenant tous les livres disponibles
+        :return: (dict) genre -> nombre d'exemplaires en prêt (les livres retirés du catalogue sont ignorés)
+        """
+        par_genre = Counter()
+        for titre, nbr_exemplaires in self.en_pret_par_titre.items():
+            livre = livres.get(titre)
+            if livre is not None:
+                par_genre[livre["Genre"]] += nbr_exemplaires
+        return par_genre
+
+
+def statistiques_emprunts(personnes, fichier_emprunt):
+    """
+    Calcule les compteurs lors du premier appel (le registre les garde ensuite à jour) puis les renvoie.
+
+    :param personnes: (RegistrePersonnes) toutes les personnes, lues avec ou sans historique
+    :param fichier_emprunt: (str) Chemin vers le fichier emprunt.csv
+    :return: (StatistiquesEmprunts) les compteurs des emprunts
+    """
+    if personnes.statistiques is not None:
+        return personnes.statistiques
+
+    statistiques = StatistiquesEmprunts()
+    # Numéros des emprunts déjà comptés, par personne : une archive peut contenir en double un emprunt
+    # resté dans emprunt.csv (arrêt brutal pendant l'archivage)
+    numeros_comptes = {}
+    # (nom, prénom) dans emprunt.csv -> personne dont les emprunts clos n'ont pas été chargés
+    non_charges = {}
+    for personne in personnes:
+        cle = cle_personne(personne["nom"], personne["prenom"])
+        numeros_comptes.setdefault(cle, set()).update(personne["emprunts"])
+        for emprunt in personne["emprunts"].values():
+            statistiques.compter(cle, emprunt)
+        if not personnes.historique_charge(personne):
+            non_charges[personnes.emprunts_non_charges[id(personne)][0]] = personne
+
+    # Emprunts clos restés dans emprunt.csv (registre lu sans historique), relus en une seule passe
+    if non_charges:
+        for personne_fichier in iterer_personnes(fichier_emprunt):
+            personne = non_charges.pop((personne_fichier["nom"], personne_fichier["prenom"]), None)
+            if personne is None:
+                continue
+            cle = cle_personne(personne["nom"], personne["prenom"])
+            for num, emprunt in personne_fichier["emprunts"].items():
+                if emprunt.jour_retour and num not in numeros_comptes[cle]:
+                    numeros_comptes[cle].add(num)
+                    statistiques.compter(cle, emprunt)
+            if not non_charges:
+                break
+
+    for nom, prenom, num, emprunt in lire_archives(fichier_emprunt):
+        numeros = numeros_comptes.setdefault(cle_personne(nom, prenom), set())
+        if num not in numeros:
+            numeros.add(num)
+            statistiques.compter(cle_personne(nom, prenom), emprunt)
+
+    personnes.statistiques = statistiques
+    return statistiques
@@ -0,0 +1,307 @@
+"""
+    Module stockage SQLite : stockage des livres et des emprunts dans une base SQLite locale
+
+    Ce module expose les mêmes fonctions de lecture et de sauvegarde que gestion_fichiers (qui l'utilise
+    automatiquement lorsque le chemin du fichier se termine par .db, .sqlite ou .sqlite3), ainsi que la
+    recherche indexée d'un emprunteur par nom et prénom (utilisée par la ligne de commande pour ne lire que
+    les personnes concernées).
+    Chaque transaction ne met à jour que les lignes concernées.
+
+    Les recherches de livres (par mot, sans accents) restent faites par les index du Catalogue en mémoire :
+    la base ne sert que de format de stockage pour les livres.
+
+    Fonctions :
+        • connexion
+        • lire_bibliotheque_sqlite
+        • sauvegarder_bibliotheque_sqlite
+        • ecrire_livres_sqlite
+        • lire_emprunts_sqlite
+        • sauvegarder_personne_sqlite
+        • sauvegarder_personnes_sqlite
+        • sauvegarder_emprunts_sqlite
+        • replier_wal_sqlite
+        • trouver_emprunteur
+        • migrer_vers_sqlite
+"""
+import sqlite3
+import threading
+
+from utils.catalogue import Catalogue
+from utils.modeles import Emprunt
+from utils.modeles import Emprunteur
+from utils.modeles import Livre
+from utils.registre import cle_personne
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS livres (
+        titre TEXT PRIMARY KEY,
+        auteur TEXT NOT NULL,
+        annee,
+        genre TEXT NOT NULL,
+        exemplaires INTEGER NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS personnes (
+        id INTEGER PRIMARY KEY,
+        nom TEXT NOT NULL,
+        prenom TEXT NOT NULL,
+        photo_id TEXT NOT NULL DEFAULT '',
+        UNIQUE (nom, prenom)
+    );
+    CREATE INDEX IF NOT EXISTS idx_personnes_nom ON personnes (nom COLLATE NOCASE, prenom COLLATE NOCASE);
+
+    CREATE TABLE IF NOT EXISTS emprunts (
+        personne_id INTEGER NOT NULL REFERENCES personnes (id) ON DELETE CASCADE,
+        emprunt_id TEXT NOT NULL,
+        titre TEXT NOT NULL,
+        date_emprunt TEXT NOT NULL,
+        date_retour TEXT NOT NULL DEFAULT '',
+        PRIMARY KEY (personne_id, emprunt_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_emprunts_titre ON emprunts (titre);
+"""
+
+# Connexions ouvertes (clé : chemin de la base)
+_connexions = {}
+
+# Les connexions peuvent être utilisées par le thread de sauvegarde en arrière-plan : les écritures
+# sont sérialisées par ce verrou
+_verrou_ecriture = threading.RLock()
+
+
+def connexion(fichier_base):
+    """
+    Ouvre (une seule fois) la base SQLite en mode WAL et crée les tables si nécessaire.
+
+    :param fichier_base: (str) le chemin vers le fichier de la base (ex : data/bibliotheque.db)
+    :return: (sqlite3.Connection) la connexion à la base
+    """
+    if fichier_base not in _connexions:
+        conn = sqlite3.connect(fichier_base, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.executescript(SCHEMA)
+        _connexions[fichier_base] = conn
+    return _connexions[fichier_base]
+
+
+def _livre_depuis_ligne(ligne):
+    """
+    :param ligne: (tuple) (titre, auteur, annee, genre, exemplaires) lu dans la table livres
+    :return: (Livre) les informations du livre
+    """
+    return Livre(ligne[1], ligne[2], ligne[3], ligne[4])
+
+
+def lire_bibliotheque_sqlite(fichier_base):
+    """
+    :param fichier_base: (str) le chemin vers le fichier de la base
+    :return: (Catalogue) les livres de la bibliothèque
+    """
+    conn = connexion(fichier_base)
+    lignes = conn.execute("SELECT titre, auteur, annee, genre, exemplaires FROM livres ORDER BY rowid")
+    livres = Catalogue((ligne[0], _livre_depuis_ligne(ligne)) for ligne in lignes)
+    livres.titres_modifies.clear()
+    return livres
+
+
+def sauvegarder_bibliotheque_sqlite(bibliotheque, fichier_base, compacter=False):
+    """
+    N'écrit que les livres modifiés si "bibliotheque" est un Catalogue, sinon remplace toute la table.
+
+    :param bibliotheque: (dict) un dictionnaire contenant la bibliotheque
+    :param fichier_base: (str) le chemin vers le fichier de la base
+    :param compacter: (bool) True pour replier le journal WAL dans la base
+    :return: None
+    """
+    conn = connexion(fichier_base)
+    titres_modifies = getattr(bibliotheque, "titres_modifies", None)
+    with _verrou_ecriture:
+        if titres_modifies is None:
+            with conn:
+                conn.execute("DELETE FROM livres")
+                _ecrire_livres(conn, bibliotheque)
+        else:
+            ecrire_livres_sqlite({titre: bibliotheque.get(titre) for titre in titres_modifies}, fichier_base)
+            titres_modifies.clear()
+        if compacter:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def _ecrire_livres(conn, modifications):
+    """
+    :param conn: (sqlite3.Connection) la connexion à la base (transaction en cours)
+    :param modifications: (dict) titre -> informations du livre (None si le livre a été supprimé)
+    :return: None
+    """
+    for titre, livre in modifications.items():
+        if livre is None:
+            conn.execute("DELETE FROM livres WHERE titre = ?", (titre,))
+        else:
+            conn.execute("INSERT OR REPLACE INTO livres (titre, auteur, annee, genre, exemplaires) "
+                         "VALUES (?, ?, ?, ?, ?)",
+                         (titre, livre["Auteur"], livre["Année"], livre["Genre"], livre["Exemplaires"]))
+
+
+def ecrire_livres_sqlite(modifications, fichier_base):
+    """
+    Met à jour uniquement les livres modifiés, en une seule transaction.
+
+    :param modifications: (dict) titre -> informations du livre (None si le livre a été supprimé)
+    :param fichier_base: (str) le chemin vers le fichier de la base
+    :return: None
+    """
+    conn = connexion(fichier_base)
+    with _verrou_ecriture, conn:
+        _ecrire_livres(conn, modifications)
+
+
+def lire_emprunts_sqlite(fichier_base):
+    """
+    :param fichier_base: (str) le chemin vers le fichier de la base
+    :return: (list) Liste des emprunteurs (Emprunteur) et de leurs emprunts
+    """
+    conn = connexion(fichier_base)
+    personnes = []
+    par_id = {}
+    for id_personne, nom, prenom, photo_id in conn.execute(
+            "SELECT id, nom, prenom, photo_id FROM personnes ORDER BY id"):
+        personne = Emprunteur(nom, prenom, photo_id=photo_id)
+        par_id[id_personne] = personne
+        personnes.append(personne)
+
+    for id_personne, emprunt_id, titre, date_emprunt, date_retour in conn.execute(
+            "SELECT personne_id, emprunt_id, titre, date_emprunt, date_retour FROM emprunts ORDER BY rowid"):
+        personne = par_id[id_personne]
+        personne["emprunts"][emprunt_id] = Emprunt.depuis_texte(titre, date_emprunt, date_retour)
+        if not date_retour:
+            personne["nbr_livres_empruntes"] += 1
+
+    return personnes
+
+
+def _ecrire_personne(conn, personne, cle):
+    """
+    :param conn: (sqlite3.Connection) la connexion à la base (transaction en cours)
+    :param personne: (dict) la personne à écrire avec ses emprunts
+    :param cle: (tuple) (nom, prénom) sous lesquels la personne est enregistrée dans la base
+    :return: None
+    """
+    ligne = conn.execute("SELECT id FROM personnes WHERE nom = ? AND prenom = ?", cle).fetchone()
+    if ligne is None:
+        id_personne = conn.execute("INSERT INTO personnes (nom, prenom, photo_id) VALUES (?, ?, ?)",
+                                   (personne["nom"], personne["prenom"], personne.get("photo_id", ""))).lastrowid
+    else:
+        id_personne = ligne[0]
+        conn.execute("UPDATE personnes SET nom = ?, prenom = ?, photo_id = ? WHERE id = ?",
+                     (personne["nom"], personne["prenom"], personne.get("photo_id", ""), id_personne))
+        conn.execute("DELETE FROM emprunts WHERE personne_id = ?", (id_personne,))
+    conn.executemany("INSERT INTO emprunts (personne_id, emprunt_id, titre, date_emprunt, date_retour) "
+                     "VALUES (?, ?, ?, ?, ?)",
+                     [(id_personne, num, e["titre"], e["date_emprunt"], e["date_retour"])
+                      for num, e in personne["emprunts"].items()])
+
+
+def sauvegarder_personne_sqlite(personne, fichier_base, cle=None):
+    """
+    Met à jour une seule personne (et ses emprunts) dans la base.
+
+    :param personne: (dict) la personne qui vient d'emprunter, de rendre ou d'être modifiée
+    :param fichier_base: (str) le chemin vers le fichier de la base
+    :param cle: (tuple) (nom, prénom) de la personne avant modification, si elle a été renommée
+    :return: None
+    """
+    if cle is None:
+        cle = (personne["nom"], personne["prenom"])
+    conn = connexion(fichier_base)
+    with _verrou_ecriture, conn:
+        _ecrire_personne(conn, personne, tuple(cle))
+
+
+def sauvegarder_personnes_sqlite(personnes, fichier_base):
+    """
+    Met à jour plusieurs personnes (et leurs emprunts) dans la base, en une seule transaction.
+
+    :param personnes: (list) les personnes modifiées
+    :param fichier_base: (str) le chemin vers le fichier de la base
+    :return: None
+    """
+    conn = connexion(fichier_base)
+    with _verrou_ecriture, conn:
+        for personne in personnes:
+            _ecrire_personne(conn, personne, (personne["nom"], personne["prenom"]))
+
+
+def sauvegarder_emprunts_sqlite(emprunts, fichier_base):
+    """
+    Remplace toutes les personnes et tous les emprunts de la base, puis replie le journal WAL.
+
+    :param emprunts: (list) Liste de dictionnaires contenant les emprunts
+    :param fichier_base: (str) le chemin vers le fichier de la base
+    :return: None
+    """
+    conn = connexion(fichier_base)
+    with _verrou_ecriture:
+        with conn:
+            conn.execute("DELETE FROM emprunts")
+            conn.execute("DELETE FROM personnes")
+            for personne in emprunts:
+                _ecrire_personne(conn, personne, (personne["nom"], personne["prenom"]))
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def replier_wal_sqlite(fichier_base):
+    """
+    Replie le journal WAL dans la base (compaction), sans réécrire aucune ligne : chaque transaction
+    a déjà mis à jour les lignes concernées.
+
+    :param fichier_base: (str) le chemin vers le fichier de la base
+    :return: None
+    """
+    with _verrou_ecriture:
+        connexion(fichier_base).execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def trouver_emprunteur(fichier_base, nom, prenom):
+    """
+    Recherche indexée d'une personne, sans tenir compte de la casse ni des espaces superflus (comme
+    RegistrePersonnes.trouver).
+
+    :param fichier_base: (str) le chemin vers le fichier de la base
+    :param nom: (str) le nom de la personne
+    :param prenom: (str) le prénom de la personne
+    :return: (Emprunteur) la personne et ses emprunts, None si elle n'existe pas
+    """
+    conn = connexion(fichier_base)
+    cle = cle_personne(nom, prenom)
+    # COLLATE NOCASE ne compare sans casse que les lettres ASCII : les candidats sont vérifiés avec cle_personne
+    lignes = conn.execute("SELECT id, nom, prenom, photo_id FROM personnes "
+                          "WHERE nom = ? COLLATE NOCASE AND prenom = ? COLLATE NOCASE",
+                          (nom.strip(), prenom.strip())).fetchall()
+    if not lignes and not (nom + prenom).isascii():
+        lignes = conn.execute("SELECT id, nom, prenom, photo_id FROM personnes").fetchall()
+    ligne = next((ligne for ligne in lignes if cle_personne(ligne[1], ligne[2]) == cle), None)
+    if ligne is None:
+        return None
+    personne = Emprunteur(ligne[1], ligne[2], photo_id=ligne[3])
+    for emprunt_id, titre, date_emprunt, date_retour in conn.execute(
+            "SELECT emprunt_id, titre, date_emprunt, date_retour FROM emprunts WHERE personne_id = ? ORDER BY rowid",
+            (ligne[0],)):
+        personne["emprunts"][emprunt_id] = Emprunt.depuis_texte(titre, date_emprunt, date_retour)
+        if not date_retour:
+            personne["nbr_livres_empruntes"] += 1
+    return personne
+
+
+def migrer_vers_sqlite(livres, personnes, fichier_base):
+    """
+    Copie tous les livres et tous les emprunts dans la base SQLite (en remplaçant son contenu).
+
+    :param livres: (dict) les livres lus à partir de bibliotheque.json
+    :param personnes: (list) les personnes lues à partir de emprunt.csv
+    :param fichier_base: (str) le chemin vers le fichier de la base
+    :return: None
+    """
+    sauvegarder_bibliotheque_sqlite(dict(livres), fichier_base)
+    sauvegarder_emprunts_sqlite(personnes, fichier_base)